@@ -32,6 +32,17 @@ class SearchProductAspects(BaseModel):
     options: SearchOptions
 
 
+class ProductQuery(BaseModel):
+    product_name: str
+    comment: str = ""
+
+
+class SearchProductsAspects(BaseModel):
+    products: list[ProductQuery]
+    category: str
+    options: SearchOptions
+
+
 class MarketplaceAspects(BaseModel):
     pass
 
@@ -81,3 +92,35 @@ class PublishItem(BaseModel):
         if isinstance(value, str | bytes | bytearray):
             return json.loads(value)
         return value
+
+
+class BatchPublishItem(PublishItem):
+    images: list[str]
+    """File names of the uploaded images of the item"""
+
+
+class PublishBatch(BaseModel):
+    items: list[BatchPublishItem]
+
+    @model_validator(mode="before")
+    @classmethod
+    def validator(cls, value):
+        if isinstance(value, str | bytes | bytearray):
+            return json.loads(value)
+        return value
+
+
+class CatalogImport(BaseModel):
+    """Values shared by all the rows of an imported catalog"""
+
+    currency: str
+    country: str
+    marketplace_aspects_data: dict[str, Any]
+    options: SearchOptions
+
+    @model_validator(mode="before")
+    @classmethod
+    def validator(cls, value):
+        if isinstance(value, str | bytes | bytearray):
+            return json.loads(value)
+        return value
@@ -1,4 +1,5 @@
 from typing import Any
+from uuid import UUID
 
 from pydantic import BaseModel
 
@@ -41,10 +42,38 @@ class SearchAspectsResponse(BaseModel):
     aspects: Aspects
 
 
+class ProductAspectsResult(BaseModel):
+    status: str
+    metadata: MetadataUnion | None = None
+    aspects: Aspects | None = None
+    error: str | None = None
+
+
+class SearchProductsAspectsResponse(BaseModel):
+    results: list[ProductAspectsResult]
+
+
 class PublishItemResponse(BaseModel):
     status: str
 
 
+class PublishResultResponse(BaseModel):
+    status: str
+    listing_id: str | None = None
+    error: str | None = None
+    message: str | None = None
+
+
+class PublishBatchResponse(BaseModel):
+    results: list[PublishResultResponse]
+
+
+class PublishJobResponse(BaseModel):
+    job_id: UUID
+    status: str
+    error: str | None = None
+
+
 class MarketplaceLogoutResponse(BaseModel):
     status: str
 
@@ -1,5 +1,10 @@
+import asyncio
+import json
 import os
+import shutil
 import tempfile
+from collections.abc import AsyncIterator, Awaitable
+from contextlib import aclosing
 from uuid import UUID
 
 import aiofiles
@@ -11,46 +16,73 @@ from fastapi import (
     File,
     HTTPException,
     Path,
+    Request,
     UploadFile,
     status,
 )
+from fastapi.responses import StreamingResponse
 
 from app.data import Marketplace
-from app.domain.dto import ItemDTO, MarketplaceAccountDTO
+from app.domain.dto import (
+    AspectsSkeletonDTO,
+    AspectValueDTO,
+    BatchItemDTO,
+    CatalogImportOptionsDTO,
+    ItemDTO,
+    MarketplaceAccountDTO,
+    ProductDTO,
+    ProductPartDTO,
+    ProductQueryDTO,
+)
 from app.domain.ports import (
+    ICatalogImportService,
     InvalidCategory,
     InvalidItemStructure,
     InvalidMarketplaceAspects,
     InvalidProductAspects,
+    IPublishJobService,
     ISearchService,
     ISellingService,
     MarketplaceAuthorizationFailed,
     MarketplaceUnauthorised,
+    PublishJobNotFound,
+    PublishJobServiceError,
+    SearchServiceBusy,
     SearchServiceError,
     SellingServiceError,
 )
 from app.logger import logger
 
-from ..utils import utils
+from ..utils import catalog, utils
 from .middlewares import get_user_uuid
 from .models.requests import (
+    CatalogImport,
     EbayOptions,
+    PublishBatch,
     PublishItem,
     SearchOptions,
     SearchProductAspects,
+    SearchProductsAspects,
 )
 from .models.responses import (
     Aspects,
     EbayMetadata,
     Metadata,
     MetadataUnion,
+    ProductAspectsResult,
+    PublishBatchResponse,
     PublishItemResponse,
+    PublishJobResponse,
+    PublishResultResponse,
     SearchAspectsResponse,
     SearchCategoriesResponse,
+    SearchProductsAspectsResponse,
 )
 
 PREFIX = "/product"
 
+RECOGNITION_RETRY_AFTER = 1
+
 router = APIRouter(route_class=DishkaRoute, prefix=PREFIX)
 
 
@@ -83,7 +115,7 @@ async def search_product_categories(
             await f.write(image.file.read())
 
         try:
-            categories = searcher.recognize_product(
+            categories = await searcher.recognize_product(
                 temp_path, marketplace, **options.model_dump()
             )
 
@@ -92,6 +124,13 @@ async def search_product_categories(
                 categories=categories.categories,
             )
 
+        except SearchServiceBusy:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many images are being recognized, try again later",
+                headers={"Retry-After": str(RECOGNITION_RETRY_AFTER)},
+            )
+
         except SearchServiceError as e:
             logger.exception(f"Cannot process product: {e}", exc_info=True)
 
@@ -101,6 +140,30 @@ async def search_product_categories(
             )
 
 
+DISCONNECT_CHECK_INTERVAL = 0.5
+
+CLIENT_CLOSED_REQUEST = 499
+
+
+async def _cancel_on_disconnect[T](request: Request, aw: Awaitable[T]) -> T:
+    """Await ``aw`` and cancel it if the client disconnects before it is done"""
+    task = asyncio.ensure_future(aw)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_CHECK_INTERVAL)
+            if done:
+                return task.result()
+
+            if await request.is_disconnected():
+                raise HTTPException(
+                    status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request"
+                )
+    finally:
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
 def _metadata_to_responese(
     metadata: dict[str], marketplace: Marketplace
 ) -> MetadataUnion:
@@ -111,6 +174,7 @@ def _metadata_to_responese(
 
 @router.post("/{marketplace}/aspects")
 async def search_by_product_name(
+    request: Request,
     product_aspects: SearchProductAspects,
     searcher: FromDishka[ISearchService],
     marketplace: Marketplace = Path(...),
@@ -122,22 +186,19 @@ async def search_by_product_name(
         )
 
     try:
-        product = searcher.aspects(
-            product_aspects.product_name,
-            product_aspects.category,
-            product_aspects.comment,
-            marketplace,
-            **product_aspects.options.model_dump(),
+        product = await _cancel_on_disconnect(
+            request,
+            searcher.product_aspects(
+                product_aspects.product_name,
+                product_aspects.category,
+                product_aspects.comment,
+                marketplace,
+                **product_aspects.options.model_dump(),
+            ),
         )
 
-        aspects_resp = Aspects(values={}, required=[])
-        for aspect in product.aspects:
-            aspects_resp.values[aspect.name] = aspect.value
-            if aspect.is_required:
-                aspects_resp.required.append(aspect.name)
-
         return SearchAspectsResponse(
-            aspects=aspects_resp,
+            aspects=_aspects_to_response(product),
             metadata=_metadata_to_responese(product.metadata, marketplace),
         )
 
@@ -150,6 +211,146 @@ async def search_by_product_name(
         )
 
 
+def _aspects_to_response(product: ProductDTO) -> Aspects:
+    aspects_resp = Aspects(values={}, required=[])
+    for aspect in product.aspects:
+        aspects_resp.values[aspect.name] = aspect.value
+        if aspect.is_required:
+            aspects_resp.required.append(aspect.name)
+    return aspects_resp
+
+
+@router.post("/{marketplace}/aspects/batch")
+async def search_by_product_names(
+    request: Request,
+    products_aspects: SearchProductsAspects,
+    searcher: FromDishka[ISearchService],
+    marketplace: Marketplace = Path(...),
+) -> SearchProductsAspectsResponse:
+    if not _check_options(products_aspects.options, marketplace):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Options doesn't match with markeplace",
+        )
+
+    try:
+        results = await _cancel_on_disconnect(
+            request,
+            searcher.products_aspects(
+                [ProductQueryDTO(**q.model_dump()) for q in products_aspects.products],
+                products_aspects.category,
+                marketplace,
+                **products_aspects.options.model_dump(),
+            ),
+        )
+
+    except SearchServiceError as e:
+        logger.exception(f"Cannot process products: {e}", exc_info=True)
+
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to find information about products",
+        )
+
+    return SearchProductsAspectsResponse(
+        results=[
+            ProductAspectsResult(
+                status="found",
+                aspects=_aspects_to_response(result.product),
+                metadata=_metadata_to_responese(result.product.metadata, marketplace),
+            )
+            if result.product is not None
+            else ProductAspectsResult(status="failed", error=result.error)
+            for result in results
+        ]
+    )
+
+
+def _product_part_event(part: ProductPartDTO, marketplace: Marketplace) -> dict:
+    if isinstance(part, AspectsSkeletonDTO):
+        aspects = Aspects(
+            values={aspect.name: None for aspect in part.aspects},
+            required=[aspect.name for aspect in part.aspects if aspect.is_required],
+        )
+        return {"event": "skeleton", "aspects": aspects.model_dump()}
+
+    if isinstance(part, AspectValueDTO):
+        return {"event": "aspect", "name": part.name, "value": part.value}
+
+    metadata = _metadata_to_responese(part.metadata, marketplace)
+    return {"event": "metadata", "metadata": metadata.model_dump(mode="json")}
+
+
+@router.post("/{marketplace}/aspects/stream")
+async def stream_by_product_name(
+    product_aspects: SearchProductAspects,
+    searcher: FromDishka[ISearchService],
+    marketplace: Marketplace = Path(...),
+) -> StreamingResponse:
+    """NDJSON events: the aspects skeleton, then aspect values and metadata
+    as they are found, and ``done`` or ``error`` at the end"""
+    if not _check_options(product_aspects.options, marketplace):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Options doesn't match with markeplace",
+        )
+
+    parts = searcher.stream_product_aspects(
+        product_aspects.product_name,
+        product_aspects.category,
+        product_aspects.comment,
+        marketplace,
+        **product_aspects.options.model_dump(),
+    )
+    try:
+        # the skeleton comes from the marketplace, so its errors are still
+        # reported with the status code
+        skeleton = await anext(parts)
+
+    except SearchServiceError as e:
+        logger.exception(f"Cannot process product: {e}", exc_info=True)
+        await parts.aclose()
+
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to find information about product",
+        )
+
+    async def events() -> AsyncIterator[str]:
+        async with aclosing(parts):
+            event = _product_part_event(skeleton, marketplace)
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+            try:
+                async for part in parts:
+                    event = _product_part_event(part, marketplace)
+                    yield json.dumps(event, ensure_ascii=False) + "\n"
+
+            except SearchServiceError as e:
+                logger.exception(f"Cannot process product: {e}", exc_info=True)
+                event = {
+                    "event": "error",
+                    "detail": "Failed to find information about product",
+                }
+            else:
+                event = {"event": "done"}
+
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+async def _save_images(images: list[UploadFile], dir: str) -> list[str]:
+    pathes = []
+    for img in images:
+        filename = os.path.basename(utils.generate_file_name(img.filename))
+        temp_path = os.path.join(dir, filename)
+        async with aiofiles.open(temp_path, "wb") as f:
+            await f.write(img.file.read())
+
+        pathes.append(temp_path)
+    return pathes
+
+
 @router.post("/{marketplace}/publish")
 async def publish_item(
     seller: FromDishka[ISellingService],
@@ -159,14 +360,7 @@ async def publish_item(
     marketplace: Marketplace = Path(...),
 ) -> PublishItemResponse:
     with tempfile.TemporaryDirectory(prefix="selling_images_") as tmpdir:
-        pathes = []
-        for img in images:
-            filename = os.path.basename(utils.generate_file_name(img.filename))
-            temp_path = os.path.join(tmpdir, filename)
-            async with aiofiles.open(temp_path, "wb") as f:
-                await f.write(img.file.read())
-
-            pathes.append(temp_path)
+        pathes = await _save_images(images, tmpdir)
 
         try:
             item_data = item.model_dump()
@@ -204,3 +398,195 @@ async def publish_item(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to publish item",
             )
+
+
+@router.post("/{marketplace}/publish/batch")
+async def publish_batch(
+    seller: FromDishka[ISellingService],
+    user_uuid: UUID = Depends(get_user_uuid),
+    batch: PublishBatch = Body(...),
+    images: list[UploadFile] = File(...),
+    marketplace: Marketplace = Path(...),
+) -> PublishBatchResponse:
+    uploads = {img.filename: img for img in images}
+    unknown = {name for item in batch.items for name in item.images} - uploads.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown images: {', '.join(sorted(unknown))}",
+        )
+
+    with tempfile.TemporaryDirectory(prefix="selling_images_") as tmpdir:
+        names = list(uploads)
+        pathes = dict(
+            zip(names, await _save_images([uploads[n] for n in names], tmpdir))
+        )
+
+        items = [
+            BatchItemDTO(
+                item=ItemDTO(**item.model_dump(exclude={"images"})),
+                images=[pathes[name] for name in item.images],
+            )
+            for item in batch.items
+        ]
+        try:
+            results = await seller.publish_batch(
+                items,
+                MarketplaceAccountDTO(user_uuid=user_uuid, marketplace=marketplace),
+            )
+
+        except MarketplaceAuthorizationFailed as e:
+            logger.debug(f"User unauthorised in {marketplace}: {e}", exc_info=True)
+
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"User unauthorised in {marketplace}",
+            )
+
+        except SellingServiceError as e:
+            logger.exception(f"Failed to publish items: {e}")
+
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to publish items",
+            )
+
+    return PublishBatchResponse(
+        results=[
+            PublishResultResponse(
+                status="published" if result.published else "failed",
+                listing_id=result.listing_id,
+                error=result.error,
+                message=result.message,
+            )
+            for result in results
+        ]
+    )
+
+
+CHUNK_SIZE = 1024 * 1024
+
+
+async def _save_file(file: UploadFile, path: str):
+    async with aiofiles.open(path, "wb") as f:
+        while chunk := await file.read(CHUNK_SIZE):
+            await f.write(chunk)
+
+
+@router.post("/{marketplace}/import")
+async def import_catalog(
+    importer: FromDishka[ICatalogImportService],
+    user_uuid: UUID = Depends(get_user_uuid),
+    options: CatalogImport = Body(...),
+    catalog_file: UploadFile = File(..., alias="catalog"),
+    images: list[UploadFile] = File(default=[]),
+    marketplace: Marketplace = Path(...),
+) -> StreamingResponse:
+    if not _check_options(options.options, marketplace):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Options doesn't match with markeplace",
+        )
+
+    _, ext = os.path.splitext(catalog_file.filename or "")
+    if ext.lower() not in (".csv", ".jsonl", ".ndjson"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Catalog must be a CSV or JSONL file",
+        )
+
+    # uploads are closed once the handler returns, so the files are copied
+    # to a directory owned by the report stream
+    tmpdir = tempfile.mkdtemp(prefix="catalog_import_")
+    try:
+        catalog_path = os.path.join(tmpdir, f"catalog{ext.lower()}")
+        await _save_file(catalog_file, catalog_path)
+
+        images_dir = os.path.join(tmpdir, "images")
+        os.mkdir(images_dir)
+        for img in images:
+            name = os.path.basename(img.filename or "")
+            if name:
+                await _save_file(img, os.path.join(images_dir, name))
+    except BaseException:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+        raise
+
+    account = MarketplaceAccountDTO(user_uuid=user_uuid, marketplace=marketplace)
+    import_options = CatalogImportOptionsDTO(
+        currency=options.currency,
+        country=options.country,
+        marketplace_aspects_data=options.marketplace_aspects_data,
+        search_settings=options.options.model_dump(),
+    )
+
+    async def report() -> AsyncIterator[str]:
+        try:
+            rows = catalog.read_catalog(catalog_path, images_dir)
+            async for result in importer.run(rows, account, import_options):
+                yield catalog.report_line(result)
+
+        except MarketplaceAuthorizationFailed as e:
+            logger.debug(f"User unauthorised in {marketplace}: {e}", exc_info=True)
+            yield catalog.error_line(f"User unauthorised in {marketplace}")
+
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+    return StreamingResponse(report(), media_type="application/x-ndjson")
+
+
+@router.post("/{marketplace}/publish/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_publish_job(
+    jobs: FromDishka[IPublishJobService],
+    user_uuid: UUID = Depends(get_user_uuid),
+    item: PublishItem = Body(...),
+    images: list[UploadFile] = File(...),
+    marketplace: Marketplace = Path(...),
+) -> PublishJobResponse:
+    with tempfile.TemporaryDirectory(prefix="selling_images_") as tmpdir:
+        pathes = await _save_images(images, tmpdir)
+
+        try:
+            job_uuid = await jobs.submit(
+                ItemDTO(**item.model_dump()),
+                MarketplaceAccountDTO(user_uuid=user_uuid, marketplace=marketplace),
+                *pathes,
+            )
+            return PublishJobResponse(job_id=job_uuid, status="pending")
+
+        except PublishJobServiceError as e:
+            logger.exception(f"Failed to submit publish job: {e}")
+
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to publish item",
+            )
+
+
+@router.get("/{marketplace}/publish/jobs/{job_id}")
+async def publish_job_status(
+    jobs: FromDishka[IPublishJobService],
+    user_uuid: UUID = Depends(get_user_uuid),
+    job_id: UUID = Path(...),
+    marketplace: Marketplace = Path(...),
+) -> PublishJobResponse:
+    try:
+        job = await jobs.status(
+            job_id, MarketplaceAccountDTO(user_uuid=user_uuid, marketplace=marketplace)
+        )
+        return PublishJobResponse(
+            job_id=job.job_uuid, status=job.status, error=job.error
+        )
+
+    except PublishJobNotFound:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Publish job not found"
+        )
+    except PublishJobServiceError as e:
+        logger.exception(f"Failed to get publish job status: {e}")
+
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get publish job status",
+        )
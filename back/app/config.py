@@ -27,16 +27,55 @@ class EnvConfig(BaseSettings):
         super().__init__()
 
 
+class EbayTaxonomyConfig(BaseModel):
+    cache_dir: str = os.path.join(Pathes.CACHE, "taxonomy")
+    refresh_interval_hours: float = 24
+    tree_id_ttl_hours: float = 24
+    aspects_ttl_hours: float = 168
+    aspects_cache_size: int = 1024
+    marketplaces: list[str] | None = None
+    redis_shared: bool = True
+    bulk_aspects: bool = False
+    category_min_score: float = 0.8
+    local_prediction: bool = False
+    prediction_fallback: bool = True
+    prediction_min_score: float = 0.3
+    prediction_limit: int = 10
+
+
+class EbayHTTPConfig(BaseModel):
+    limit: int = 100
+    limit_per_host: int = 10
+    connect_timeout: float = 5
+    read_timeout: float = 30
+
+
+class EbayPublishConfig(BaseModel):
+    upload_concurrency: int = 4
+    upload_attempts: int = 3
+    upload_retry_delay: float = 0.5
+    batch_concurrency: int = 4
+    listing_settings_ttl_minutes: float = 10
+
+
 class EbayConfig(BaseModel):
     domain: Literal["api.ebay.com", "api.sandbox.ebay.com"]
     appid: str
     certid: str
     devid: str
     redirect_uri: str
+    taxonomy: EbayTaxonomyConfig = Field(default_factory=EbayTaxonomyConfig)
+    http: EbayHTTPConfig = Field(default_factory=EbayHTTPConfig)
+    publish: EbayPublishConfig = Field(default_factory=EbayPublishConfig)
 
 
 class PerplexityConfig(BaseModel):
     model: str
+    cache_ttl_hours: float = 24
+    request_timeout_seconds: float = 60
+    batch_size: int = 10
+    batch_attempts: int = 2
+    pipelined_lookup: bool = False
 
 
 class ExternalServicesConfig(YAMLConfig):
@@ -86,6 +125,21 @@ class RedisConfig(EnvConfig):
         return f"redis://{self.host}:{self.port}/{self.db_number}"
 
 
+class PublishJobsConfig(EnvConfig):
+    model_config = SettingsConfigDict(str_to_lower=False)
+    env_prefix = "publish_jobs_"
+
+    images_dir: str = os.path.join(Pathes.STORAGE, "publish_jobs")
+
+
+class RecognitionConfig(EnvConfig):
+    env_prefix = "recognition_"
+
+    workers: int | None = None
+    queue_size: int = 16
+    stats_log_interval_seconds: float = 60
+
+
 class Config(BaseModel):
     external_services: ExternalServicesConfig = Field(
         default_factory=ExternalServicesConfig.load
@@ -94,3 +148,5 @@ class Config(BaseModel):
     redis: RedisConfig = Field(default_factory=RedisConfig)
     secrets: Secrets = Field(default_factory=Secrets)
     tokens: Tokens = Field(default_factory=Tokens)
+    publish_jobs: PublishJobsConfig = Field(default_factory=PublishJobsConfig)
+    recognition: RecognitionConfig = Field(default_factory=RecognitionConfig)
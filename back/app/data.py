@@ -20,3 +20,5 @@ class Pathes:
     BASE_DIR = dirname(dirname(__file__))
 
     CONFIG = join(BASE_DIR, "config", "config.yaml")
+    CACHE = join(BASE_DIR, "cache")
+    STORAGE = join(BASE_DIR, "storage")
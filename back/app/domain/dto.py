@@ -1,5 +1,5 @@
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 
@@ -22,6 +22,33 @@ class ProductDTO:
     aspects: list[AspectValueDTO]
 
 
+@dataclass
+class AspectsSkeletonDTO:
+    """Aspects of a category before their values are found"""
+
+    aspects: list[AspectValueDTO]
+
+
+@dataclass
+class ProductMetadataDTO:
+    metadata: dict[str]
+
+
+ProductPartDTO = AspectsSkeletonDTO | AspectValueDTO | ProductMetadataDTO
+
+
+@dataclass
+class ProductQueryDTO:
+    product_name: str
+    comment: str = ""
+
+
+@dataclass
+class ProductSearchResultDTO:
+    product: ProductDTO | None = None
+    error: str | None = None
+
+
 @dataclass()
 class ProductCategoriesDTO:
     product_name: str
@@ -41,6 +68,20 @@ class ItemDTO:
     product_aspects: dict[str]
 
 
+@dataclass
+class BatchItemDTO:
+    item: ItemDTO
+    images: list[str]
+
+
+@dataclass
+class PublishResultDTO:
+    published: bool
+    listing_id: str | None = None
+    error: str | None = None
+    message: str | None = None
+
+
 @dataclass
 class MarketplaceAccountDTO:
     user_uuid: uuid.UUID
@@ -48,3 +89,30 @@ class MarketplaceAccountDTO:
 
 
 AccountSettingsDTO = dict[str, list]
+
+
+@dataclass
+class PublishJobDTO:
+    job_uuid: uuid.UUID
+    status: str
+    error: str | None = None
+
+
+@dataclass
+class CatalogImportOptionsDTO:
+    """Values shared by all the rows of an imported catalog"""
+
+    currency: str
+    country: str
+    marketplace_aspects_data: dict[str]
+    search_settings: dict[str] = field(default_factory=dict)
+
+
+@dataclass
+class ImportResultDTO:
+    line: int
+    published: bool
+    product_name: str | None = None
+    stage: str | None = None
+    error: str | None = None
+    message: str | None = None
@@ -4,4 +4,5 @@ from .common import AspectField, AspectType, AspectValue, Validatable
 from .item import IMarketplaceAspects, Item
 from .product import IMetadata, Product
 from .product_structure import ProductStructure
+from .publish_job import PublishJob, PublishJobStatus
 from .user import User
@@ -0,0 +1,21 @@
+from dataclasses import dataclass, field
+from enum import StrEnum
+from uuid import UUID
+
+
+class PublishJobStatus(StrEnum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass
+class PublishJob:
+    uuid: UUID
+    user_uuid: UUID
+    marketplace: str
+    item: dict[str]
+    images: list[str] = field(default_factory=list)
+    status: PublishJobStatus = PublishJobStatus.PENDING
+    error: str | None = None
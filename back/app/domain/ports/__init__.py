@@ -1,8 +1,10 @@
 from .errors import *
 from .interfaces import (
     IAuthService,
+    ICatalogImportService,
     IMarketplaceAccountService,
     IMarketplaceOAuthService,
+    IPublishJobService,
     IRegistrationService,
     ISearchService,
     ISellingService,
@@ -30,6 +30,10 @@ class ProductCategoriesNotFound(SearchServiceError):
     pass
 
 
+class SearchServiceBusy(SearchServiceError):
+    pass
+
+
 class SellingServiceError(Base):
     pass
 
@@ -68,3 +72,11 @@ class InvalidToken(MarketplaceOAuthServiceError):
 
 class MarketplaceAccountServiceError(Base):
     pass
+
+
+class PublishJobServiceError(Base):
+    pass
+
+
+class PublishJobNotFound(PublishJobServiceError):
+    pass
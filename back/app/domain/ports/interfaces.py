@@ -1,4 +1,5 @@
 import uuid
+from collections.abc import AsyncIterable, AsyncIterator
 from typing import Protocol
 
 from .. import dto
@@ -18,7 +19,7 @@ class IRegistrationService(Protocol):
 
 
 class ISearchService(Protocol):
-    def aspects(
+    async def product_aspects(
         self,
         product_name: str,
         category_name: str,
@@ -29,12 +30,47 @@ class ISearchService(Protocol):
         """Search product by name and category"""
         pass
 
-    def recognize_product(
+    async def products_aspects(
+        self,
+        queries: list[dto.ProductQueryDTO],
+        category_name: str,
+        marketplace: str,
+        **settings: dict,
+    ) -> list[dto.ProductSearchResultDTO]:
+        """Search several products of one category, results keep the order
+        of the queries"""
+        pass
+
+    def stream_product_aspects(
+        self,
+        product_name: str,
+        category_name: str,
+        comment: str,
+        marketplace: str,
+        **settings: dict,
+    ) -> AsyncIterator[dto.ProductPartDTO]:
+        """Search product by name and category, yielding the aspects skeleton
+        first and then the values as soon as they are found"""
+        pass
+
+    async def recognize_product(
         self, img_path: str, marketplace, **settings: dict
     ) -> dto.ProductCategoriesDTO:
         """Search categories by product name"""
         pass
 
+    async def recognize_barcode(
+        self, barcode: str, marketplace: str, **settings: dict
+    ) -> dto.ProductCategoriesDTO:
+        """Search product name and categories by barcode"""
+        pass
+
+    async def product_categories(
+        self, product_name: str, marketplace: str, **settings: dict
+    ) -> dto.ProductCategoriesDTO:
+        """Predict categories of the product"""
+        pass
+
 
 class ISellingService(Protocol):
     async def publish(
@@ -42,6 +78,58 @@ class ISellingService(Protocol):
     ) -> None:
         pass
 
+    async def validate(
+        self, item_data: dto.ItemDTO, account: dto.MarketplaceAccountDTO
+    ) -> None:
+        """Check the item without publishing it.
+
+        raise InvalidItemStructure, InvalidCategory or SellingServiceError
+        """
+        pass
+
+    async def publish_batch(
+        self, items: list[dto.BatchItemDTO], account: dto.MarketplaceAccountDTO
+    ) -> list[dto.PublishResultDTO]:
+        """Publish items with their images, results keep the order of items.
+
+        Invalid or rejected items are reported in their results
+        """
+        pass
+
+
+class ICatalogImportService(Protocol):
+    def run(
+        self,
+        rows: AsyncIterable[tuple[int, dict[str]]],
+        account: dto.MarketplaceAccountDTO,
+        options: dto.CatalogImportOptionsDTO,
+    ) -> AsyncIterator[dto.ImportResultDTO]:
+        """Publish rows of a catalog given with their line numbers.
+
+        Results are yielded as rows finish, not in the order of lines
+        """
+        pass
+
+
+class IPublishJobService(Protocol):
+    async def submit(
+        self, item_data: dto.ItemDTO, account: dto.MarketplaceAccountDTO, *images: str
+    ) -> uuid.UUID:
+        """Store the item with its images and enqueue publishing.
+
+        Returns uuid of the job
+        """
+        pass
+
+    async def status(
+        self, job_uuid: uuid.UUID, account: dto.MarketplaceAccountDTO
+    ) -> dto.PublishJobDTO:
+        pass
+
+    async def run(self, job_uuid: uuid.UUID) -> None:
+        """Publish the item of a pending job, called by workers"""
+        pass
+
 
 class IMarketplaceOAuthService(Protocol):
     def generate_token(self, user_uuid: uuid.UUID) -> str:
@@ -0,0 +1,77 @@
+"""Publishes a CSV or JSONL catalog from the command line.
+
+    python -m app.import_catalog catalog.csv --user USER_UUID \\
+        --options options.json --images ./images --report report.jsonl
+
+The options file has the same format as the options of the import endpoint.
+The report is written line by line while the catalog is published.
+"""
+
+import argparse
+import asyncio
+import sys
+import uuid
+from pathlib import Path
+
+from app import setup
+from app.api.models.requests import CatalogImport
+from app.data import Marketplace
+from app.domain.dto import CatalogImportOptionsDTO, MarketplaceAccountDTO
+from app.domain.ports import ICatalogImportService, MarketplaceAuthorizationFailed
+from app.utils import catalog
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Publish a product catalog")
+    parser.add_argument("catalog", help="CSV or JSONL catalog file")
+    parser.add_argument("--user", type=uuid.UUID, required=True, help="user uuid")
+    parser.add_argument("--marketplace", type=Marketplace, default=Marketplace.EBAY)
+    parser.add_argument(
+        "--options", required=True, help="JSON file with the import options"
+    )
+    parser.add_argument("--images", help="directory of the catalog images")
+    parser.add_argument("--report", help="report file, stdout by default")
+    return parser.parse_args(argv)
+
+
+async def _import(args: argparse.Namespace, report) -> bool:
+    options = CatalogImport.model_validate_json(Path(args.options).read_text())
+    import_options = CatalogImportOptionsDTO(
+        currency=options.currency,
+        country=options.country,
+        marketplace_aspects_data=options.marketplace_aspects_data,
+        search_settings=options.options.model_dump(),
+    )
+    account = MarketplaceAccountDTO(user_uuid=args.user, marketplace=args.marketplace)
+
+    container = setup.container(setup.load_config())
+    try:
+        async with container() as request_container:
+            importer = await request_container.get(ICatalogImportService)
+            rows = catalog.read_catalog(args.catalog, args.images)
+            try:
+                async for result in importer.run(rows, account, import_options):
+                    report.write(catalog.report_line(result))
+                    report.flush()
+            except MarketplaceAuthorizationFailed:
+                report.write(
+                    catalog.error_line(f"User unauthorised in {args.marketplace}")
+                )
+                return False
+    finally:
+        await container.close()
+
+    return True
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    if args.report is None:
+        return 0 if asyncio.run(_import(args, sys.stdout)) else 1
+
+    with open(args.report, "w", encoding="utf-8") as report:
+        return 0 if asyncio.run(_import(args, report)) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
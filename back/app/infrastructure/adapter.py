@@ -1,16 +1,23 @@
+from collections.abc import Sequence
 from dataclasses import dataclass, is_dataclass
+from functools import lru_cache
 
-from pydantic import TypeAdapter, ValidationError
+from pydantic import ValidationError
 
 from app.domain.entities import (
     AspectField,
     AspectType,
+    AspectValue,
     IMetadata,
     Product,
     ProductStructure,
 )
 from app.domain.entities.errors import AspectsValidationError
 
+from .type_adapters import type_adapter
+
+SCHEMA_CACHE_SIZE = 1024
+
 
 class ProductAdapterError(Exception):
     pass
@@ -36,51 +43,92 @@ class ProductAdapter[M: IMetadata]:
         raw_data: dict[str],
         product_structure: ProductStructure,
     ) -> Product[M]:
+        return Product(
+            metadata=self.to_metadata(raw_data),
+            aspects=self.to_aspects(raw_data, product_structure),
+        )
+
+    def to_metadata(self, raw_data: dict[str]) -> M:
         try:
-            aspect_values = product_structure.validate(
-                raw_data.get(self._ASPECTS_FIELD_NAME, {})
-            )
-            metadata = TypeAdapter(self.metadata_type).validate_python(
+            return type_adapter(self.metadata_type).validate_python(
                 raw_data.get(self._METADATA_FIELD_NAME, {})
             )
-            return Product(metadata=metadata, aspects=aspect_values)
-        except AspectsValidationError as e:
-            raise InvalidAspectsError() from e
         except ValidationError as e:
             raise InvalidMetadataError() from e
 
+    @classmethod
+    def to_aspects(
+        cls, raw_data: dict[str], product_structure: ProductStructure
+    ) -> list[AspectValue]:
+        try:
+            return product_structure.validate(raw_data.get(cls._ASPECTS_FIELD_NAME, {}))
+        except AspectsValidationError as e:
+            raise InvalidAspectsError() from e
+
     def to_schema(
         self,
         aspects: list[AspectField],
         allow_additional_aspects: bool = False,
     ) -> dict[str]:
-        aspects_schema = self._build_aspects_schema(
-            aspects,
-            allow_additional_properties=allow_additional_aspects,
+        """JSON schema of a product with the given aspects.
+
+        Schemas are cached by metadata type and aspects, so the returned
+        schema is shared between calls and must not be modified.
+        """
+        return _cached_schema(
+            self.metadata_type, tuple(aspects), allow_additional_aspects
         )
 
-        metadata_schema, metadata_defs = self._build_metadata_schema(self.metadata_type)
+    def to_metadata_schema(self) -> dict[str]:
+        """JSON schema of an answer with the product metadata only"""
+        return _cached_schema(self.metadata_type, None, False)
+
+    @staticmethod
+    def to_aspects_schema(
+        aspects: list[AspectField],
+        allow_additional_aspects: bool = False,
+    ) -> dict[str]:
+        """JSON schema of an answer with the product aspects only"""
+        return _cached_schema(None, tuple(aspects), allow_additional_aspects)
+
+    @classmethod
+    def _build_schema(
+        cls,
+        metadata_type: type[M] | None,
+        aspects: tuple[AspectField, ...] | None,
+        allow_additional_aspects: bool,
+    ) -> dict[str]:
+        properties = {}
+        defs = {}
+
+        if aspects is not None:
+            aspecs_def_name = cls._ASPECTS_FIELD_NAME.capitalize()
+            properties[cls._ASPECTS_FIELD_NAME] = {"$ref": f"#/$defs/{aspecs_def_name}"}
+            defs[aspecs_def_name] = cls._build_aspects_schema(
+                aspects,
+                allow_additional_properties=allow_additional_aspects,
+            )
+
+        if metadata_type is not None:
+            metadata_schema, metadata_defs = cls._build_metadata_schema(metadata_type)
+
+            metadata_def_name = cls._METADATA_FIELD_NAME.capitalize()
+            properties[cls._METADATA_FIELD_NAME] = {
+                "$ref": f"#/$defs/{metadata_def_name}"
+            }
+            defs.update({metadata_def_name: metadata_schema, **metadata_defs})
 
-        aspecs_def_name = self._ASPECTS_FIELD_NAME.capitalize()
-        metadata_def_name = self._METADATA_FIELD_NAME.capitalize()
         return {
             "type": "object",
-            "properties": {
-                self._ASPECTS_FIELD_NAME: {"$ref": f"#/$defs/{aspecs_def_name}"},
-                self._METADATA_FIELD_NAME: {"$ref": f"#/$defs/{metadata_def_name}"},
-            },
-            "required": ["aspects", "meatadata"],
+            "properties": properties,
+            "required": list(properties),
             "additionalProperties": False,
-            "$defs": {
-                aspecs_def_name: aspects_schema,
-                metadata_def_name: metadata_schema,
-                **metadata_defs,
-            },
+            "$defs": defs,
         }
 
     @classmethod
     def _build_aspects_schema(
-        cls, aspects: list[AspectField], allow_additional_properties: bool
+        cls, aspects: Sequence[AspectField], allow_additional_properties: bool
     ) -> dict[str]:
         def to_json_type(aspect_type):
             mapping = {
@@ -101,7 +149,9 @@ class ProductAdapter[M: IMetadata]:
                 "type": to_json_type(aspect.data_type),
             }
             if aspect.allowed_values:
-                defs[aspect.name].update({"enum": list(aspect.allowed_values)})
+                defs[aspect.name].update(
+                    {"enum": sorted(aspect.allowed_values, key=str)}
+                )
 
             properties[aspect.name] = {"$ref": f"#/$defs/{aspect.name}"}
 
@@ -127,7 +177,7 @@ class ProductAdapter[M: IMetadata]:
         if not is_dataclass(metadata_type):
             raise ProductAdapterError("metadata must be a dataclass")
 
-        full_schema = TypeAdapter(metadata_type).json_schema()
+        full_schema = type_adapter(metadata_type).json_schema()
 
         defs = full_schema.get("$defs", {}).copy()
 
@@ -141,3 +191,16 @@ class ProductAdapter[M: IMetadata]:
         product_schema.setdefault("additionalProperties", False)
 
         return product_schema, defs
+
+
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def _cached_schema(
+    metadata_type: type[IMetadata] | None,
+    aspects: tuple[AspectField, ...] | None,
+    allow_additional_aspects: bool,
+) -> dict[str]:
+    # aspect fields are frozen, so the tuple of them is a key of the
+    # category structure
+    return ProductAdapter._build_schema(
+        metadata_type, aspects, allow_additional_aspects
+    )
@@ -1,6 +1,8 @@
-import requests
+import aiohttp
 
-from .utils import request_exception_chain
+from .utils import raise_for_status, request_exception_chain
+
+LOOKUP_URL = "https://api.barcodespider.com/v1/lookup"
 
 
 class BarcodeSearchError(Exception):
@@ -8,13 +10,16 @@ class BarcodeSearchError(Exception):
 
 
 @request_exception_chain(default=BarcodeSearchError)
-def search(barcode: str, token: str) -> str:
+async def search(session: aiohttp.ClientSession, barcode: str, token: str) -> str:
     """Search product by the barcode and returns it's name"""
 
-    resp = requests.get(
-        url="https://api.barcodespider.com/v1/lookup",
-        headers={"token": token},
-        params={"upc": barcode},
-    )
-    resp.raise_for_status()
-    return resp.json()["item_attributes"]["title"]
+    async with session.get(
+        LOOKUP_URL, headers={"token": token}, params={"upc": barcode}
+    ) as resp:
+        await raise_for_status(resp)
+        data = await resp.json()
+
+    try:
+        return data["item_attributes"]["title"]
+    except (KeyError, TypeError) as e:
+        raise BarcodeSearchError("Product not found") from e
@@ -4,6 +4,7 @@ from .base import EbayApplicationClient, EbayAuthError, EbayRequestError, EbayUs
 from .browse import EbayBrowseClient, EbayBrowseClientError
 from .commerce import EbayCommerceClient, EbayCommerceClientError
 from .selling import EbaySellingClient, EbaySellingClientError
+from .streaming import CategoryTreeTable
 from .taxonomy import (
     EbayCategoriesNotFoundError,
     EbayTaxonomyClient,
@@ -1,9 +1,12 @@
+import time
+from collections.abc import Iterable
 from itertools import product
 from typing import TypedDict
 
-import requests
+from app.logger import logger
 
-from ..utils import request_exception_chain
+from ...concurrency import map_bounded
+from ..utils import raise_for_status, request_exception_chain
 from .base import EbayRequestError, EbayUserClient
 from .models import MarketplaceIdEnum
 
@@ -26,37 +29,67 @@ class Policies(TypedDict):
 
 
 class EbayAccountClient(EbayUserClient):
-    _api_endpoint = "sell/account/v1"
+    _api_endpoint = "/sell/account/v1"
+    _policy_types = ("fulfillment", "payment", "return")
 
     @request_exception_chain(default=EbayAccountClientError)
-    def get_all_policies(self, token: str) -> Policies:
-        policy_types = ["fulfillment", "payment", "return"]
+    async def get_all_policies(
+        self,
+        token: str,
+        marketplaces: Iterable[str] = tuple(MarketplaceIdEnum),
+        *,
+        concurrency: int = 10,
+    ) -> Policies:
+        """Fetch policies of every type in the marketplaces, with at most
+        ``concurrency`` requests in flight."""
+        started = time.perf_counter()
+
+        requests = list(product(self._policy_types, marketplaces))
+        results = await map_bounded(
+            lambda request: self._get_policies(token, *request),
+            requests,
+            limit=concurrency,
+        )
 
         policies = Policies(
             fulfillment_policies=[],
             payment_policies=[],
             return_policies=[],
         )
-        for marketplace_id, policy_type in product(policy_types, MarketplaceIdEnum):
-            resp = requests.get(
-                url=self.url(f"/{policy_type}_policy"),
-                params={"marketplace_id": marketplace_id},
-                headers={
-                    **self._user_auth_header(token),
-                    "Content-Type": "application/json",
-                },
+        for (policy_type, _), type_policies in zip(requests, results):
+            policies[f"{policy_type}_policies"].extend(type_policies)
+
+        elapsed = time.perf_counter() - started
+        logger.debug(f"Fetched {len(requests)} policy lists in {elapsed:.3f}s")
+        return policies
+
+    async def _get_policies(
+        self, token: str, policy_type: str, marketplace_id: str
+    ) -> list[Policy]:
+        started = time.perf_counter()
+        async with self.session.get(
+            url=self.url(f"/{policy_type}_policy"),
+            params={"marketplace_id": marketplace_id},
+            headers={
+                **self._user_auth_header(token),
+                "Content-Type": "application/json",
+            },
+        ) as resp:
+            await raise_for_status(resp)
+            data = await resp.json()
+
+        elapsed = time.perf_counter() - started
+        logger.debug(
+            f"GET {policy_type}_policy {marketplace_id}: {resp.status} "
+            f"in {elapsed:.3f}s"
+        )
+
+        return [
+            Policy(
+                id=policy[f"{policy_type}PolicyId"],
+                name=policy["name"],
+                marketplace_id=marketplace_id,
+                category_types=[t["name"] for t in policy["categoryTypes"]],
             )
-            data = resp.json()
-
-            for policy in data[f"{policy_type}Policies"]:
-                category_types = policy["categoryTypes"]
-
-                policies[f"{policy_type}_policies"].append(
-                    Policy(
-                        id=policy[f"{policy_type}PolicyId"],
-                        name=policy["name"],
-                        marketplace_id=marketplace_id,
-                        category_types=[t["name"] for t in category_types],
-                    )
-                )
-            return policies
+            for policy in data.get(f"{policy_type}Policies", [])
+        ]
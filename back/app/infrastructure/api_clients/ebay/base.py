@@ -1,12 +1,13 @@
+import asyncio
 import base64
 import os
+from http import HTTPStatus
 
 import aiohttp
-import requests
 
 from app.data import OAuth2Settings
 
-from ..utils import request_exception_chain
+from ..utils import raise_for_status, request_exception_chain
 from . import models
 
 
@@ -14,8 +15,22 @@ class EbayRequestError(Exception):
     @property
     def response_content(self) -> str | None:
         cause = self.__cause__
-        if isinstance(cause, requests.HTTPError) and cause.response is not None:
-            return cause.response.text
+        if isinstance(cause, aiohttp.ClientResponseError):
+            return cause.message
+
+    @property
+    def status(self) -> int | None:
+        cause = self.__cause__
+        if isinstance(cause, aiohttp.ClientResponseError):
+            return cause.status
+
+    @property
+    def transient(self) -> bool:
+        """Whether the request may succeed if repeated: connection errors,
+        timeouts, throttling and server errors."""
+        if isinstance(self.__cause__, aiohttp.ClientResponseError):
+            return self.status == HTTPStatus.TOO_MANY_REQUESTS or self.status >= 500
+        return isinstance(self.__cause__, (aiohttp.ClientError, asyncio.TimeoutError))
 
 
 class EbayAuthError(EbayRequestError):
@@ -26,13 +41,23 @@ class EbayClientBase:
     _api_endpoint: str = ""
     application_token: str
 
-    def __init__(self, domain: models.EbayDomain, settings: OAuth2Settings):
+    def __init__(
+        self,
+        domain: models.EbayDomain,
+        settings: OAuth2Settings,
+        session: aiohttp.ClientSession,
+    ):
         self.settings = settings
-        super().__init__(domain)
+        self.session = session
+        self._url_base = f"https://{domain}{self._api_endpoint}"
 
     def url(self, path: str):
         return f"{self._url_base}{path}"
 
+    def _basic_auth(self) -> str:
+        auth_str = f"{self.settings['client_id']}:{self.settings['client_secret']}"
+        return f"Basic {base64.b64encode(auth_str.encode()).decode()}"
+
 
 class EbayUserClient(EbayClientBase):
     @staticmethod
@@ -41,52 +66,44 @@ class EbayUserClient(EbayClientBase):
             "Authorization": f"Bearer {token}",
         }
 
+    @request_exception_chain(default=EbayAuthError)
     async def refresh_token(self, refresh_token: str) -> models.RefreshTokenResponse:
-        auth_str = f"{self.settings.client_id}:{self.settings.client_secret}"
         headers = {
             "Content-Type": "application/x-www-form-urlencoded",
-            "Authorization": f"Basic {base64.b64encode(auth_str.encode()).decode()}",
+            "Authorization": self._basic_auth(),
         }
         payload = {
             "grant_type": "refresh_token",
             "refresh_token": refresh_token,
-            "scopes": self.settings.scope,
+            "scope": self.settings["scope"],
         }
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(
-                    self.settings, data=payload, headers=headers
-                ) as resp:
-                    data = None
-                    if resp.content.total_bytes != 0:
-                        data = await resp.json()
-                    resp.raise_for_status()
-                return models.RefreshTokenResponse.model_validate(data)
-
-            except aiohttp.ClientResponseError as e:
-                raise EbayAuthError() from e
+        async with self.session.post(
+            self.settings["access_token_url"], data=payload, headers=headers
+        ) as resp:
+            await raise_for_status(resp)
+            data = await resp.json()
 
-            except aiohttp.ClientConnectionError as e:
-                raise EbayAuthError() from e
+        return models.RefreshTokenResponse.model_validate(data)
 
 
 class EbayApplicationClient(EbayClientBase):
     @request_exception_chain(default=EbayAuthError)
-    def update_token(self):
-        auth_str = f"{self.settings.client_id}:{self.settings.client_secret}"
-        response = requests.post(
-            url=self.settings.access_token_url,
+    async def update_token(self):
+        async with self.session.post(
+            url=self.settings["access_token_url"],
             headers={
                 "Content-Type": "application/x-www-form-urlencoded",
-                "Authorization": f"{base64.b64encode(auth_str.encode()).decode()}",
+                "Authorization": self._basic_auth(),
             },
             data=dict(
                 grant_type="client_credentials",
-                scope=self.settings.scope,
+                scope=self.settings["scope"],
             ),
-        )
+        ) as resp:
+            await raise_for_status(resp)
+            data = await resp.json()
 
-        os.environ["EBAY_APPLICATION_TOKEN"] = response.json()["token"]
+        os.environ["EBAY_APPLICATION_TOKEN"] = data["access_token"]
 
     @classmethod
     def _app_auth_header(cls):
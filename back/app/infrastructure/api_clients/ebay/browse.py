@@ -1,8 +1,6 @@
 from typing import Any
 
-import requests
-
-from ..utils import auth_retry, request_exception_chain
+from ..utils import auth_retry, raise_for_status, request_exception_chain
 from .base import EbayApplicationClient, EbayRequestError
 
 
@@ -15,7 +13,7 @@ class EbayBrowseClient(EbayApplicationClient):
     _api_endpoint = "/buy/browse/v1"
 
     @request_exception_chain(default=EbayBrowseClientError)
-    def search_items(
+    async def search_items(
         self,
         name: str,
         categories_ids: list[str] | None = None,
@@ -23,14 +21,14 @@ class EbayBrowseClient(EbayApplicationClient):
     ) -> Any:
         params = {"q": name}
         if categories_ids:
-            params["category_ids"] = tuple(categories_ids)
+            params["category_ids"] = ",".join(categories_ids)
         if fieldgroups:
-            params["fieldgroups"] = tuple(fieldgroups)
+            params["fieldgroups"] = ",".join(fieldgroups)
 
-        resp = requests.get(
+        async with self.session.get(
             url=self.url("/item_summary/search"),
             params=params,
-            headers=self._user_auth_header(),
-        )
-        resp.raise_for_status()
-        return resp.json()
+            headers=self._app_auth_header(),
+        ) as resp:
+            await raise_for_status(resp)
+            return await resp.json()
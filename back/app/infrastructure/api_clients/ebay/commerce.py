@@ -1,8 +1,11 @@
-import requests
+import os
+
+import aiofiles
+import aiohttp
 
 from app.data import OAuth2Settings
 
-from ..utils import request_exception_chain
+from ..utils import raise_for_status, request_exception_chain
 from .base import EbayRequestError, EbayUserClient
 from .models import EbayDomain, ImageResponse
 
@@ -14,18 +17,30 @@ class EbayCommerceClientError(EbayRequestError):
 class EbayCommerceClient(EbayUserClient):
     _api_endpoint = "/commerce/media/v1_beta"
 
-    def __init__(self, domain: EbayDomain, settings: OAuth2Settings):
+    def __init__(
+        self,
+        domain: EbayDomain,
+        settings: OAuth2Settings,
+        session: aiohttp.ClientSession,
+    ):
+        super().__init__(domain, settings, session)
         subdomain = ".sandbox" if "sandbox" in domain else ""
         self._url_base = f"https://apim{subdomain}.ebay.com{self._api_endpoint}"
-        self.settings = settings
 
     @request_exception_chain(default=EbayCommerceClientError)
-    def upload_image(self, img_path: str, token: str) -> ImageResponse:
+    async def upload_image(self, img_path: str, token: str) -> ImageResponse:
         """Upload image and returnes imageUrl"""
 
-        resp = requests.post(
+        async with aiofiles.open(img_path, "rb") as f:
+            content = await f.read()
+
+        form = aiohttp.FormData()
+        form.add_field("image", content, filename=os.path.basename(img_path))
+
+        async with self.session.post(
             url=self.url("/image/create_image_from_file"),
             headers=self._user_auth_header(token),
-            files={"image": open(img_path, "rb")},
-        )
-        return ImageResponse.model_validate(resp.json())
+            data=form,
+        ) as resp:
+            await raise_for_status(resp)
+            return ImageResponse.model_validate(await resp.json())
@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, StrEnum
 from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, Field, alias_generators
@@ -9,7 +9,7 @@ EbayDomain = Literal["api.ebay.com", "api.sandbox.ebay.com"]
 # --- ENUMS ---
 
 
-class MarketplaceIdEnum(str, Enum):
+class MarketplaceIdEnum(StrEnum):
     EBAY_AU = "EBAY_AU"
     EBAY_AT = "EBAY_AT"
     EBAY_BE = "EBAY_BE"
@@ -163,6 +163,46 @@ class Offer(EbayModel):
     merchant_location_key: str
 
 
+# --- BULK MODELS ---
+
+
+class BulkInventoryItem(InventoryItem):
+    sku: str
+    locale: str
+
+
+class BulkError(EbayModel):
+    error_id: int | None = None
+    message: str | None = None
+
+
+class BulkResponse(EbayModel):
+    status_code: int
+    errors: list[BulkError] = Field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 300
+
+    def error_message(self) -> str:
+        messages = [e.message for e in self.errors if e.message]
+        return "; ".join(messages) or f"status {self.status_code}"
+
+
+class BulkInventoryItemResponse(BulkResponse):
+    sku: str
+
+
+class BulkOfferResponse(BulkResponse):
+    sku: str
+    offer_id: str | None = None
+
+
+class BulkPublishResponse(BulkResponse):
+    offer_id: str
+    listing_id: str | None = None
+
+
 # --- TOKEN RESPONSE ---
 
 
@@ -258,6 +298,11 @@ class Category(EbayModel):
     category_name: str
 
 
+class BaseCategoryTree(EbayModel):
+    category_tree_id: str
+    category_tree_version: str
+
+
 class CategoryTreeNode(EbayModel):
     category: Category
     category_tree_node_level: int
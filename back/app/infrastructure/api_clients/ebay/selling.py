@@ -1,8 +1,8 @@
+import asyncio
+from collections.abc import AsyncIterator
 from typing import TypedDict
 
-import requests
-
-from ..utils import request_exception_chain
+from ..utils import raise_for_status, request_exception_chain
 from . import models
 from .base import EbayRequestError, EbayUserClient
 
@@ -16,37 +16,42 @@ class Location(TypedDict):
     merchant_location_key: str
 
 
+BULK_LIMIT = 25
+
+
 class EbaySellingClient(EbayUserClient):
     _api_endpoint = "/sell/inventory/v1"
 
     @request_exception_chain(default=EbaySellingClientError)
-    def create_or_replace_inventory_item(
+    async def create_or_replace_inventory_item(
         self, sku: str, item: models.InventoryItem, token: str, lang: str = "en-US"
     ):
-        response = requests.put(
+        async with self.session.put(
             url=self.url(f"/inventory_item/{sku}"),
             headers={
                 **self._user_auth_header(token),
                 "Accept-Language": lang,
             },
             json=item.model_dump(by_alias=True, exclude_unset=True),
-        )
-        response.raise_for_status()
+        ) as response:
+            await raise_for_status(response)
 
     @request_exception_chain(default=EbaySellingClientError)
-    def delete_inventory_item(self, sku: int, token: str):
-        response = requests.delete(
+    async def delete_inventory_item(self, sku: int, token: str):
+        async with self.session.delete(
             url=self.url(f"/inventory_item/{sku}"),
             headers=self._user_auth_header(token),
             json={"offerId": sku},
-        )
-        response.raise_for_status()
+        ) as response:
+            await raise_for_status(response)
 
     @request_exception_chain(default=EbaySellingClientError)
-    def create_offer(self, item: models.Offer, token: str, lang: str = "en-US") -> int:
+    async def create_offer(
+        self, item: models.Offer, token: str, lang: str = "en-US"
+    ) -> int:
         """Creates offer and returnes offer_id"""
 
-        response = requests.post(
+        async with self.session.post(
             url=self.url("/offer"),
             json=item.model_dump(by_alias=True, exclude_unset=True),
             headers={
@@ -54,51 +59,142 @@ class EbaySellingClient(EbayUserClient):
                 "Content-Type": "application/json",
                 "Content-Language": lang,
             },
+        ) as response:
+            await raise_for_status(response)
+            return (await response.json())["offerId"]
+
+    @request_exception_chain(default=EbaySellingClientError)
+    async def bulk_create_or_replace_inventory_item(
+        self, items: list[models.BulkInventoryItem], token: str, lang: str = "en-US"
+    ) -> list[models.BulkInventoryItemResponse]:
+        """Creates or replaces up to ``BULK_LIMIT`` inventory items,
+        returns results of each item"""
+
+        data = await self._bulk_request(
+            "/bulk_create_or_replace_inventory_item", items, token, lang
         )
-        response.raise_for_status()
-        return response.json()["offerId"]
+        return [models.BulkInventoryItemResponse.model_validate(r) for r in data]
 
     @request_exception_chain(default=EbaySellingClientError)
-    def get_locations(self, token: str) -> list[Location]:
-        offset = 0, 0
-        max_limit = 100
-        locations = []
-        while True:
-            resp = requests.get(
-                self.url("/location"),
-                params={"offset": offset, "limit": max_limit},
-                headers=self._user_auth_header(token),
-            )
-            resp.raise_for_status()
-
-            data = resp.json()
-
-            for location in data["locations"]:
-                locations.append(
-                    Location(
-                        name=location["name"],
-                        merchant_location_key=location["merchantLocationKey"],
-                    )
-                )
+    async def bulk_create_offer(
+        self, offers: list[models.Offer], token: str, lang: str = "en-US"
+    ) -> list[models.BulkOfferResponse]:
+        """Creates up to ``BULK_LIMIT`` offers, returns results of each offer"""
 
-            if len(locations) == data["total"]:
-                break
-            offset += max_limit
+        data = await self._bulk_request("/bulk_create_offer", offers, token, lang)
+        return [models.BulkOfferResponse.model_validate(r) for r in data]
 
-        return locations
+    @request_exception_chain(default=EbaySellingClientError)
+    async def bulk_publish_offer(
+        self, offer_ids: list[str], token: str
+    ) -> list[models.BulkPublishResponse]:
+        """Publishes up to ``BULK_LIMIT`` offers, returns results of each offer"""
+
+        requests = [{"offerId": offer_id} for offer_id in offer_ids]
+        data = await self._bulk_request("/bulk_publish_offer", requests, token)
+        return [models.BulkPublishResponse.model_validate(r) for r in data]
+
+    async def _bulk_request(
+        self,
+        path: str,
+        requests: list[models.EbayModel | dict],
+        token: str,
+        lang: str | None = None,
+    ) -> list[dict]:
+        if len(requests) > BULK_LIMIT:
+            raise ValueError(f"At most {BULK_LIMIT} requests per bulk call")
+
+        headers = {
+            **self._user_auth_header(token),
+            "Content-Type": "application/json",
+        }
+        if lang is not None:
+            headers["Content-Language"] = lang
+
+        body = [
+            r.model_dump(by_alias=True, exclude_unset=True)
+            if isinstance(r, models.EbayModel)
+            else r
+            for r in requests
+        ]
+        # partial failures come with 207 and per request status codes
+        async with self.session.post(
+            url=self.url(path), json={"requests": body}, headers=headers
+        ) as response:
+            await raise_for_status(response)
+            return (await response.json()).get("responses", [])
 
     @request_exception_chain(default=EbaySellingClientError)
-    def publish_offer(self, offer_id: int, token: str):
-        response = requests.post(
+    async def get_locations(self, token: str) -> list[Location]:
+        return [location async for location in self.iter_locations(token)]
+
+    @request_exception_chain(default=EbaySellingClientError)
+    async def iter_locations(
+        self, token: str, *, page_size: int = 100, concurrency: int = 4
+    ) -> AsyncIterator[Location]:
+        """Yield merchant locations in order.
+
+        Once the first page reveals the total, the remaining pages are
+        requested concurrently. Closing the iterator cancels the requests
+        that are still pending.
+        """
+        page = await self._get_locations_page(token, 0, page_size)
+        for location in page["locations"]:
+            yield location
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(offset: int) -> dict:
+            async with semaphore:
+                return await self._get_locations_page(token, offset, page_size)
+
+        pages = [
+            asyncio.ensure_future(fetch(offset))
+            for offset in range(page_size, page["total"], page_size)
+        ]
+        try:
+            for pending in pages:
+                page = await pending
+                for location in page["locations"]:
+                    yield location
+        finally:
+            for pending in pages:
+                pending.cancel()
+            # requests must not outlive the iterator, e.g. race the session close
+            await asyncio.gather(*pages, return_exceptions=True)
+
+    async def _get_locations_page(self, token: str, offset: int, limit: int) -> dict:
+        async with self.session.get(
+            self.url("/location"),
+            params={"offset": offset, "limit": limit},
+            headers=self._user_auth_header(token),
+        ) as resp:
+            await raise_for_status(resp)
+            data = await resp.json()
+
+        return {
+            "total": data.get("total", 0),
+            "locations": [
+                Location(
+                    name=location["name"],
+                    merchant_location_key=location["merchantLocationKey"],
+                )
+                for location in data.get("locations", [])
+            ],
+        }
+
+    @request_exception_chain(default=EbaySellingClientError)
+    async def publish_offer(self, offer_id: int, token: str):
+        async with self.session.post(
             url=self.url(f"/offer/{offer_id}/publish"),
             headers=self._user_auth_header(token),
-        )
-        response.raise_for_status()
+        ) as response:
+            await raise_for_status(response)
 
     @request_exception_chain(default=EbaySellingClientError)
-    def delete_offer(self, offer_id: int, token: str):
-        response = requests.delete(
+    async def delete_offer(self, offer_id: int, token: str):
+        async with self.session.delete(
             url=self.url(f"/offer/{offer_id}"),
             headers=self._user_auth_header(token),
-        )
-        response.raise_for_status()
+        ) as response:
+            await raise_for_status(response)
@@ -0,0 +1,188 @@
+import json
+import re
+from array import array
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from typing import Any, TextIO
+
+_WHITESPACE = " \t\n\r"
+
+
+class JsonArrayReader:
+    """Lazily decodes items of the first array stored under ``key``.
+
+    Only the item being decoded is kept in memory, so huge documents
+    (e.g. eBay bulk taxonomy files) can be processed as a stream. Items
+    must be JSON objects or arrays. Text before the array is available as
+    ``head`` and the rest of the document is returned by ``read_tail``.
+    """
+
+    def __init__(
+        self,
+        fp: TextIO,
+        key: str,
+        *,
+        chunk_size: int = 1 << 16,
+        object_hook: Callable[[dict], Any] | None = None,
+    ):
+        self.key = key
+        self.head = ""
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder(object_hook=object_hook)
+        self._buffer = ""
+        self._eof = False
+        self._started = False
+        self._finished = False
+
+    def _read(self, min_size: int) -> bool:
+        while not self._eof and len(self._buffer) < min_size:
+            chunk = self._fp.read(self._chunk_size)
+            if not chunk:
+                self._eof = True
+            self._buffer += chunk
+        return len(self._buffer) >= min_size
+
+    def _start(self):
+        start = re.compile(rf'"{re.escape(self.key)}"\s*:\s*\[')
+        keep = len(self.key) + 64
+
+        while True:
+            match = start.search(self._buffer)
+            if match is not None:
+                self.head += self._buffer[: match.start()]
+                self._buffer = self._buffer[match.end() :]
+                self._started = True
+                return
+            if self._eof:
+                raise ValueError(f"Array '{self.key}' not found")
+
+            self.head += self._buffer[:-keep]
+            self._buffer = self._buffer[-keep:]
+            self._read(len(self._buffer) + self._chunk_size)
+
+    def __iter__(self) -> Iterator[Any]:
+        if not self._started:
+            self._start()
+
+        while not self._finished:
+            self._buffer = self._buffer.lstrip(_WHITESPACE)
+            if not self._buffer:
+                if not self._read(1):
+                    raise ValueError(f"Unterminated array '{self.key}'")
+                continue
+
+            if self._buffer[0] == "]":
+                self._buffer = self._buffer[1:]
+                self._finished = True
+                return
+            if self._buffer[0] == ",":
+                self._buffer = self._buffer[1:]
+                continue
+
+            try:
+                item, end = self._decoder.raw_decode(self._buffer)
+            except json.JSONDecodeError as e:
+                if self._eof:
+                    raise ValueError(f"Malformed item in array '{self.key}'") from e
+                self._read(len(self._buffer) * 2)
+                continue
+
+            self._buffer = self._buffer[end:]
+            yield item
+
+    def read_tail(self) -> str:
+        """Return the document text following the array."""
+        if not self._finished:
+            raise ValueError(f"Array '{self.key}' is not consumed")
+        tail = self._buffer + self._fp.read()
+        self._buffer = ""
+        return tail
+
+
+def iter_json_array(
+    fp: TextIO,
+    key: str,
+    *,
+    chunk_size: int = 1 << 16,
+    object_hook: Callable[[dict], Any] | None = None,
+) -> Iterator[Any]:
+    """Lazily decode items of the first array stored under ``key``.
+
+    Raises:
+        ValueError: If the key is missing or the document is malformed
+    """
+    yield from JsonArrayReader(fp, key, chunk_size=chunk_size, object_hook=object_hook)
+
+
+@dataclass
+class CategoryTreeTable:
+    """Flat node table of a category tree in depth-first order.
+
+    The root node is not included, top level categories have parent -1.
+    """
+
+    tree_id: str
+    version: str
+    ids: list[str] = field(default_factory=list)
+    names: list[str] = field(default_factory=list)
+    parents: array = field(default_factory=lambda: array("i"))
+    leaves: bytearray = field(default_factory=bytearray)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def append(self, category_id: str, name: str, parent: int, is_leaf: bool):
+        self.ids.append(category_id)
+        self.names.append(name)
+        self.parents.append(parent)
+        self.leaves.append(is_leaf)
+
+
+def _compact_node(obj: dict) -> Any:
+    # Called bottom-up by the decoder, so every node is reduced to a tuple
+    # as soon as it is parsed and the dicts of the subtree are released.
+    category = obj.get("category")
+    if category is None:
+        return obj
+    return (
+        category["categoryId"],
+        category["categoryName"],
+        bool(obj.get("leafCategoryTreeNode")),
+        obj.get("childCategoryTreeNodes", ()),
+    )
+
+
+def _find_string(text: str, key: str) -> str:
+    match = re.search(rf'"{key}"\s*:\s*("(?:[^"\\]|\\.)*")', text)
+    if match is None:
+        raise ValueError(f"'{key}' not found")
+    return json.loads(match.group(1))
+
+
+def parse_category_tree(fp: TextIO, chunk_size: int = 1 << 16) -> CategoryTreeTable:
+    """Build the node table from a getCategoryTree response without
+    materializing the whole document.
+
+    Raises:
+        ValueError: If the document is malformed
+    """
+    reader = JsonArrayReader(
+        fp, "childCategoryTreeNodes", chunk_size=chunk_size, object_hook=_compact_node
+    )
+
+    table = CategoryTreeTable(tree_id="", version="")
+    for top_node in reader:
+        stack = [(top_node, -1)]
+        while stack:
+            (category_id, name, is_leaf, children), parent = stack.pop()
+            table.append(category_id, name, parent, is_leaf)
+
+            position = len(table) - 1
+            for child in reversed(children):
+                stack.append((child, position))
+
+    document = reader.head + reader.read_tail()
+    table.tree_id = _find_string(document, "categoryTreeId")
+    table.version = _find_string(document, "categoryTreeVersion")
+    return table
@@ -1,13 +1,18 @@
-import requests
+import asyncio
+import io
+import tempfile
+from typing import IO
 
-from ..utils import auth_retry, request_exception_chain
+from ..utils import auth_retry, raise_for_status, request_exception_chain
 from .base import EbayApplicationClient, EbayRequestError
 from .models import (
     AspectMetadata,
+    BaseCategoryTree,
     CategorySuggestionResponse,
     CategoryTree,
     MarketplaceIdEnum,
 )
+from .streaming import CategoryTreeTable, parse_category_tree
 
 
 class EbayTaxonomyClientError(EbayRequestError):
@@ -23,21 +28,26 @@ class EbayTaxonomyClient(EbayApplicationClient):
     _api_endpoint = "/commerce/taxonomy/v1"
 
     @request_exception_chain(default=EbayTaxonomyClientError)
-    def get_default_tree_id(self, marketplace_id: MarketplaceIdEnum) -> str:
+    async def get_default_tree(
+        self, marketplace_id: MarketplaceIdEnum
+    ) -> BaseCategoryTree:
+        """Get id and current version of the marketplace default category tree."""
         if marketplace_id == MarketplaceIdEnum.EBAY_MOTORS:
             marketplace_id = "EBAY_MOTORS_US"
 
-        resp = requests.get(
+        async with self.session.get(
             url=self.url("/get_default_category_tree_id"),
             params={"marketplace_id": marketplace_id},
             headers=self._app_auth_header(),
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        return data["categoryTreeId"]
+        ) as resp:
+            await raise_for_status(resp)
+            return BaseCategoryTree.model_validate(await resp.json())
+
+    async def get_default_tree_id(self, marketplace_id: MarketplaceIdEnum) -> str:
+        return (await self.get_default_tree(marketplace_id)).category_tree_id
 
     @request_exception_chain(default=EbayTaxonomyClientError)
-    def fetch_category_tree(self, tree_id: str) -> CategoryTree:
+    async def fetch_category_tree(self, tree_id: str) -> CategoryTree:
         """Retrieve the complete category tree for a specific eBay marketplace.
 
         Args:
@@ -50,18 +60,83 @@ class EbayTaxonomyClient(EbayApplicationClient):
             EbayTaxonomyClientError: If the request fails
         """
 
-        resp = requests.get(
+        async with self.session.get(
             url=self.url(f"/category_tree/{tree_id}"),
             headers={
                 **self._app_auth_header(),
                 "Accept-Encoding": "gzip",
             },
-        )
-        resp.raise_for_status()
-        return CategoryTree.model_validate(resp.json())
+        ) as resp:
+            await raise_for_status(resp)
+            return CategoryTree.model_validate(await resp.json())
+
+    @request_exception_chain(default=EbayTaxonomyClientError)
+    async def fetch_category_table(
+        self, tree_id: str, chunk_size: int = 1 << 20
+    ) -> CategoryTreeTable:
+        """Retrieve the category tree as a flat node table.
+
+        Unlike fetch_category_tree, the response is spooled to a temporary
+        file and parsed as a stream in a worker thread, no model objects are
+        created for the nodes.
+
+        Args:
+            tree_id (str): The ID of the category tree to retrieve
+            chunk_size (int): Size of chunks written to the temporary file
+
+        Returns:
+            CategoryTreeTable: Node table of all categories except the root
+
+        Raises:
+            EbayTaxonomyClientError: If the request fails or the response is malformed
+        """
+        with tempfile.TemporaryFile() as buffer:
+            async with self.session.get(
+                url=self.url(f"/category_tree/{tree_id}"),
+                headers={
+                    **self._app_auth_header(),
+                    "Accept-Encoding": "gzip",
+                },
+            ) as resp:
+                await raise_for_status(resp)
+                async for chunk in resp.content.iter_chunked(chunk_size):
+                    buffer.write(chunk)
+
+            buffer.seek(0)
+            text = io.TextIOWrapper(buffer, encoding="utf-8")
+            try:
+                return await asyncio.to_thread(parse_category_tree, text)
+            except ValueError as e:
+                raise EbayTaxonomyClientError() from e
+
+    @request_exception_chain(default=EbayTaxonomyClientError)
+    async def fetch_item_aspects(
+        self, category_tree_id: str, dest: IO[bytes], chunk_size: int = 1 << 20
+    ):
+        """Download aspects of all leaf categories of a category tree.
+
+        The response is a gzip-compressed JSON file, it is written to ``dest``
+        as is without loading it into memory. Chunks are written in a worker
+        thread.
+
+        Args:
+            category_tree_id (str): The ID of the eBay category tree
+            dest (IO[bytes]): Binary stream the gzip file is written to
+            chunk_size (int): Size of chunks written to ``dest``
+
+        Raises:
+            EbayTaxonomyClientError: If the request fails
+        """
+        async with self.session.get(
+            url=self.url(f"/category_tree/{category_tree_id}/fetch_item_aspects"),
+            headers=self._app_auth_header(),
+        ) as resp:
+            await raise_for_status(resp)
+            async for chunk in resp.content.iter_chunked(chunk_size):
+                await asyncio.to_thread(dest.write, chunk)
 
     @request_exception_chain(default=EbayTaxonomyClientError)
-    def get_item_aspects(
+    async def get_item_aspects(
         self, category_tree_id: str, category_id: str
     ) -> AspectMetadata:
         """Get detailed information about category-specific aspects.
@@ -76,20 +151,20 @@ class EbayTaxonomyClient(EbayApplicationClient):
         Raises:
             EbayTaxonomyClientError: If the request fails
         """
-        resp = requests.get(
+        async with self.session.get(
             url=self.url(
                 f"/category_tree/{category_tree_id}/get_item_aspects_for_category"
             ),
             params={"category_id": category_id},
             headers=self._app_auth_header(),
-        )
-        resp.raise_for_status()
-        return AspectMetadata.model_validate(resp.json())
+        ) as resp:
+            await raise_for_status(resp)
+            return AspectMetadata.model_validate(await resp.json())
 
     @request_exception_chain(
         default=EbayTaxonomyClientError, on_http=EbayCategoriesNotFoundError
     )
-    def get_category_suggestions(
+    async def get_category_suggestions(
         self, category_tree_id: str, query: str
     ) -> CategorySuggestionResponse:
         """Get category suggestions based on a query string.
@@ -104,9 +179,10 @@ class EbayTaxonomyClient(EbayApplicationClient):
         Raises:
             EbayTaxonomyClientError: If the request fails
         """
-        resp = requests.get(
+        async with self.session.get(
             url=self.url(f"/category_tree/{category_tree_id}/get_category_suggestions"),
             params={"q": query},
             headers=self._app_auth_header(),
-        )
-        return CategorySuggestionResponse.model_validate(resp.json())
+        ) as resp:
+            await raise_for_status(resp)
+            return CategorySuggestionResponse.model_validate(await resp.json())
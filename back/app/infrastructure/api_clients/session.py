@@ -0,0 +1,27 @@
+import aiohttp
+
+
+def create_session(
+    *,
+    limit: int = 100,
+    limit_per_host: int = 10,
+    connect_timeout: float | None = None,
+    read_timeout: float | None = None,
+    total_timeout: float | None = None,
+    keepalive_timeout: float = 30,
+) -> aiohttp.ClientSession:
+    """Create a keep-alive session with a bounded connection pool per host.
+
+    Must be called from a running event loop. Compressed responses are
+    requested and decoded by aiohttp.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keepalive_timeout,
+        ttl_dns_cache=300,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=total_timeout, sock_connect=connect_timeout, sock_read=read_timeout
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
@@ -1,9 +1,12 @@
+import asyncio
+import inspect
 from collections.abc import Callable
+from contextlib import aclosing
 from functools import wraps
+from http import HTTPStatus
 from typing import Protocol
 
-from requests import codes
-from requests.exceptions import ConnectionError, HTTPError, RequestException, Timeout
+import aiohttp
 
 
 def request_exception_chain(
@@ -15,51 +18,101 @@ def request_exception_chain(
     on_http: type[Exception] | None = None,
 ) -> Callable:
     exceptions_map = {
-        RequestException: on_request,
-        ConnectionError: on_connection,
-        Timeout: on_timeout,
-        HTTPError: on_http,
+        aiohttp.ClientError: on_request,
+        aiohttp.ClientConnectionError: on_connection,
+        asyncio.TimeoutError: on_timeout,
+        aiohttp.ClientResponseError: on_http,
     }
     exceptions = tuple(exceptions_map.keys())
 
+    def chain(e: Exception) -> Exception:
+        # aiohttp timeouts are connection errors as well
+        mro = type(e).__mro__
+        if isinstance(e, asyncio.TimeoutError):
+            mro = (asyncio.TimeoutError, *mro)
+
+        ex_type = None
+        for cls in mro:
+            if cls in exceptions_map:
+                ex_type = exceptions_map[cls]
+                break
+        if ex_type is None:
+            ex_type = default
+
+        return ex_type()
+
     def wrapped(func: Callable):
+        if inspect.isasyncgenfunction(func):
+
+            @wraps(func)
+            async def gen_inner(*args, **kwargs):
+                try:
+                    async with aclosing(func(*args, **kwargs)) as items:
+                        async for item in items:
+                            yield item
+                except exceptions as e:
+                    raise chain(e) from e
+
+            return gen_inner
+
         @wraps(func)
-        def inner(*args, **kwargs):
+        async def inner(*args, **kwargs):
             try:
-                return func(*args, **kwargs)
+                return await func(*args, **kwargs)
             except exceptions as e:
-                ex_type = exceptions_map.get(type(e))
-                if ex_type is None:
-                    ex_type = default
-
-                raise ex_type() from e
+                raise chain(e) from e
 
         return inner
 
     return wrapped
 
 
+async def raise_for_status(resp: aiohttp.ClientResponse):
+    """Like ``ClientResponse.raise_for_status``, but keeps the response body
+    as the error message."""
+    if resp.ok:
+        return
+
+    raise aiohttp.ClientResponseError(
+        resp.request_info,
+        resp.history,
+        status=resp.status,
+        message=await resp.text(),
+        headers=resp.headers,
+    )
+
+
 class TokenUpdater(Protocol):
-    def update_token(self):
+    async def update_token(self):
         pass
 
 
+def _is_unauthorized(e: BaseException) -> bool:
+    while e is not None:
+        if isinstance(e, aiohttp.ClientResponseError):
+            return e.status == HTTPStatus.UNAUTHORIZED
+        e = e.__cause__
+    return False
+
+
 def auth_retry[T: TokenUpdater](cls: T) -> T:
-    def _wrap_method(method: Callable, auth_method: Callable[[], None]):
+    """Retry a failed method once after ``update_token`` if the request was
+    unauthorized."""
+
+    def _wrap_method(method: Callable):
         @wraps(method)
-        def wrapper(*args, **kwargs):
+        async def wrapper(self, *args, **kwargs):
             try:
-                return method(*args, **kwargs)
-            except HTTPError as e:
-                if e.response.status_code != codes.unauthorized:
+                return await method(self, *args, **kwargs)
+            except Exception as e:
+                if not _is_unauthorized(e):
                     raise
-                auth_method()
-            return method(*args, **kwargs)
+            await self.update_token()
+            return await method(self, *args, **kwargs)
 
         return wrapper
 
-    auth_method = cls.__dict__.get("update_token")
-    for attr_name, attr_value in cls.__dict__.items():
-        if callable(attr_value) and attr_name != "update_token":
-            setattr(cls, attr_name, _wrap_method(attr_value, auth_method))
+    for attr_name, attr_value in list(cls.__dict__.items()):
+        if inspect.iscoroutinefunction(attr_value) and attr_name != "update_token":
+            setattr(cls, attr_name, _wrap_method(attr_value))
     return cls
@@ -0,0 +1,135 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+
+from app.logger import logger
+
+from ..utils import recognition
+
+
+class BarcodeDecoderBusyError(Exception):
+    pass
+
+
+@dataclass
+class DecoderStats:
+    decoded: int = 0
+    failed: int = 0
+    rejected: int = 0
+    queue_wait_seconds: float = 0
+    """Total time images waited for a free worker"""
+    decode_seconds: float = 0
+    """Total time workers spent decoding images"""
+
+    @property
+    def avg_queue_wait(self) -> float:
+        return self.queue_wait_seconds / self.decoded if self.decoded else 0
+
+    @property
+    def avg_decode(self) -> float:
+        return self.decode_seconds / self.decoded if self.decoded else 0
+
+
+def _decode(img_path: str) -> tuple[list[str], float]:
+    started = time.perf_counter()
+    barcodes = recognition.extract_barcodes(img_path)
+    return barcodes, time.perf_counter() - started
+
+
+class BarcodeDecoder:
+    """Decodes barcodes on images in a pool of worker processes.
+
+    At most ``workers + queue_size`` images are accepted at once, further
+    images are rejected with ``BarcodeDecoderBusyError`` instead of queued.
+    An image stays accepted until its worker finishes, even if the caller
+    was cancelled. Stats are logged at most once per ``stats_log_interval``
+    seconds.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        queue_size: int = 16,
+        stats_log_interval: float = 60,
+        executor: Executor | None = None,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.capacity = self.workers + queue_size
+        self.stats = DecoderStats()
+        self.stats_log_interval = stats_log_interval
+        # workers are not forked from the server process, which runs threads
+        self._executor = executor or ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._stats_logged_at = time.monotonic()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def decode(self, img_path: str) -> list[str]:
+        """raise BarcodeDecoderBusyError if the queue is full"""
+        with self._lock:
+            busy = self._pending >= self.capacity
+            if busy:
+                self.stats.rejected += 1
+            else:
+                self._pending += 1
+
+        if busy:
+            self._log_stats()
+            raise BarcodeDecoderBusyError()
+
+        started = time.perf_counter()
+        try:
+            future = self._executor.submit(_decode, img_path)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            barcodes, decode_time = await asyncio.wrap_future(future)
+        except Exception:
+            self.stats.failed += 1
+            self._log_stats()
+            raise
+
+        queue_wait = max(time.perf_counter() - started - decode_time, 0)
+        self.stats.decoded += 1
+        self.stats.queue_wait_seconds += queue_wait
+        self.stats.decode_seconds += decode_time
+        logger.debug(
+            f"Decoded barcodes in {decode_time:.3f}s "
+            f"after waiting {queue_wait:.3f}s in queue"
+        )
+        self._log_stats()
+        return barcodes
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _log_stats(self):
+        now = time.monotonic()
+        if now - self._stats_logged_at < self.stats_log_interval:
+            return
+        self._stats_logged_at = now
+
+        stats = self.stats
+        logger.info(
+            f"Barcode decoder: {stats.decoded} decoded, {stats.failed} failed, "
+            f"{stats.rejected} rejected, {self.pending} pending, "
+            f"avg queue wait {stats.avg_queue_wait:.3f}s, "
+            f"avg decode {stats.avg_decode:.3f}s"
+        )
+
+    def _release(self, future: Future | None = None):
+        with self._lock:
+            self._pending -= 1
@@ -1,28 +1,40 @@
+import asyncio
 from dataclasses import dataclass
 
-from app.services.ports import CategoriesNotFoundError, CategoryPredictorError
+from app.logger import logger
+from app.services.ports import (
+    CategoriesNotFoundError,
+    CategoryPredictorError,
+    ICategoryPredictor,
+)
 
 from .api_clients.ebay import (
     EbayCategoriesNotFoundError,
     EbayTaxonomyClient,
     EbayTaxonomyClientError,
 )
+from .taxonomy import CategorySearchCache, CategoryTreeStore, DefaultTreeIdCache
 
 
 @dataclass
 class EbayCategoryPredictor:
     taxonomy_api: EbayTaxonomyClient
+    tree_ids: DefaultTreeIdCache
 
-    def predict(
+    async def predict(
         self, product_name: str, *, marketplace: str | None = None
     ) -> list[str]:
         if marketplace is None:
             raise ValueError("Marketplace must be specified")
 
         try:
-            tree_id = self.taxonomy_api.get_default_tree_id(marketplace)
+            tree_id = await self.tree_ids.get(
+                marketplace, self.taxonomy_api.get_default_tree_id
+            )
 
-            resp = self.taxonomy_api.get_category_suggestions(tree_id, product_name)
+            resp = await self.taxonomy_api.get_category_suggestions(
+                tree_id, product_name
+            )
 
             categories = []
             for suggestion in resp.category_suggestions:
@@ -37,3 +49,54 @@ class EbayCategoryPredictor:
 
         except EbayCategoriesNotFoundError as e:
             raise CategoriesNotFoundError() from e
+
+
+@dataclass
+class LocalCategoryPredictor:
+    """Predicts categories by searching leaf names and paths of the cached
+    category tree, so no taxonomy requests are made once the tree is loaded.
+    The search runs in a worker thread.
+
+    ``fallback`` is used when the tree can't be loaded or no category
+    reaches ``min_score``.
+    """
+
+    taxonomy_api: EbayTaxonomyClient
+    tree_ids: DefaultTreeIdCache
+    category_trees: CategoryTreeStore
+    category_search: CategorySearchCache
+    limit: int = 10
+    min_score: float = 0.3
+    fallback: ICategoryPredictor | None = None
+
+    async def predict(
+        self, product_name: str, *, marketplace: str | None = None
+    ) -> list[str]:
+        if marketplace is None:
+            raise ValueError("Marketplace must be specified")
+
+        try:
+            tree_id = await self.tree_ids.get(
+                marketplace, self.taxonomy_api.get_default_tree_id
+            )
+            tree = await self.category_trees.get(
+                tree_id, self.taxonomy_api.fetch_category_table
+            )
+        except EbayTaxonomyClientError as e:
+            if self.fallback is None:
+                raise CategoryPredictorError("Failed to load ebay category tree") from e
+
+            logger.warning(f"Local category prediction is unavailable: {e}")
+            return await self.fallback.predict(product_name, marketplace=marketplace)
+
+        search_index = await self.category_search.get(tree)
+        matches = await asyncio.to_thread(
+            search_index.search, product_name, self.limit, min_score=self.min_score
+        )
+        if matches:
+            return list(dict.fromkeys(match.record.name for match in matches))
+
+        if self.fallback is not None:
+            return await self.fallback.predict(product_name, marketplace=marketplace)
+
+        raise CategoriesNotFoundError()
@@ -0,0 +1,106 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+
+def chunks[T](items: Sequence[T], size: int) -> list[Sequence[T]]:
+    """Split the items into consecutive slices of at most ``size`` items."""
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+async def gather_or_cancel(*aws: Awaitable[Any]) -> list[Any]:
+    """Run awaitables concurrently and return their results in order.
+
+    Unlike ``asyncio.gather``, the remaining awaitables are cancelled as
+    soon as one of them fails, and the original exception is raised.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def map_bounded[T, R](
+    func: Callable[[T], Awaitable[R]], items: Iterable[T], *, limit: int
+) -> list[R]:
+    """Apply ``func`` to the items with at most ``limit`` calls in flight.
+
+    Results keep the order of the items.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def call(item: T) -> R:
+        async with semaphore:
+            return await func(item)
+
+    return await gather_or_cancel(*(call(item) for item in items))
+
+
+async def retry[R](
+    func: Callable[[], Awaitable[R]],
+    *,
+    attempts: int,
+    delay: float = 0,
+    backoff: float = 2,
+    retry_if: Callable[[Exception], bool] = lambda e: True,
+) -> R:
+    """Call ``func`` up to ``attempts`` times while ``retry_if`` accepts
+    the raised error, sleeping ``delay * backoff ** n`` between attempts."""
+    for attempt in range(attempts):
+        try:
+            return await func()
+        except Exception as e:
+            if attempt == attempts - 1 or not retry_if(e):
+                raise
+        await asyncio.sleep(delay * backoff**attempt)
+
+
+@dataclass
+class _Call[R]:
+    future: asyncio.Future[R]
+    waiters: int = 0
+
+
+class SingleFlight[K: Hashable, R]:
+    """Shares one call of ``func`` between concurrent callers of a key.
+
+    The call runs in its own task, so a cancelled caller does not cancel
+    it for the others waiting on the same key. The call is cancelled when
+    its last caller is cancelled.
+    """
+
+    def __init__(self):
+        self._calls: dict[K, _Call[R]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: K, func: Callable[[], Awaitable[R]]) -> R:
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(func()))
+            self._calls[key] = call
+            call.future.add_done_callback(lambda _: self._forget(key, call))
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.future)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.future.done():
+                # nobody waits for the result anymore, later callers of the
+                # key start a new call
+                self._forget(key, call)
+                call.future.cancel()
+
+    def _forget(self, key: K, call: _Call[R]):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if call.future.done() and not call.future.cancelled():
+            # the error is raised to the callers, if any of them still wait
+            call.future.exception()
@@ -0,0 +1,116 @@
+import json
+from dataclasses import dataclass
+from typing import Any
+
+type JSONPath = tuple[str | int, ...]
+
+_SCALAR_END = frozenset(",}] \t\r\n")
+
+
+@dataclass
+class _Container:
+    start: int
+    is_object: bool
+    member: str | int | None
+    expects_key: bool
+
+
+class JSONStreamParser:
+    """Incremental parser of a JSON document fed in chunks.
+
+    ``feed`` returns the values that became complete with the chunk, with
+    their paths, as soon as the closing character is read. Only values up
+    to ``max_depth`` members deep are reported.
+    """
+
+    def __init__(self, max_depth: int = 2):
+        self._max_depth = max_depth
+        self._text = ""
+        self._pos = 0
+        self._stack: list[_Container] = []
+        self._in_string = False
+        self._escape = False
+        self._value_start = 0
+        self._in_scalar = False
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def feed(self, chunk: str) -> list[tuple[JSONPath, Any]]:
+        """raise ValueError if the document is not valid JSON"""
+        self._text += chunk
+        values: list[tuple[JSONPath, Any]] = []
+
+        text, i = self._text, self._pos
+        while i < len(text):
+            char = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._end_value(i + 1, values)
+                i += 1
+                continue
+
+            if self._in_scalar:
+                if char not in _SCALAR_END:
+                    i += 1
+                    continue
+                self._in_scalar = False
+                self._end_value(i, values)
+
+            if char == '"':
+                self._in_string = True
+                self._value_start = i
+            elif char in "{[":
+                is_object = char == "{"
+                self._stack.append(
+                    _Container(
+                        start=i,
+                        is_object=is_object,
+                        member=None if is_object else 0,
+                        expects_key=is_object,
+                    )
+                )
+            elif char in "}]":
+                if not self._stack:
+                    raise ValueError(f"Unexpected {char!r} at {i}")
+                self._value_start = self._stack.pop().start
+                self._end_value(i + 1, values)
+            elif char == ":":
+                if not self._stack or not self._stack[-1].is_object:
+                    raise ValueError(f"Unexpected ':' at {i}")
+                self._stack[-1].expects_key = False
+            elif char == ",":
+                if not self._stack:
+                    raise ValueError(f"Unexpected ',' at {i}")
+                container = self._stack[-1]
+                if container.is_object:
+                    container.expects_key = True
+                else:
+                    container.member += 1
+            elif not char.isspace():
+                self._in_scalar = True
+                self._value_start = i
+            i += 1
+
+        self._pos = i
+        return values
+
+    def _end_value(self, end: int, values: list[tuple[JSONPath, Any]]):
+        if not self._stack:
+            return
+
+        container = self._stack[-1]
+        if container.is_object and container.expects_key:
+            container.member = json.loads(self._text[self._value_start : end])
+            return
+
+        path = tuple(c.member for c in self._stack)
+        if len(path) <= self._max_depth:
+            values.append((path, json.loads(self._text[self._value_start : end])))
@@ -2,10 +2,12 @@ from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 
 import jwt
-from pydantic import TypeAdapter, ValidationError
+from pydantic import ValidationError
 
 from app.services.ports import AuthToken, InvalidPayloadTypeError
 
+from .type_adapters import type_adapter
+
 
 @dataclass
 class JWTAuth[T]:
@@ -21,7 +23,7 @@ class JWTAuth[T]:
         payload = {
             "iat": now,
             "exp": expires_at,
-            "data": TypeAdapter(type(data)).dump_python(data),
+            "data": type_adapter(type(data)).dump_python(data),
         }
 
         token = jwt.encode(payload, self.jwt_secret, algorithm=self.jwt_algorithm)
@@ -32,7 +34,7 @@ class JWTAuth[T]:
             payload = jwt.decode(
                 token, self.jwt_secret, algorithms=[self.jwt_algorithm]
             )
-            return TypeAdapter(data_type).validate_python(payload["data"])
+            return type_adapter(data_type).validate_python(payload["data"])
 
         except (jwt.ExpiredSignatureError, jwt.InvalidToken):
             return
@@ -0,0 +1,100 @@
+import json
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from typing import Self
+
+from redis import RedisError
+from redis.asyncio import Redis
+
+from app.logger import logger
+
+from .api_clients.ebay.account import Policies
+from .api_clients.ebay.models import MarketplaceIdEnum
+from .api_clients.ebay.selling import Location
+from .marketplace_aspects import EbayPolicies
+
+
+@dataclass(frozen=True)
+class ListingSettings:
+    """Business policy ids and merchant location keys of a seller in one
+    marketplace, keyed by casefolded name."""
+
+    fulfillment_policies: dict[str, str]
+    payment_policies: dict[str, str]
+    return_policies: dict[str, str]
+    locations: dict[str, str]
+
+    @classmethod
+    def build(cls, policies: Policies, locations: list[Location]) -> Self:
+        def ids(items: list, id_key: str) -> dict[str, str]:
+            return {item["name"].casefold(): item[id_key] for item in items}
+
+        return cls(
+            fulfillment_policies=ids(policies["fulfillment_policies"], "id"),
+            payment_policies=ids(policies["payment_policies"], "id"),
+            return_policies=ids(policies["return_policies"], "id"),
+            locations=ids(locations, "merchant_location_key"),
+        )
+
+    def policy_ids(self, policies: EbayPolicies) -> tuple[str, str, str] | None:
+        fulfillment_id = self.fulfillment_policies.get(
+            policies.fulfillment_policy.casefold()
+        )
+        payment_id = self.payment_policies.get(policies.payment_policy.casefold())
+        return_id = self.return_policies.get(policies.return_policy.casefold())
+
+        if not (fulfillment_id and payment_id and return_id):
+            return None
+
+        return fulfillment_id, payment_id, return_id
+
+    def location_key(self, location_name: str) -> str | None:
+        return self.locations.get(location_name.casefold())
+
+
+@dataclass
+class ListingSettingsCache:
+    """Listing settings of sellers shared between workers through Redis.
+
+    Entries live for ``ttl`` and are dropped by ``invalidate`` when the
+    seller reloads the account settings.
+    """
+
+    redis: Redis
+    ttl: timedelta
+
+    @staticmethod
+    def _to_key(user_uuid: uuid.UUID, marketplace_id: str) -> str:
+        return f"ebay:listing_settings:{user_uuid}:{marketplace_id}"
+
+    async def get(
+        self, user_uuid: uuid.UUID, marketplace_id: str
+    ) -> ListingSettings | None:
+        try:
+            value = await self.redis.get(self._to_key(user_uuid, marketplace_id))
+            if value is None:
+                return None
+            return ListingSettings(**json.loads(value))
+        except (RedisError, ValueError, TypeError) as e:
+            logger.warning(f"Failed to read listing settings from redis: {e}")
+            return None
+
+    async def set(
+        self, user_uuid: uuid.UUID, marketplace_id: str, settings: ListingSettings
+    ):
+        try:
+            await self.redis.set(
+                self._to_key(user_uuid, marketplace_id),
+                json.dumps(asdict(settings)),
+                ex=self.ttl,
+            )
+        except RedisError as e:
+            logger.warning(f"Failed to store listing settings in redis: {e}")
+
+    async def invalidate(self, user_uuid: uuid.UUID):
+        keys = [self._to_key(user_uuid, m) for m in MarketplaceIdEnum]
+        try:
+            await self.redis.delete(*keys)
+        except RedisError as e:
+            logger.warning(f"Failed to invalidate listing settings in redis: {e}")
@@ -1,13 +1,16 @@
-from collections.abc import Generator
+from collections.abc import Awaitable, Callable, Generator, Sequence
+from contextlib import aclosing
 from dataclasses import asdict, dataclass
 
 from pydantic import ValidationError
 
 from app.domain.entities import AspectField, AspectType, Item
-from app.domain.entities.account import AccountSettings
+from app.domain.entities.account import AccountSettings, MarketplaceAccount
 from app.services.ports import (
     CategoriesNotFoundError,
+    CategoryNotFound,
     MarketplaceAPIError,
+    PublishResult,
 )
 from app.services.ports.errors import AccountSettingsNotFound
 
@@ -22,7 +25,29 @@ from .api_clients.ebay import (
     EbayTaxonomyClientError,
 )
 from .api_clients.ebay import models as ebay_models
-from .marketplace_aspects import EbayAspects, EbayPolicies
+from .api_clients.ebay.selling import BULK_LIMIT, Location
+from .concurrency import chunks, gather_or_cancel, map_bounded, retry
+from .listing_settings import ListingSettings, ListingSettingsCache
+from .marketplace_aspects import EbayAspects
+from .taxonomy import (
+    CategoryRecord,
+    CategorySearchCache,
+    CategoryTreeIndex,
+    CategoryTreeStore,
+    DefaultTreeIdCache,
+    ItemAspectsCache,
+)
+
+
+@dataclass
+class _BatchListing:
+    """Item of a batch publish that passed the previous steps"""
+
+    index: int
+    sku: str
+    inventory_item: ebay_models.BulkInventoryItem
+    offer: ebay_models.Offer
+    offer_id: str | None = None
 
 
 @dataclass
@@ -32,131 +57,416 @@ class EbayAPI:
     commerce_api: EbayCommerceClient
     account_api: EbayAccountClient
     sku_generator: Generator[str, None, None]
-
-    def publish(self, item: Item[EbayAspects], token: str, *images: str):
+    category_trees: CategoryTreeStore
+    tree_ids: DefaultTreeIdCache
+    item_aspects: ItemAspectsCache
+    category_search: CategorySearchCache
+    upload_concurrency: int = 4
+    upload_attempts: int = 3
+    upload_retry_delay: float = 0.5
+    batch_concurrency: int = 4
+    listing_settings: ListingSettingsCache | None = None
+
+    async def publish(
+        self,
+        item: Item[EbayAspects],
+        token: str,
+        *images: str,
+        account: MarketplaceAccount | None = None,
+    ):
         sku = next(self.sku_generator)[:50]
+        marketplace_aspects = item.marketplace_aspects
 
         try:
-            images_urls = self._load_images(*images)
-            inventory_item = self._to_inventory_item(item, images_urls)
-
-            _, category_id, _ = self._search_category(
-                item.category, item.marketplace_aspects.marketplace
+            # Category and listing settings are resolved while images upload
+            images_urls, search_res, listing_ids = await gather_or_cancel(
+                self._load_images(token, *images),
+                self._search_category(item.category, marketplace_aspects.marketplace),
+                self._get_listing_ids(marketplace_aspects, token, account),
             )
-
-            self.selling_api.create_or_replace_inventory_item(sku, inventory_item)
-        except (EbayCommerceClientError, EbaySellingClientError) as e:
-            self._publish_cleanup(token, sku)
+        except (
+            EbayCommerceClientError,
+            EbayTaxonomyClientError,
+            EbayAccountClientError,
+            EbaySellingClientError,
+        ) as e:
             raise MarketplaceAPIError() from e
 
+        if search_res is None:
+            raise CategoryNotFound(item.category)
+        if listing_ids is None:
+            raise AccountSettingsNotFound()
+
+        _, category = search_res
+        fulfillment_id, payment_id, return_id, location_key = listing_ids
+
         offer_id = None
-        marketplace_aspects = item.marketplace_aspects
         try:
-            res = self._get_policeis_ids(marketplace_aspects.policies)
-            if res is not None:
-                raise AccountSettingsNotFound()
-            fulfillment_id, payment_id, return_id = res
-
-            location_key = self._get_location_key(marketplace_aspects.location)
-            if res is not None:
-                raise AccountSettingsNotFound()
+            inventory_item = self._to_inventory_item(item, images_urls)
+            await self.selling_api.create_or_replace_inventory_item(
+                sku, inventory_item, token
+            )
 
             offer = self._create_offer(
                 sku,
-                category_id,
+                category.category_id,
                 item.currency,
                 item.price,
+                marketplace_aspects.marketplace,
                 fulfillment_id,
                 payment_id,
                 return_id,
                 location_key,
             )
-            offer_id = self.selling_api.create_offer(offer)
+            offer_id = await self.selling_api.create_offer(offer, token)
 
-            self.selling_api.publish_offer(offer_id)
+            await self.selling_api.publish_offer(offer_id, token)
 
-        except (EbaySellingClientError, EbayAccountClientError) as e:
-            self._publish_cleanup(token, sku, offer_id)
+        except EbaySellingClientError as e:
+            await self._publish_cleanup(token, sku, offer_id)
 
             raise MarketplaceAPIError() from e
 
-        except AccountSettingsNotFound:
-            raise
+    async def publish_batch(
+        self,
+        items: Sequence[tuple[Item[EbayAspects], Sequence[str]]],
+        token: str,
+        *,
+        account: MarketplaceAccount | None = None,
+    ) -> list[PublishResult]:
+        """Publish items through the bulk endpoints of the inventory API.
+
+        Items are prepared concurrently, then inventory items, offers and
+        publications are sent in chunks of ``BULK_LIMIT``. An item that
+        fails a step is reported in its result and skipped by the next
+        steps, the inventory item and offer it left are deleted.
+        """
+        results = [PublishResult() for _ in items]
+
+        aspects_by_marketplace: dict[str, list[EbayAspects]] = {}
+        for item, _ in items:
+            aspects = item.marketplace_aspects
+            aspects_by_marketplace.setdefault(aspects.marketplace, []).append(aspects)
+
+        try:
+            marketplace_settings = await gather_or_cancel(
+                *(
+                    self._batch_listing_settings(mid, aspects, token, account)
+                    for mid, aspects in aspects_by_marketplace.items()
+                )
+            )
+        except (EbayAccountClientError, EbaySellingClientError) as e:
+            raise MarketplaceAPIError() from e
+        settings = dict(zip(aspects_by_marketplace, marketplace_settings))
+
+        async def prepare(index: int) -> _BatchListing | None:
+            item, images = items[index]
+            try:
+                return await self._prepare_batch_listing(
+                    index, item, images, token, settings
+                )
+            except (CategoryNotFound, AccountSettingsNotFound) as e:
+                results[index].error = e
+            except (
+                EbayCommerceClientError,
+                EbayTaxonomyClientError,
+                MarketplaceAPIError,
+            ) as e:
+                results[index].error = MarketplaceAPIError(str(e))
+
+        prepared = await map_bounded(
+            prepare, range(len(items)), limit=self.batch_concurrency
+        )
+        listings = [listing for listing in prepared if listing is not None]
+
+        def fail(listing: _BatchListing, message: str):
+            results[listing.index].error = MarketplaceAPIError(message)
+
+        stored = await self._batch_step(
+            listings,
+            lambda chunk: self.selling_api.bulk_create_or_replace_inventory_item(
+                [listing.inventory_item for listing in chunk], token
+            ),
+            lambda listing, resp: resp.sku == listing.sku,
+            fail,
+        )
+
+        with_offers = await self._batch_step(
+            [listing for listing, _ in stored],
+            lambda chunk: self.selling_api.bulk_create_offer(
+                [listing.offer for listing in chunk], token
+            ),
+            lambda listing, resp: resp.sku == listing.sku,
+            fail,
+        )
+        for listing, resp in with_offers:
+            listing.offer_id = resp.offer_id
+
+        published = await self._batch_step(
+            [listing for listing, _ in with_offers],
+            lambda chunk: self.selling_api.bulk_publish_offer(
+                [listing.offer_id for listing in chunk], token
+            ),
+            lambda listing, resp: resp.offer_id == listing.offer_id,
+            fail,
+        )
+        for listing, resp in published:
+            results[listing.index].listing_id = resp.listing_id
+
+        failed = [
+            listing for listing, _ in stored if results[listing.index].error is not None
+        ]
+        await map_bounded(
+            lambda listing: self._publish_cleanup(token, listing.sku, listing.offer_id),
+            failed,
+            limit=self.batch_concurrency,
+        )
+
+        return results
+
+    async def _prepare_batch_listing(
+        self,
+        index: int,
+        item: Item[EbayAspects],
+        images: Sequence[str],
+        token: str,
+        settings: dict[str, ListingSettings],
+    ) -> _BatchListing:
+        marketplace_aspects = item.marketplace_aspects
+        listing_ids = self._listing_ids(
+            settings[marketplace_aspects.marketplace], marketplace_aspects
+        )
+        if listing_ids is None:
+            raise AccountSettingsNotFound()
+
+        images_urls, search_res = await gather_or_cancel(
+            self._load_images(token, *images),
+            self._search_category(item.category, marketplace_aspects.marketplace),
+        )
+        if search_res is None:
+            raise CategoryNotFound(item.category)
+
+        _, category = search_res
+        sku = next(self.sku_generator)[:50]
+        inventory_item = self._to_inventory_item(item, images_urls)
+
+        return _BatchListing(
+            index=index,
+            sku=sku,
+            inventory_item=ebay_models.BulkInventoryItem.model_validate(
+                {
+                    **inventory_item.model_dump(exclude_unset=True),
+                    "sku": sku,
+                    "locale": "en_US",
+                }
+            ),
+            offer=self._create_offer(
+                sku,
+                category.category_id,
+                item.currency,
+                item.price,
+                marketplace_aspects.marketplace,
+                *listing_ids,
+            ),
+        )
+
+    async def _batch_step[R: ebay_models.BulkResponse](
+        self,
+        listings: list[_BatchListing],
+        call: Callable[[Sequence[_BatchListing]], Awaitable[list[R]]],
+        matches: Callable[[_BatchListing, R], bool],
+        fail: Callable[[_BatchListing, str], None],
+    ) -> list[tuple[_BatchListing, R]]:
+        """Send listings in chunks of ``BULK_LIMIT`` and return the ones
+        that succeeded with their responses."""
+
+        async def send(chunk: Sequence[_BatchListing]) -> list[tuple[_BatchListing, R]]:
+            try:
+                responses = await call(chunk)
+            except EbaySellingClientError as e:
+                for listing in chunk:
+                    fail(listing, e.response_content or "bulk request failed")
+                return []
+
+            succeeded = []
+            for listing in chunk:
+                resp = next((r for r in responses if matches(listing, r)), None)
+                if resp is None:
+                    fail(listing, "no response for the item")
+                elif not resp.ok:
+                    fail(listing, resp.error_message())
+                else:
+                    succeeded.append((listing, resp))
+            return succeeded
+
+        sent = await map_bounded(
+            send, chunks(listings, BULK_LIMIT), limit=self.batch_concurrency
+        )
+        return [pair for chunk in sent for pair in chunk]
 
-    def _publish_cleanup(self, token: str, sku: str, offer_id: str | None = None):
+    async def _publish_cleanup(self, token: str, sku: str, offer_id: str | None = None):
         try:
-            self.selling_api.delete_inventory_item(sku, token)
+            await self.selling_api.delete_inventory_item(sku, token)
             if offer_id:
-                self.selling_api.delete_offer(offer_id, token)
+                await self.selling_api.delete_offer(offer_id, token)
         except EbaySellingClientError:
             pass
 
-    def get_product_aspects(
+    async def get_product_aspects(
         self, category_name: str, *, marketplace_id: str
     ) -> list[AspectType]:
         try:
-            search_res = self._search_category(category_name, marketplace_id)
+            search_res = await self._search_category(category_name, marketplace_id)
 
             if search_res is None:
                 raise CategoriesNotFoundError(category_name)
 
-            tree_id, category_id, _ = search_res
-            ebay_aspects = self.taxonomy_api.get_item_aspects(tree_id, category_id)
-            return self._from_ebay_aspects(ebay_aspects)
+            index, category = search_res
+            aspects = await self.item_aspects.get(
+                index.tree_id,
+                index.version,
+                category.category_id,
+                fetch=lambda: self.taxonomy_api.get_item_aspects(
+                    index.tree_id, category.category_id
+                ),
+                convert=self._from_ebay_aspects,
+            )
+            return aspects.fields
 
         except EbayTaxonomyClientError as e:
             raise MarketplaceAPIError from e
         except CategoriesNotFoundError:
             raise
 
-    def get_account_settings(self, token: str) -> AccountSettings:
+    async def get_account_settings(
+        self, token: str, *, account: MarketplaceAccount | None = None
+    ) -> AccountSettings:
         def get_names(items):
             return [it.name for it in items]
 
-        policies = self.account_api.get_all_policies(token)
+        if account is not None and self.listing_settings is not None:
+            await self.listing_settings.invalidate(account.user_uuid)
+
+        policies = await self.account_api.get_all_policies(token)
+        locations = await self.selling_api.get_locations(token)
 
         return AccountSettings(
             dict(
                 fulfillment_policies=get_names(policies["fulfillment_policies"]),
                 payment_policies=get_names(policies["payment_policies"]),
                 return_policies=get_names(policies["return_policies"]),
-                locations=get_names(self.selling_api.get_locations(token)),
+                locations=get_names(locations),
             )
         )
 
-    def _load_images(self, token: str, *images: str):
-        images_urls = []
-        for img in images:
-            img_response = self.commerce_api.upload_image(img, token)
-            images_urls.append(img_response.image_url)
-        return images_urls
-
-    def _get_location_key(self, location_name: str) -> str:
-        locations = self.selling_api.get_locations()
-        for location in locations:
-            if location["name"].lower() == location_name.lower():
-                return location_name
-
-    def _get_policeis_ids(
-        self, ebay_policies: EbayPolicies, token: str
-    ) -> tuple[str, str, str] | None:
-        def find(policies, src_name):
-            for policy in policies:
-                if policy["name"].lower() == src_name.lower():
-                    return policy.id
-
-        policies = self.account_api.get_all_policies(token)
-
-        fulfillment_id = find(
-            policies.fulfillment_policies, ebay_policies.fulfillment_policy
+    async def _load_images(self, token: str, *images: str) -> list[str]:
+        """Upload images concurrently, retrying transient failures of each
+        image separately. Urls are returned in the order of the images."""
+
+        async def upload(img: str) -> str:
+            img_response = await retry(
+                lambda: self.commerce_api.upload_image(img, token),
+                attempts=self.upload_attempts,
+                delay=self.upload_retry_delay,
+                retry_if=lambda e: (
+                    isinstance(e, EbayCommerceClientError) and e.transient
+                ),
+            )
+            return img_response.image_url
+
+        return await map_bounded(upload, images, limit=self.upload_concurrency)
+
+    async def _get_listing_ids(
+        self,
+        marketplace_aspects: EbayAspects,
+        token: str,
+        account: MarketplaceAccount | None,
+    ) -> tuple[str, str, str, str] | None:
+        """Return fulfillment, payment, return policy ids and the location key."""
+        marketplace_id = marketplace_aspects.marketplace
+
+        settings = await self._cached_listing_settings(marketplace_id, account)
+        if settings is not None:
+            listing_ids = self._listing_ids(settings, marketplace_aspects)
+            if listing_ids is not None:
+                return listing_ids
+
+        # Not cached yet, or the seller added the policy or location since.
+        settings = await self._fetch_listing_settings(
+            marketplace_id, token, account, marketplace_aspects.location
+        )
+        return self._listing_ids(settings, marketplace_aspects)
+
+    async def _batch_listing_settings(
+        self,
+        marketplace_id: str,
+        marketplace_aspects: list[EbayAspects],
+        token: str,
+        account: MarketplaceAccount | None,
+    ) -> ListingSettings:
+        """Listing settings that resolve policies and locations of all the
+        items of a batch in one marketplace, if the seller has them."""
+        settings = await self._cached_listing_settings(marketplace_id, account)
+        if settings is not None and all(
+            self._listing_ids(settings, aspects) is not None
+            for aspects in marketplace_aspects
+        ):
+            return settings
+
+        return await self._fetch_listing_settings(marketplace_id, token, account)
+
+    async def _cached_listing_settings(
+        self, marketplace_id: str, account: MarketplaceAccount | None
+    ) -> ListingSettings | None:
+        if account is None or self.listing_settings is None:
+            return None
+        return await self.listing_settings.get(account.user_uuid, marketplace_id)
+
+    async def _fetch_listing_settings(
+        self,
+        marketplace_id: str,
+        token: str,
+        account: MarketplaceAccount | None,
+        location_name: str | None = None,
+    ) -> ListingSettings:
+        """Load listing settings from eBay and cache them.
+
+        Without a cache only the location named ``location_name`` is looked
+        up when it is given.
+        """
+        use_cache = account is not None and self.listing_settings is not None
+
+        policies, locations = await gather_or_cancel(
+            self.account_api.get_all_policies(token, [marketplace_id]),
+            self._find_location(location_name, token)
+            if location_name is not None and not use_cache
+            else self.selling_api.get_locations(token),
         )
-        payment_id = find(policies.payment_policies, ebay_policies.payment_policy)
-        return_id = find(policies.return_policies, ebay_policies.return_policy)
+        settings = ListingSettings.build(policies, locations)
+        if use_cache:
+            await self.listing_settings.set(account.user_uuid, marketplace_id, settings)
+
+        return settings
 
-        if not (fulfillment_id and payment_id and return_id):
+    async def _find_location(self, location_name: str, token: str) -> list[Location]:
+        """Read locations until the one named ``location_name`` is found."""
+        name = location_name.casefold()
+        async with aclosing(self.selling_api.iter_locations(token)) as locations:
+            async for location in locations:
+                if location["name"].casefold() == name:
+                    return [location]
+        return []
+
+    @staticmethod
+    def _listing_ids(
+        settings: ListingSettings, marketplace_aspects: EbayAspects
+    ) -> tuple[str, str, str, str] | None:
+        policy_ids = settings.policy_ids(marketplace_aspects.policies)
+        location_key = settings.location_key(marketplace_aspects.location)
+        if policy_ids is None or location_key is None:
             return None
 
-        return fulfillment_id, payment_id, return_id
+        return *policy_ids, location_key
 
     def _create_offer(
         self,
@@ -281,38 +591,18 @@ class EbayAPI:
         except ValidationError as e:
             raise MarketplaceAPIError() from e
 
-    def _search_category(
+    async def _search_category(
         self, category_name: str, marketplace_id: str
-    ) -> tuple[str, str, str] | None:
-        tree_id = self.taxonomy_api.get_default_tree_id(marketplace_id)
-        tree = self.taxonomy_api.fetch_category_tree(tree_id)
-        res = self._search_in_tree(tree, category_name)
-        if res is None:
-            return None
-
-        category_id, category_name = res
-        return tree_id, category_id, category_name
-
-    @staticmethod
-    def _search_in_tree(
-        tree: ebay_models.CategoryTree, target: str
-    ) -> tuple[str, str] | None:
-        """Recursively search the node and its children for categoryName matches
-        and returns categoryId and categoryName."""
-
-        def search(node) -> tuple[str, str] | None:
-            if node.leaf_category_tree_node:
-                category = node.category
-                name = category.category_name
-
-                if name and target.lower() == name.lower():
-                    return category.category_id, name
-
-            for child in node.child_category_tree_nodes:
-                res = search(child)
-                if res:
-                    return res
+    ) -> tuple[CategoryTreeIndex, CategoryRecord] | None:
+        tree_id = await self.tree_ids.get(
+            marketplace_id, self.taxonomy_api.get_default_tree_id
+        )
+        index = await self.category_trees.get(
+            tree_id, self.taxonomy_api.fetch_category_table
+        )
 
+        record = await self.category_search.resolve(index, category_name)
+        if record is None:
             return None
 
-        return search(tree.root_category_node)
+        return index, record
@@ -1,9 +1,8 @@
 from dataclasses import asdict, dataclass
 from typing import Self
 
-from pydantic import TypeAdapter
-
 from .metadata import EbayPackage
+from .type_adapters import type_adapter
 
 
 @dataclass
@@ -24,7 +23,7 @@ class EbayAspects:
 
     @classmethod
     def validate(cls, data: dict[str]) -> Self | None:
-        return TypeAdapter(cls).validate_python(data)
+        return type_adapter(cls).validate_python(data)
 
     def asdict(self) -> dict[str]:
         return asdict(self)
@@ -1,7 +1,7 @@
 from dataclasses import asdict, dataclass
 from typing import Self
 
-from pydantic import TypeAdapter
+from .type_adapters import type_adapter
 
 
 @dataclass
@@ -31,7 +31,7 @@ class EbayMetadata:
 
     @classmethod
     def validate(cls, data: dict[str]) -> Self | None:
-        return TypeAdapter(cls).validate_python(data)
+        return type_adapter(cls).validate_python(data)
 
     def asdict(self) -> dict[str]:
         return asdict(self)
@@ -1,7 +1,9 @@
-from collections.abc import Generator
+from collections.abc import AsyncIterable, Generator, Iterable
 from dataclasses import asdict, dataclass
+from datetime import timedelta
 from typing import Annotated
 
+import aiohttp
 from dishka import (
     FromComponent,
     Provider,
@@ -9,7 +11,8 @@ from dishka import (
     from_context,
     provide,
 )
-from perplexity import Perplexity as PerplexityClient
+from perplexity import AsyncPerplexity
+from redis.asyncio import Redis
 
 from app.data import Marketplace, OAuth2Settings
 from app.domain.entities import IMarketplaceAspects, IMetadata
@@ -17,14 +20,27 @@ from app.services import ports
 
 from .access_token_storage import RedisAccessTokenStorage
 from .api_clients import ebay as ebay_api
-from .category_predictor import EbayCategoryPredictor
+from .api_clients.session import create_session
+from .barcode_decoder import BarcodeDecoder
+from .category_predictor import EbayCategoryPredictor, LocalCategoryPredictor
 from .factory import InfraFactory
 from .jwt_auth import JWTAuth
+from .listing_settings import ListingSettingsCache
 from .marketplace_api import EbayAPI
 from .marketplace_aspects import EbayAspects
 from .metadata import EbayMetadata
 from .oauth import EbayOAuth
+from .publish_jobs import CeleryPublishJobQueue, PublishImageStorage
 from .search import SearchEngine
+from .search_cache import ProductSearchCache
+from .taxonomy import (
+    BulkAspectsStore,
+    CategorySearchCache,
+    CategoryTreeRefresher,
+    CategoryTreeStore,
+    DefaultTreeIdCache,
+    ItemAspectsCache,
+)
 
 
 @dataclass
@@ -38,12 +54,30 @@ class JWTAuthSettings:
 class SearchEngineSettings:
     perplexity_model: str
     barcode_search_token: str
+    cache_ttl: timedelta | None = None
+    request_timeout: float = 60
+    batch_size: int = 10
+    batch_attempts: int = 2
+
+
+@dataclass
+class BarcodeDecoderSettings:
+    workers: int | None = None
+    queue_size: int = 16
+    stats_log_interval: float = 60
+
+
+@dataclass
+class PublishJobsSettings:
+    images_dir: str
 
 
 class InfrastructureProvider(Provider):
     jwt_settings = from_context(JWTAuthSettings, scope=Scope.APP)
+    publish_jobs_settings = from_context(PublishJobsSettings, scope=Scope.APP)
 
     perplexity_settings = from_context(SearchEngineSettings, scope=Scope.APP)
+    barcode_decoder_settings = from_context(BarcodeDecoderSettings, scope=Scope.APP)
     access_tokens_storage = provide(
         RedisAccessTokenStorage, provides=ports.IAccessTokenStorage, scope=Scope.REQUEST
     )
@@ -52,11 +86,56 @@ class InfrastructureProvider(Provider):
     def jwt_auth(self, jwt_settings: JWTAuthSettings) -> ports.IJWTAuth:
         return JWTAuth(**asdict(jwt_settings))
 
+    @provide(scope=Scope.APP)
+    def product_search_cache(
+        self, settings: SearchEngineSettings, redis: Redis
+    ) -> ProductSearchCache | None:
+        if not settings.cache_ttl:
+            return None
+        return ProductSearchCache(redis=redis, ttl=settings.cache_ttl)
+
+    @provide(scope=Scope.APP)
+    def barcode_decoder(
+        self, settings: BarcodeDecoderSettings
+    ) -> Iterable[BarcodeDecoder]:
+        decoder = BarcodeDecoder(
+            workers=settings.workers,
+            queue_size=settings.queue_size,
+            stats_log_interval=settings.stats_log_interval,
+        )
+        yield decoder
+        decoder.close()
+
     @provide(scope=Scope.REQUEST)
     def search(
-        self, settings: SearchEngineSettings, client: PerplexityClient
+        self,
+        settings: SearchEngineSettings,
+        client: AsyncPerplexity,
+        cache: ProductSearchCache | None,
+        barcode_decoder: BarcodeDecoder,
+        http_session: Annotated[aiohttp.ClientSession, FromComponent("ebay")],
     ) -> ports.ISearchEngine:
-        return SearchEngine(client, **asdict(settings))
+        return SearchEngine(
+            client=client,
+            model=settings.perplexity_model,
+            barcode_search_token=settings.barcode_search_token,
+            cache=cache,
+            request_timeout=settings.request_timeout,
+            batch_size=settings.batch_size,
+            batch_attempts=settings.batch_attempts,
+            barcode_decoder=barcode_decoder,
+            http_session=http_session,
+        )
+
+    @provide(scope=Scope.APP)
+    def publish_image_storage(
+        self, settings: PublishJobsSettings
+    ) -> ports.IPublishImageStorage:
+        return PublishImageStorage(settings.images_dir)
+
+    publish_job_queue = provide(
+        CeleryPublishJobQueue, provides=ports.IPublishJobQueue, scope=Scope.APP
+    )
 
 
 OAuthStateAuthSettings = JWTAuthSettings
@@ -78,11 +157,46 @@ class EbayClientSettings:
     oauth_settings: OAuth2Settings
 
 
+@dataclass
+class EbayHTTPSettings:
+    limit: int = 100
+    limit_per_host: int = 10
+    connect_timeout: float = 5
+    read_timeout: float = 30
+
+
+@dataclass
+class EbayPublishSettings:
+    upload_concurrency: int = 4
+    upload_attempts: int = 3
+    upload_retry_delay: float = 0.5
+    batch_concurrency: int = 4
+    listing_settings_ttl: timedelta = timedelta(minutes=10)
+
+
+@dataclass
+class EbayTaxonomySettings:
+    cache_dir: str
+    refresh_interval: timedelta
+    tree_id_ttl: timedelta
+    aspects_ttl: timedelta
+    aspects_cache_size: int
+    marketplaces: list[str] | None = None
+    redis_shared: bool = True
+    bulk_aspects: bool = False
+    category_min_score: float = 0.8
+    local_prediction: bool = False
+    prediction_fallback: bool = True
+    prediction_min_score: float = 0.3
+    prediction_limit: int = 10
+
+
 @dataclass
 class EbayClients:
     selling_api: ebay_api.EbaySellingClient
     taxonomy_api: ebay_api.EbayTaxonomyClient
     commerce_api: ebay_api.EbayCommerceClient
+    account_api: ebay_api.EbayAccountClient
     user_client: ebay_api.EbayUserClient
 
 
@@ -92,24 +206,166 @@ SKUGenerator = Generator[str, None, None]
 class EbayInfrastructureProvider(Provider):
     component = "ebay"
 
-    @provide(scope=Scope.REQUEST)
-    def ebay_clients(self, settings: EbayClientSettings) -> EbayClients:
+    @provide(scope=Scope.APP)
+    def category_tree_store(self, settings: EbayTaxonomySettings) -> CategoryTreeStore:
+        return CategoryTreeStore(cache_dir=settings.cache_dir)
+
+    @provide(scope=Scope.APP)
+    def default_tree_id_cache(
+        self,
+        settings: EbayTaxonomySettings,
+        redis: Annotated[Redis, FromComponent("")],
+    ) -> DefaultTreeIdCache:
+        return DefaultTreeIdCache(
+            ttl=settings.tree_id_ttl,
+            redis=redis if settings.redis_shared else None,
+        )
+
+    @provide(scope=Scope.APP)
+    def category_search_cache(
+        self, settings: EbayTaxonomySettings
+    ) -> CategorySearchCache:
+        return CategorySearchCache(min_score=settings.category_min_score)
+
+    @provide(scope=Scope.APP)
+    def bulk_aspects_store(
+        self, settings: EbayTaxonomySettings
+    ) -> BulkAspectsStore | None:
+        if not settings.bulk_aspects:
+            return None
+        return BulkAspectsStore(cache_dir=settings.cache_dir)
+
+    @provide(scope=Scope.APP)
+    def item_aspects_cache(
+        self,
+        settings: EbayTaxonomySettings,
+        redis: Annotated[Redis, FromComponent("")],
+        bulk: BulkAspectsStore | None,
+    ) -> ItemAspectsCache:
+        return ItemAspectsCache(
+            ttl=settings.aspects_ttl,
+            maxsize=settings.aspects_cache_size,
+            redis=redis if settings.redis_shared else None,
+            bulk=bulk,
+        )
+
+    @provide(scope=Scope.APP)
+    def listing_settings_cache(
+        self,
+        settings: EbayPublishSettings,
+        redis: Annotated[Redis, FromComponent("")],
+    ) -> ListingSettingsCache:
+        return ListingSettingsCache(redis=redis, ttl=settings.listing_settings_ttl)
+
+    @provide(scope=Scope.APP)
+    def category_tree_refresher(
+        self,
+        clients: EbayClients,
+        settings: EbayTaxonomySettings,
+        store: CategoryTreeStore,
+        tree_ids: DefaultTreeIdCache,
+        bulk: BulkAspectsStore | None,
+    ) -> CategoryTreeRefresher:
+        marketplaces = list(ebay_api.models.MarketplaceIdEnum)
+        if settings.marketplaces:
+            marketplaces = [
+                ebay_api.models.MarketplaceIdEnum(m) for m in settings.marketplaces
+            ]
+
+        return CategoryTreeRefresher(
+            store=store,
+            tree_ids=tree_ids,
+            taxonomy_api=clients.taxonomy_api,
+            interval=settings.refresh_interval,
+            marketplaces=marketplaces,
+            bulk_aspects=bulk,
+        )
+
+    @provide(scope=Scope.APP)
+    async def http_session(
+        self, settings: EbayHTTPSettings
+    ) -> AsyncIterable[aiohttp.ClientSession]:
+        session = create_session(
+            limit=settings.limit,
+            limit_per_host=settings.limit_per_host,
+            connect_timeout=settings.connect_timeout,
+            read_timeout=settings.read_timeout,
+        )
+        yield session
+        await session.close()
+
+    @provide(scope=Scope.APP)
+    def ebay_clients(
+        self, settings: EbayClientSettings, session: aiohttp.ClientSession
+    ) -> EbayClients:
+        client_args = (settings.domain, settings.oauth_settings, session)
         return EbayClients(
-            ebay_api.EbayTaxonomyClient(settings.domain, settings.oauth_settings),
-            ebay_api.EbaySellingClient(settings.domain, settings.oauth_settings),
-            ebay_api.EbayCommerceClient(settings.domain, settings.oauth_settings),
-            ebay_api.EbayUserClient(settings.domain, settings.oauth_settings),
+            selling_api=ebay_api.EbaySellingClient(*client_args),
+            taxonomy_api=ebay_api.EbayTaxonomyClient(*client_args),
+            commerce_api=ebay_api.EbayCommerceClient(*client_args),
+            account_api=ebay_api.EbayAccountClient(*client_args),
+            user_client=ebay_api.EbayUserClient(*client_args),
         )
 
     @provide(scope=Scope.REQUEST)
-    def merketplace_api(self, clients: EbayClients, sku_gen: SKUGenerator) -> EbayAPI:
+    def merketplace_api(
+        self,
+        clients: EbayClients,
+        sku_gen: SKUGenerator,
+        category_trees: CategoryTreeStore,
+        tree_ids: DefaultTreeIdCache,
+        item_aspects: ItemAspectsCache,
+        category_search: CategorySearchCache,
+        publish_settings: EbayPublishSettings,
+        listing_settings: ListingSettingsCache,
+    ) -> EbayAPI:
         return EbayAPI(
-            clients.taxonomy_api, clients.commerce_api, clients.selling_api, sku_gen
+            selling_api=clients.selling_api,
+            taxonomy_api=clients.taxonomy_api,
+            commerce_api=clients.commerce_api,
+            account_api=clients.account_api,
+            sku_generator=sku_gen,
+            category_trees=category_trees,
+            tree_ids=tree_ids,
+            item_aspects=item_aspects,
+            category_search=category_search,
+            upload_concurrency=publish_settings.upload_concurrency,
+            upload_attempts=publish_settings.upload_attempts,
+            upload_retry_delay=publish_settings.upload_retry_delay,
+            batch_concurrency=publish_settings.batch_concurrency,
+            listing_settings=listing_settings,
         )
 
     @provide(scope=Scope.REQUEST)
-    def category_predictor(self, clients: EbayClients) -> EbayCategoryPredictor:
-        return EbayCategoryPredictor(taxonomy_api=clients.taxonomy_api)
+    def remote_category_predictor(
+        self, clients: EbayClients, tree_ids: DefaultTreeIdCache
+    ) -> EbayCategoryPredictor:
+        return EbayCategoryPredictor(
+            taxonomy_api=clients.taxonomy_api, tree_ids=tree_ids
+        )
+
+    @provide(scope=Scope.REQUEST)
+    def category_predictor(
+        self,
+        settings: EbayTaxonomySettings,
+        clients: EbayClients,
+        remote_predictor: EbayCategoryPredictor,
+        tree_ids: DefaultTreeIdCache,
+        category_trees: CategoryTreeStore,
+        category_search: CategorySearchCache,
+    ) -> ports.ICategoryPredictor:
+        if not settings.local_prediction:
+            return remote_predictor
+
+        return LocalCategoryPredictor(
+            taxonomy_api=clients.taxonomy_api,
+            tree_ids=tree_ids,
+            category_trees=category_trees,
+            category_search=category_search,
+            limit=settings.prediction_limit,
+            min_score=settings.prediction_min_score,
+            fallback=remote_predictor if settings.prediction_fallback else None,
+        )
 
     @provide(scope=Scope.REQUEST)
     def ebay_oauth(self, clients: EbayClients) -> EbayOAuth:
@@ -125,7 +381,8 @@ class FactoriesProvider(Provider):
 
     @provide(scope=Scope.REQUEST)
     def category_predictors_factory(
-        self, ebay_predictor: Annotated[EbayCategoryPredictor, FromComponent("ebay")]
+        self,
+        ebay_predictor: Annotated[ports.ICategoryPredictor, FromComponent("ebay")],
     ) -> ports.ICategoryPredictorFactory:
         return InfraFactory[ports.ICategoryPredictor](
             {Marketplace.EBAY: ebay_predictor}
@@ -0,0 +1,58 @@
+import asyncio
+import os
+import shutil
+import uuid
+from dataclasses import dataclass
+
+from celery import Celery
+from kombu.exceptions import KombuError
+
+from app.services.ports import PublishImageStorageError, PublishJobQueueError
+
+PUBLISH_JOB_TASK = "tasks.publish.publish_item"
+
+
+@dataclass
+class PublishImageStorage:
+    """Images of publish jobs kept in a directory shared with workers"""
+
+    root: str
+
+    def _job_dir(self, job_uuid: uuid.UUID) -> str:
+        return os.path.join(self.root, str(job_uuid))
+
+    def _save(self, job_uuid: uuid.UUID, *images: str) -> list[str]:
+        job_dir = self._job_dir(job_uuid)
+        os.makedirs(job_dir, exist_ok=True)
+
+        pathes = []
+        for i, image in enumerate(images):
+            # keep the order of images, names of uploads may repeat
+            path = os.path.join(job_dir, f"{i}_{os.path.basename(image)}")
+            shutil.move(image, path)
+            pathes.append(path)
+        return pathes
+
+    async def save(self, job_uuid: uuid.UUID, *images: str) -> list[str]:
+        try:
+            return await asyncio.to_thread(self._save, job_uuid, *images)
+        except OSError as e:
+            raise PublishImageStorageError() from e
+
+    async def delete(self, job_uuid: uuid.UUID):
+        await asyncio.to_thread(
+            shutil.rmtree, self._job_dir(job_uuid), ignore_errors=True
+        )
+
+
+@dataclass
+class CeleryPublishJobQueue:
+    celery: Celery
+
+    async def enqueue(self, job_uuid: uuid.UUID):
+        try:
+            await asyncio.to_thread(
+                self.celery.send_task, PUBLISH_JOB_TASK, args=[str(job_uuid)]
+            )
+        except KombuError as e:
+            raise PublishJobQueueError() from e
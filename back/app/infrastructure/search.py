@@ -1,16 +1,37 @@
+import asyncio
 import json
+from collections.abc import AsyncIterator, Callable, Sequence
+from contextlib import aclosing
 from dataclasses import dataclass
 from typing import Literal
 
-from perplexity import Perplexity as PerplexityClient
-from perplexity import PerplexityError
+import aiohttp
+from perplexity import AsyncPerplexity, PerplexityError
+from pydantic import ValidationError
 
-from app.domain.entities import IMetadata, Product, ProductStructure
-from app.services.ports import SearchEngineError
+from app.domain.entities import (
+    AspectField,
+    AspectValue,
+    IMetadata,
+    Product,
+    ProductStructure,
+)
+from app.logger import logger
+from app.services.ports import (
+    ProductQuery,
+    ProductSearchResult,
+    SearchEngineBusyError,
+    SearchEngineError,
+)
 
 from ..utils import recognition
 from .adapter import ProductAdapter, ProductAdapterError
 from .api_clients import barcode
+from .barcode_decoder import BarcodeDecoder, BarcodeDecoderBusyError
+from .concurrency import chunks, gather_or_cancel
+from .json_stream import JSONStreamParser
+from .search_cache import ProductSearchCache
+from .type_adapters import type_adapter
 
 
 @dataclass
@@ -20,38 +41,351 @@ class SearchEngine:
         "Provide information about {product} without sourses links"
     )
     _COMMENT_TEXT_TEMPLATE = "Comment: {comment}"
+    _BATCH_SEARCH_TEMPLATE = (
+        "Provide information about each of the following products without "
+        "sourses links. Answer with one entry for every product, marked with "
+        "the number of the product:\n{products}"
+    )
+    _BATCH_PRODUCT_TEMPLATE = "{index}. {product}"
+    _BATCH_COMMENT_TEMPLATE = " (comment: {comment})"
 
-    client: PerplexityClient
+    client: AsyncPerplexity
     model: str
     barcode_search_token: str
+    cache: ProductSearchCache | None = None
+    request_timeout: float = 60
+    """Seconds a completion may take, including retries of the client"""
+    batch_size: int = 10
+    batch_attempts: int = 2
+    barcode_decoder: BarcodeDecoder | None = None
+    http_session: aiohttp.ClientSession | None = None
+    """Session for barcode lookups"""
 
-    def by_product_name(
+    async def by_product_name(
         self,
         metadata_type: type[IMetadata],
         product_name: str,
         comment: str,
         product_structure: ProductStructure,
     ) -> Product:
+        adapter = ProductAdapter(metadata_type=metadata_type)
+        try:
+            json_schema = adapter.to_schema(product_structure.fields)
+        except ProductAdapterError as e:
+            raise SearchEngineError() from e
+
+        return await self._lookup(
+            product_name,
+            comment,
+            json_schema,
+            lambda raw: adapter.to_product(raw, product_structure),
+        )
+
+    async def metadata_by_product_name(
+        self,
+        metadata_type: type[IMetadata],
+        product_name: str,
+        comment: str,
+    ) -> IMetadata:
+        """Search the product metadata only, the request doesn't depend on
+        the aspects of the category."""
+        adapter = ProductAdapter(metadata_type=metadata_type)
+        try:
+            json_schema = adapter.to_metadata_schema()
+        except ProductAdapterError as e:
+            raise SearchEngineError() from e
+
+        return await self._lookup(
+            product_name, comment, json_schema, adapter.to_metadata
+        )
+
+    async def aspects_by_product_name(
+        self,
+        product_name: str,
+        comment: str,
+        product_structure: ProductStructure,
+    ) -> list[AspectValue]:
+        """Search values of the product aspects only"""
+        try:
+            json_schema = ProductAdapter.to_aspects_schema(product_structure.fields)
+        except ProductAdapterError as e:
+            raise SearchEngineError() from e
+
+        return await self._lookup(
+            product_name,
+            comment,
+            json_schema,
+            lambda raw: ProductAdapter.to_aspects(raw, product_structure),
+        )
+
+    async def _lookup[R](
+        self,
+        product_name: str,
+        comment: str,
+        json_schema: dict[str],
+        parse: Callable[[dict[str]], R],
+    ) -> R:
+        """Request an answer matching the schema through the cache, equal
+        requests running at the same time share one completion."""
         prompt = self._product_search_prompt(product_name, comment)
 
+        def to_result(content: str) -> R:
+            try:
+                return parse(json.loads(content))
+            except (ProductAdapterError, ValueError) as e:
+                raise SearchEngineError("Failed to parse answer") from e
+
+        async def request() -> str:
+            return await self._perplexity_request(prompt, json_schema, "json_schema")
+
+        if self.cache is None:
+            return to_result(await request())
+
+        key = self.cache.key(product_name, json_schema, comment, self.model)
+
+        async def lookup() -> R:
+            content = await self.cache.get(key)
+            if content is not None:
+                try:
+                    return to_result(content)
+                except SearchEngineError:
+                    pass
+
+            content = await request()
+            result = to_result(content)
+            await self.cache.set(key, content)
+            return result
+
+        return await self.cache.single_flight(key, lookup)
+
+    async def by_product_names(
+        self,
+        metadata_type: type[IMetadata],
+        queries: Sequence[ProductQuery],
+        product_structure: ProductStructure,
+    ) -> list[ProductSearchResult]:
+        """Search products sharing one structure with a request per
+        ``batch_size`` products.
+
+        Results keep the order of the queries. Products missing from an
+        answer or failing validation are requested again, up to
+        ``batch_attempts`` times.
+        """
         adapter = ProductAdapter(metadata_type=metadata_type)
         try:
-            json_schema = adapter.to_schema(product_structure)
+            json_schema = adapter.to_schema(product_structure.fields)
         except ProductAdapterError as e:
             raise SearchEngineError() from e
 
-        content = self._perplexity_request(prompt, json_schema, "json_schema")
+        def to_product(raw: dict[str]) -> Product:
+            try:
+                return adapter.to_product(raw, product_structure)
+            except ProductAdapterError as e:
+                raise SearchEngineError("Failed to parse answer") from e
+
+        results: list[Product | SearchEngineError | None] = [None] * len(queries)
+
+        keys = [None] * len(queries)
+        if self.cache is not None:
+            keys = [
+                self.cache.key(q.product_name, json_schema, q.comment, self.model)
+                for q in queries
+            ]
+            contents = await asyncio.gather(*(self.cache.get(k) for k in keys))
+            for i, content in enumerate(contents):
+                if content is None:
+                    continue
+                try:
+                    results[i] = to_product(json.loads(content))
+                except (SearchEngineError, ValueError):
+                    pass
+
+        batch_schema = self._batch_schema(json_schema)
+
+        async def search(batch: Sequence[int]):
+            try:
+                answers = await self._batch_request(
+                    [queries[i] for i in batch], batch_schema
+                )
+            except SearchEngineError as e:
+                for i in batch:
+                    results[i] = e
+                return
+
+            for n, i in enumerate(batch):
+                raw = answers.get(n)
+                if raw is None:
+                    results[i] = SearchEngineError("Product missing in answer")
+                    continue
+                try:
+                    results[i] = to_product(raw)
+                except SearchEngineError as e:
+                    results[i] = e
+                    continue
+
+                if keys[i] is not None:
+                    await self.cache.set(keys[i], json.dumps(raw))
+
+        for _ in range(self.batch_attempts):
+            pending = [
+                i
+                for i, result in enumerate(results)
+                if result is None or isinstance(result, SearchEngineError)
+            ]
+            if not pending:
+                break
+
+            await gather_or_cancel(
+                *(search(batch) for batch in chunks(pending, self.batch_size))
+            )
+
+        return [
+            ProductSearchResult(error=result)
+            if isinstance(result, SearchEngineError)
+            else ProductSearchResult(product=result)
+            for result in results
+        ]
+
+    async def _batch_request(
+        self, queries: Sequence[ProductQuery], batch_schema: dict[str]
+    ) -> dict[int, dict[str]]:
+        prompt = self._batch_search_prompt(queries)
+        content = await self._perplexity_request(prompt, batch_schema, "json_schema")
         try:
-            return adapter.to_product(product_structure, json.loads(content))
+            entries = json.loads(content)["products"]
+            answers = {entry["index"]: entry["product"] for entry in entries}
+        except (ValueError, KeyError, TypeError) as e:
+            raise SearchEngineError("Failed to parse answer") from e
+
+        return {n: raw for n, raw in answers.items() if isinstance(raw, dict)}
+
+    @staticmethod
+    def _batch_schema(product_schema: dict[str]) -> dict[str]:
+        """Schema of an answer with a list of numbered products.
+
+        Definitions of the product schema are moved to the root, so their
+        references stay valid.
+        """
+        product = {k: v for k, v in product_schema.items() if k != "$defs"}
+        return {
+            "type": "object",
+            "properties": {
+                "products": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "index": {"type": "integer"},
+                            "product": {"$ref": "#/$defs/Product"},
+                        },
+                        "required": ["index", "product"],
+                        "additionalProperties": False,
+                    },
+                }
+            },
+            "required": ["products"],
+            "additionalProperties": False,
+            "$defs": {**product_schema.get("$defs", {}), "Product": product},
+        }
+
+    async def stream_by_product_name(
+        self,
+        metadata_type: type[IMetadata],
+        product_name: str,
+        comment: str,
+        product_structure: ProductStructure,
+    ) -> AsyncIterator[AspectValue | IMetadata]:
+        """Yield aspect values and then metadata of the product as soon as
+        the streamed answer contains them.
+
+        Values that don't match the product structure are skipped, the whole
+        answer is validated when the stream ends.
+        """
+        prompt = self._product_search_prompt(product_name, comment)
+
+        adapter = ProductAdapter(metadata_type=metadata_type)
+        try:
+            json_schema = adapter.to_schema(product_structure.fields)
         except ProductAdapterError as e:
+            raise SearchEngineError() from e
+
+        key = None
+        content = None
+        if self.cache is not None:
+            key = self.cache.key(product_name, json_schema, comment, self.model)
+            content = await self.cache.get(key)
+
+        if content is not None:
+            chunks = _single(content)
+        else:
+            chunks = self._perplexity_stream(prompt, json_schema, "json_schema")
+
+        fields = {field.name: field for field in product_structure.fields}
+        parser = JSONStreamParser(max_depth=2)
+        async with aclosing(chunks):
+            async for chunk in chunks:
+                try:
+                    values = parser.feed(chunk)
+                except ValueError as e:
+                    raise SearchEngineError("Failed to parse answer") from e
+
+                for path, value in values:
+                    part = self._product_part(path, value, fields, metadata_type)
+                    if part is not None:
+                        yield part
+
+        try:
+            adapter.to_product(json.loads(parser.text), product_structure)
+        except (ProductAdapterError, ValueError) as e:
             raise SearchEngineError("Failed to parse answer") from e
 
-    def barecodes_on_image(self, img_path: str) -> str:
-        return recognition.extract_barcodes(img_path)
+        if key is not None and content is None:
+            await self.cache.set(key, parser.text)
+
+    @staticmethod
+    def _product_part(
+        path: tuple,
+        value,
+        fields: dict[str, AspectField],
+        metadata_type: type[IMetadata],
+    ) -> AspectValue | IMetadata | None:
+        match path:
+            case (ProductAdapter._ASPECTS_FIELD_NAME, str(name)):
+                field = fields.get(name)
+                if field is None or not field.is_value_valid(value):
+                    logger.debug(f"Skipped invalid aspect {name!r} in answer")
+                    return None
+                return AspectValue(
+                    name=name, value=value, is_required=field.is_required
+                )
+
+            case (ProductAdapter._METADATA_FIELD_NAME,):
+                try:
+                    return type_adapter(metadata_type).validate_python(value)
+                except ValidationError:
+                    logger.debug("Skipped invalid metadata in answer")
+                    return None
 
-    def by_barecode(self, barecode):
+        return None
+
+    async def barecodes_on_image(self, img_path: str) -> list[str]:
         try:
-            return barcode.search(barecode, self.barcode_search_token)
+            if self.barcode_decoder is None:
+                return await asyncio.to_thread(recognition.extract_barcodes, img_path)
+            return await self.barcode_decoder.decode(img_path)
+        except BarcodeDecoderBusyError as e:
+            raise SearchEngineBusyError("Too many images to decode") from e
+        except Exception as e:
+            raise SearchEngineError("Failed to decode barcodes") from e
+
+    async def product_name_by_barecode(self, barecode: str) -> str:
+        if self.http_session is None:
+            raise SearchEngineError("Barcode search is not configured")
+
+        try:
+            return await barcode.search(
+                self.http_session, barecode, self.barcode_search_token
+            )
         except barcode.BarcodeSearchError as e:
             raise SearchEngineError("Failed to find product") from e
 
@@ -66,6 +400,19 @@ class SearchEngine:
 
         return template.format_map(mapping)
 
+    @classmethod
+    def _batch_search_prompt(cls, queries: Sequence[ProductQuery]) -> str:
+        products = []
+        for n, query in enumerate(queries):
+            product = cls._BATCH_PRODUCT_TEMPLATE.format(
+                index=n, product=query.product_name
+            )
+            if query.comment:
+                product += cls._BATCH_COMMENT_TEMPLATE.format(comment=query.comment)
+            products.append(product)
+
+        return cls._BATCH_SEARCH_TEMPLATE.format(products="\n".join(products))
+
     @classmethod
     def _convert(cls, text: str) -> list[dict[str, str]]:
         """Convert text into OpenAI chat messages format."""
@@ -82,12 +429,71 @@ class SearchEngine:
             )
         return messages
 
-    def _perplexity_request(
+    async def _perplexity_request(
         self,
         text: str,
         response_format: dict | str | None = None,
         response_type: Literal["json_schema", "regex"] | None = None,
     ) -> str:
+        request = self._completion_request(text, response_format, response_type)
+        try:
+            async with asyncio.timeout(self.request_timeout):
+                response = await self.client.chat.completions.create(**request)
+        except TimeoutError as e:
+            raise SearchEngineError("Perplexity request timed out") from e
+        except PerplexityError as e:
+            raise SearchEngineError() from e
+
+        if response.choices is None or len(response.choices) != 1:
+            raise SearchEngineError(f"Invalid perplexity response: {response}")
+
+        content = response.choices[0].message.content
+        if not isinstance(content, str):
+            raise SearchEngineError("Invalid content type in perplexity answer")
+
+        return content
+
+    async def _perplexity_stream(
+        self,
+        text: str,
+        response_format: dict | str | None = None,
+        response_type: Literal["json_schema", "regex"] | None = None,
+    ) -> AsyncIterator[str]:
+        """Content chunks of a streamed completion"""
+        request = self._completion_request(text, response_format, response_type)
+        deadline = asyncio.get_running_loop().time() + self.request_timeout
+        try:
+            async with asyncio.timeout_at(deadline):
+                stream = await self.client.chat.completions.create(
+                    **request, stream=True
+                )
+
+            async with stream:
+                chunks = aiter(stream)
+                while True:
+                    # the deadline must not cover the consumer of the chunks
+                    async with asyncio.timeout_at(deadline):
+                        chunk = await anext(chunks, None)
+                    if chunk is None:
+                        break
+
+                    if not chunk.choices:
+                        continue
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        yield content
+
+        except TimeoutError as e:
+            raise SearchEngineError("Perplexity request timed out") from e
+        except PerplexityError as e:
+            raise SearchEngineError() from e
+
+    def _completion_request(
+        self,
+        text: str,
+        response_format: dict | str | None = None,
+        response_type: Literal["json_schema", "regex"] | None = None,
+    ) -> dict[str]:
         messages = self._convert(text)
 
         response_format_content = None
@@ -103,20 +509,12 @@ class SearchEngine:
                 "Both response_format and response_type must be provided together"
             )
 
-        try:
-            response = self._client.chat.completions.create(
-                model=self._model,
-                messages=messages,
-                response_format=response_format_content,
-            )
-        except PerplexityError as e:
-            raise SearchEngineError() from e
+        return {
+            "model": self.model,
+            "messages": messages,
+            "response_format": response_format_content,
+        }
 
-        if response.choices is None or len(response.choices) != 1:
-            raise SearchEngineError(f"Invalid perplexity response: {response}")
 
-        content = response.choices[0].message.content
-        if not isinstance(content, str):
-            raise SearchEngineError("Invalid content type in perplexity answer")
-
-        return content
+async def _single(content: str) -> AsyncIterator[str]:
+    yield content
@@ -0,0 +1,65 @@
+import hashlib
+import json
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from redis import RedisError
+from redis.asyncio import Redis
+
+from app.logger import logger
+
+from .concurrency import SingleFlight
+
+
+@dataclass
+class ProductSearchCache:
+    """Answers of product lookups shared between workers through Redis.
+
+    Keys address the request content: product name, JSON schema of the
+    answer, comment and model. Concurrent lookups of the same key in one
+    process share a single upstream call.
+    """
+
+    redis: Redis
+    ttl: timedelta
+    _inflight: SingleFlight[str, object] = field(
+        default_factory=SingleFlight, init=False, repr=False
+    )
+
+    @staticmethod
+    def key(product_name: str, schema: dict[str], comment: str, model: str) -> str:
+        schema_hash = hashlib.sha256(
+            json.dumps(schema, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        content = json.dumps(
+            [
+                " ".join(product_name.split()).casefold(),
+                schema_hash,
+                comment.strip(),
+                model,
+            ]
+        )
+        digest = hashlib.sha256(content.encode()).hexdigest()
+        return f"perplexity:product:{digest}"
+
+    async def get(self, key: str) -> str | None:
+        try:
+            value = await self.redis.get(key)
+        except RedisError as e:
+            logger.warning(f"Failed to read product search from redis: {e}")
+            return None
+
+        if isinstance(value, bytes):
+            return value.decode()
+        return value
+
+    async def set(self, key: str, value: str):
+        try:
+            await self.redis.set(key, value, ex=self.ttl)
+        except RedisError as e:
+            logger.warning(f"Failed to store product search in redis: {e}")
+
+    async def single_flight[R](self, key: str, func: Callable[[], Awaitable[R]]) -> R:
+        """Run ``func`` once for concurrent callers of ``key``"""
+        return await self._inflight.do(key, func)
@@ -0,0 +1,7 @@
+from .aspects import CategoryAspects, ItemAspectsCache
+from .bulk_aspects import BulkAspectsIndex, BulkAspectsStore
+from .refresher import CategoryTreeRefresher
+from .search import CategoryMatch, CategorySearchCache, CategorySearchIndex
+from .store import CategoryTreeStore
+from .tree_ids import DefaultTreeIdCache
+from .tree_index import CategoryRecord, CategoryTreeIndex
@@ -0,0 +1,120 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from pydantic import ValidationError
+from redis import RedisError
+from redis.asyncio import Redis
+
+from app.domain.entities import AspectField
+from app.logger import logger
+
+from ..api_clients.ebay.models import AspectMetadata
+from ..cache import CacheStats, TTLCache
+from .bulk_aspects import BulkAspectsStore
+
+
+@dataclass(frozen=True)
+class CategoryAspects:
+    metadata: AspectMetadata
+    fields: list[AspectField]
+
+
+@dataclass
+class ItemAspectsCache:
+    """Item aspects of categories keyed by tree id, tree version and category id.
+
+    A new tree version changes the key, so aspects of updated trees are
+    requested again without explicit invalidation. When ``bulk`` holds an
+    index of the tree version, it is used before redis and the eBay API.
+    """
+
+    ttl: timedelta
+    maxsize: int
+    redis: Redis | None = None
+    bulk: BulkAspectsStore | None = None
+    _local: TTLCache[tuple[str, str, str], CategoryAspects] = field(
+        init=False, repr=False
+    )
+
+    def __post_init__(self):
+        self._local = TTLCache(maxsize=self.maxsize)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._local.stats
+
+    @staticmethod
+    def _to_key(tree_id: str, version: str, category_id: str) -> str:
+        return f"ebay:item_aspects:{tree_id}:{version}:{category_id}"
+
+    async def get(
+        self,
+        tree_id: str,
+        version: str,
+        category_id: str,
+        fetch: Callable[[], Awaitable[AspectMetadata]],
+        convert: Callable[[AspectMetadata], list[AspectField]],
+    ) -> CategoryAspects:
+        key = (tree_id, version, category_id)
+        aspects = self._local.get(key)
+        if aspects is not None:
+            return aspects
+
+        metadata = await self._bulk_get(*key)
+        if metadata is None:
+            metadata = await self._shared_get(*key)
+        if metadata is None:
+            metadata = await fetch()
+            await self._shared_set(*key, metadata)
+
+        aspects = CategoryAspects(metadata=metadata, fields=convert(metadata))
+        self._local.set(key, aspects)
+        return aspects
+
+    async def _bulk_get(
+        self, tree_id: str, version: str, category_id: str
+    ) -> AspectMetadata | None:
+        if self.bulk is None:
+            return None
+        return await asyncio.to_thread(
+            self._read_bulk, self.bulk, tree_id, version, category_id
+        )
+
+    @staticmethod
+    def _read_bulk(
+        bulk: BulkAspectsStore, tree_id: str, version: str, category_id: str
+    ) -> AspectMetadata | None:
+        index = bulk.get(tree_id, version)
+        if index is None:
+            return None
+        return index.get(category_id)
+
+    async def _shared_get(
+        self, tree_id: str, version: str, category_id: str
+    ) -> AspectMetadata | None:
+        if self.redis is None:
+            return None
+        try:
+            value = await self.redis.get(self._to_key(tree_id, version, category_id))
+            if value is None:
+                return None
+            return AspectMetadata.model_validate_json(value)
+        except (RedisError, ValidationError) as e:
+            logger.warning(f"Failed to read item aspects from redis: {e}")
+            return None
+
+    async def _shared_set(
+        self, tree_id: str, version: str, category_id: str, metadata: AspectMetadata
+    ):
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(
+                self._to_key(tree_id, version, category_id),
+                metadata.model_dump_json(by_alias=True),
+                ex=self.ttl,
+            )
+        except RedisError as e:
+            logger.warning(f"Failed to store item aspects in redis: {e}")
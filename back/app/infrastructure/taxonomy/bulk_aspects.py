@@ -0,0 +1,190 @@
+import asyncio
+import gzip
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import zlib
+from dataclasses import dataclass, field
+from typing import IO, Self
+
+from pydantic import ValidationError
+
+from app.logger import logger
+
+from ..api_clients.ebay import EbayTaxonomyClient
+from ..api_clients.ebay.models import AspectMetadata
+from ..api_clients.ebay.streaming import iter_json_array
+
+
+@dataclass
+class BulkAspectsIndex:
+    """Read-only SQLite index of all category aspects of one tree version."""
+
+    path: str
+    _connection: sqlite3.Connection = field(init=False, repr=False)
+    _lock: threading.Lock = field(
+        init=False, repr=False, default_factory=threading.Lock
+    )
+
+    def __post_init__(self):
+        self._connection = sqlite3.connect(
+            f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+        )
+
+    def get(self, category_id: str) -> AspectMetadata | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT aspects FROM item_aspects WHERE category_id = ?",
+                (category_id,),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        aspects = json.loads(zlib.decompress(row[0]))
+        try:
+            return AspectMetadata.model_validate({"aspects": aspects})
+        except ValidationError as e:
+            logger.warning(f"Invalid bulk aspects of category {category_id}: {e}")
+            return None
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    @classmethod
+    def build(cls, path: str, fp: IO[bytes], batch_size: int = 500) -> Self:
+        """Build the index from the gzip file returned by fetch_item_aspects."""
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path), prefix=os.path.basename(path), suffix=".tmp"
+        )
+        os.close(fd)
+
+        connection = sqlite3.connect(tmp_path)
+        try:
+            connection.execute(
+                "CREATE TABLE item_aspects "
+                "(category_id TEXT PRIMARY KEY, aspects BLOB NOT NULL)"
+            )
+
+            with gzip.open(fp, "rt", encoding="utf-8") as f:
+                batch = []
+                for item in iter_json_array(f, "categoryAspects"):
+                    aspects = json.dumps(item.get("aspects", []), separators=(",", ":"))
+                    batch.append(
+                        (
+                            item["category"]["categoryId"],
+                            zlib.compress(aspects.encode()),
+                        )
+                    )
+                    if len(batch) >= batch_size:
+                        connection.executemany(
+                            "INSERT OR REPLACE INTO item_aspects VALUES (?, ?)", batch
+                        )
+                        batch.clear()
+
+                connection.executemany(
+                    "INSERT OR REPLACE INTO item_aspects VALUES (?, ?)", batch
+                )
+            connection.commit()
+            connection.close()
+            os.replace(tmp_path, path)
+        except BaseException:
+            connection.close()
+            _remove(tmp_path)
+            raise
+
+        return cls(path)
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+@dataclass
+class BulkAspectsStore:
+    """Bulk aspect indexes of category trees, kept in ``cache_dir``.
+
+    Methods other than ``load`` do blocking disk and SQLite IO and are
+    called in worker threads.
+    """
+
+    cache_dir: str
+    _indexes: dict[tuple[str, str], BulkAspectsIndex] = field(
+        init=False, repr=False, default_factory=dict
+    )
+    _lock: threading.Lock = field(
+        init=False, repr=False, default_factory=threading.Lock
+    )
+
+    def _path(self, tree_id: str, version: str) -> str:
+        return os.path.join(self.cache_dir, f"item_aspects_{tree_id}_{version}.sqlite")
+
+    @staticmethod
+    def _build(path: str, archive_path: str) -> BulkAspectsIndex:
+        with open(archive_path, "rb") as archive:
+            return BulkAspectsIndex.build(path, archive)
+
+    def _create_archive(self, tree_id: str) -> tuple[str, IO[bytes]]:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(
+            dir=self.cache_dir, prefix=f"item_aspects_{tree_id}_", suffix=".tmp"
+        )
+        return path, os.fdopen(fd, "wb")
+
+    def _replace(self, tree_id: str, version: str, index: BulkAspectsIndex):
+        with self._lock:
+            for key in [k for k in self._indexes if k[0] == tree_id]:
+                self._indexes.pop(key).close()
+            self._indexes[(tree_id, version)] = index
+
+        # temporary files may belong to a load running in another process
+        prefix = f"item_aspects_{tree_id}_"
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if (
+                name.startswith(prefix)
+                and not name.endswith(".tmp")
+                and path != index.path
+            ):
+                _remove(path)
+
+    def get(self, tree_id: str, version: str) -> BulkAspectsIndex | None:
+        key = (tree_id, version)
+        index = self._indexes.get(key)
+        if index is not None:
+            return index
+
+        path = self._path(tree_id, version)
+        if not os.path.exists(path):
+            return None
+
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                index = BulkAspectsIndex(path)
+                self._indexes[key] = index
+            return index
+
+    async def load(self, tree_id: str, version: str, taxonomy_api: EbayTaxonomyClient):
+        """Download the bulk aspects file and replace indexes of other versions."""
+        archive_path, archive = await asyncio.to_thread(self._create_archive, tree_id)
+        try:
+            try:
+                await taxonomy_api.fetch_item_aspects(tree_id, archive)
+            finally:
+                await asyncio.to_thread(archive.close)
+
+            index = await asyncio.to_thread(
+                self._build, self._path(tree_id, version), archive_path
+            )
+        finally:
+            await asyncio.to_thread(_remove, archive_path)
+
+        await asyncio.to_thread(self._replace, tree_id, version, index)
+        logger.info(f"Bulk item aspects of tree {tree_id} loaded, version {version}")
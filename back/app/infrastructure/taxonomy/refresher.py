@@ -0,0 +1,87 @@
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from app.logger import logger
+
+from ..api_clients.ebay import EbayTaxonomyClient, EbayTaxonomyClientError
+from ..api_clients.ebay.models import MarketplaceIdEnum
+from .bulk_aspects import BulkAspectsStore
+from .store import CategoryTreeStore
+from .tree_ids import DefaultTreeIdCache
+from .tree_index import CategoryTreeIndex
+
+
+@dataclass
+class CategoryTreeRefresher:
+    """Periodically reloads default category trees whose version changed.
+
+    With ``bulk_aspects`` set, aspects of all categories of each tree version
+    are downloaded as well.
+    """
+
+    store: CategoryTreeStore
+    tree_ids: DefaultTreeIdCache
+    taxonomy_api: EbayTaxonomyClient
+    interval: timedelta
+    marketplaces: Iterable[MarketplaceIdEnum] = tuple(MarketplaceIdEnum)
+    bulk_aspects: BulkAspectsStore | None = None
+    _scheduler: AsyncIOScheduler = field(
+        init=False, repr=False, default_factory=AsyncIOScheduler
+    )
+
+    def start(self):
+        """Schedule refreshes on the running event loop."""
+        self._scheduler.add_job(
+            self.refresh,
+            "interval",
+            seconds=self.interval.total_seconds(),
+            next_run_time=datetime.now(),
+            max_instances=1,
+            coalesce=True,
+        )
+        self._scheduler.start()
+
+    def shutdown(self):
+        if self._scheduler.running:
+            self._scheduler.shutdown(wait=False)
+
+    async def refresh(self):
+        trees = await self.tree_ids.warm(self.taxonomy_api, self.marketplaces)
+
+        checked = set()
+        for marketplace_id, tree in trees.items():
+            if tree.category_tree_id in checked:
+                continue
+            checked.add(tree.category_tree_id)
+
+            try:
+                await self._refresh_tree(
+                    tree.category_tree_id, tree.category_tree_version
+                )
+            except EbayTaxonomyClientError as e:
+                logger.warning(
+                    f"Failed to refresh {marketplace_id} category tree: {e}",
+                    exc_info=True,
+                )
+            except Exception:
+                # e.g. the bulk aspects file failed to build, other trees
+                # are still refreshed
+                logger.exception(f"Failed to refresh {marketplace_id} category tree")
+
+    async def _refresh_tree(self, tree_id: str, version: str):
+        current = await self.store.cached(tree_id)
+        if current is None or current.version != version:
+            table = await self.taxonomy_api.fetch_category_table(tree_id)
+            index = await asyncio.to_thread(CategoryTreeIndex.from_table, table)
+            await self.store.put(index)
+
+            logger.info(f"Category tree {tree_id} updated to version {version}")
+
+        if self.bulk_aspects is not None and (
+            await asyncio.to_thread(self.bulk_aspects.get, tree_id, version) is None
+        ):
+            await self.bulk_aspects.load(tree_id, version, self.taxonomy_api)
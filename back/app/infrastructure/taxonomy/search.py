@@ -0,0 +1,255 @@
+import asyncio
+import bisect
+import heapq
+import math
+import re
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from .tree_index import CategoryRecord, CategoryTreeIndex
+
+_TOKEN = re.compile(r"\w+")
+
+_PREFIX_SIMILARITY = 0.9
+_FUZZY_SIMILARITY = 0.8
+_PATH_WEIGHT = 0.6
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.casefold())
+
+
+def _trigrams(token: str) -> set[str]:
+    padded = f"  {token} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class CategoryMatch:
+    record: CategoryRecord
+    score: float
+
+
+@dataclass
+class CategorySearchIndex:
+    """Ranked search over leaf categories of a tree.
+
+    Leaves are found by tokens of their names and of their ancestor names.
+    Query tokens match vocabulary tokens exactly, by prefix or, for typos,
+    by trigram similarity. The score is the idf-weighted share of matched
+    query tokens, so it lies in [0, 1] and 1 means every query token is in
+    the category name.
+    """
+
+    tree: CategoryTreeIndex
+    max_expansions: int = 16
+    _leaves: array = field(init=False, repr=False)
+    _name_lengths: array = field(init=False, repr=False)
+    _tokens: list[str] = field(init=False, repr=False)
+    _token_ids: dict[str, int] = field(init=False, repr=False)
+    _name_postings: list[array] = field(init=False, repr=False)
+    _path_postings: list[array] = field(init=False, repr=False)
+    _leaf_paths: list[frozenset[str]] = field(init=False, repr=False)
+    _idf: list[float] = field(init=False, repr=False)
+    _trigrams: dict[str, list[int]] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        tree = self.tree
+        name_tokens = [set(tokenize(name)) for name in tree.names]
+
+        # Tokens of a node and its ancestors are shared by the whole subtree,
+        # parents come first in the breadth-first order.
+        empty: frozenset[str] = frozenset()
+        subtree_tokens: dict[int, frozenset[str]] = {}
+        for position in range(len(tree)):
+            if not tree.leaves[position]:
+                inherited = subtree_tokens.get(tree.parents[position], empty)
+                own = name_tokens[tree.name_ids[position]]
+                subtree_tokens[position] = inherited.union(own)
+
+        name_postings: dict[str, array] = defaultdict(lambda: array("i"))
+        path_postings: dict[str, array] = defaultdict(lambda: array("i"))
+        self._leaves = array("i")
+        self._name_lengths = array("H")
+        self._leaf_paths = []
+        for position in tree.iter_leaves():
+            leaf = len(self._leaves)
+            self._leaves.append(position)
+
+            tokens = name_tokens[tree.name_ids[position]]
+            self._name_lengths.append(len(tokens))
+            for token in tokens:
+                name_postings[token].append(leaf)
+            inherited = subtree_tokens.get(tree.parents[position], empty)
+            self._leaf_paths.append(inherited)
+            for token in inherited - tokens:
+                path_postings[token].append(leaf)
+
+        self._tokens = sorted(name_postings.keys() | path_postings.keys())
+        self._token_ids = {token: i for i, token in enumerate(self._tokens)}
+        self._name_postings = [name_postings.get(t, array("i")) for t in self._tokens]
+        self._path_postings = [path_postings.get(t, array("i")) for t in self._tokens]
+
+        total = max(len(self._leaves), 1)
+        self._idf = [
+            math.log(1 + total / max(len(names) + len(paths), 1))
+            for names, paths in zip(
+                self._name_postings, self._path_postings, strict=True
+            )
+        ]
+
+        self._trigrams = defaultdict(list)
+        for token_id, token in enumerate(self._tokens):
+            for trigram in _trigrams(token):
+                self._trigrams[trigram].append(token_id)
+
+    def _expand(self, token: str) -> list[tuple[int, float]]:
+        """Vocabulary tokens matching the query token with their similarity."""
+        matches: dict[int, float] = {}
+
+        token_id = self._token_ids.get(token)
+        if token_id is not None:
+            matches[token_id] = 1.0
+
+        if len(token) >= 3:
+            start = bisect.bisect_left(self._tokens, token)
+            for token_id in range(start, len(self._tokens)):
+                if len(matches) >= self.max_expansions:
+                    break
+                if not self._tokens[token_id].startswith(token):
+                    break
+                matches.setdefault(token_id, _PREFIX_SIMILARITY)
+
+        if not matches and len(token) >= 3:
+            query = _trigrams(token)
+            shared: dict[int, int] = defaultdict(int)
+            for trigram in query:
+                for token_id in self._trigrams.get(trigram, ()):
+                    shared[token_id] += 1
+
+            for token_id, count in shared.items():
+                candidate = len(_trigrams(self._tokens[token_id]))
+                similarity = count / (len(query) + candidate - count)
+                if similarity >= 0.5:
+                    matches[token_id] = similarity * _FUZZY_SIMILARITY
+
+            if len(matches) > self.max_expansions:
+                matches = dict(
+                    heapq.nlargest(
+                        self.max_expansions, matches.items(), key=lambda m: m[1]
+                    )
+                )
+
+        return list(matches.items())
+
+    def search(
+        self, query: str, limit: int = 10, *, min_score: float = 0.0
+    ) -> list[CategoryMatch]:
+        """Return up to ``limit`` best leaf categories for the query."""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+
+        max_idf = math.log(1 + max(len(self._leaves), 1))
+        expansions = [self._expand(token) for token in tokens]
+        weights = [
+            max((self._idf[token_id] for token_id, _ in matches), default=max_idf)
+            for matches in expansions
+        ]
+        total_weight = sum(weights)
+
+        # Candidates are leaves with a query token in the name, ancestors are
+        # only searched when there are none. Ancestor tokens of candidates
+        # are checked directly, that is cheaper than merging path postings
+        # shared by large subtrees.
+        name_scores: list[dict[int, float]] = []
+        for matches in expansions:
+            best: dict[int, float] = {}
+            for token_id, similarity in matches:
+                for leaf in self._name_postings[token_id]:
+                    if best.get(leaf, 0.0) < similarity:
+                        best[leaf] = similarity
+            name_scores.append(best)
+
+        candidates = set().union(*name_scores)
+        if not candidates:
+            for matches in expansions:
+                for token_id, _ in matches:
+                    candidates.update(self._path_postings[token_id])
+
+        scores: dict[int, float] = {}
+        for leaf in candidates:
+            path = self._leaf_paths[leaf]
+            score = 0.0
+            for weight, matches, best in zip(
+                weights, expansions, name_scores, strict=True
+            ):
+                similarity = best.get(leaf, 0.0)
+                if similarity < 1.0:
+                    for token_id, token_similarity in matches:
+                        if self._tokens[token_id] in path:
+                            similarity = max(
+                                similarity, token_similarity * _PATH_WEIGHT
+                            )
+                score += weight * similarity
+            scores[leaf] = score
+
+        threshold = min_score * total_weight
+        ranked = heapq.nsmallest(
+            limit,
+            (
+                (-score, self._name_lengths[leaf], leaf)
+                for leaf, score in scores.items()
+                if score >= threshold
+            ),
+        )
+        return [
+            CategoryMatch(
+                record=self.tree.record(self._leaves[leaf]),
+                score=-score / total_weight,
+            )
+            for score, _, leaf in ranked
+        ]
+
+
+@dataclass
+class CategorySearchCache:
+    """Search indexes of the current category tree versions.
+
+    ``resolve`` is used to map category names received from clients to
+    categories: an exact name match is preferred, otherwise the best search
+    result is accepted when its score reaches ``min_score``. Indexes are
+    built and searched in worker threads.
+    """
+
+    min_score: float = 0.8
+    _indexes: dict[str, CategorySearchIndex] = field(
+        init=False, repr=False, default_factory=dict
+    )
+    _lock: asyncio.Lock = field(init=False, repr=False, default_factory=asyncio.Lock)
+
+    async def get(self, tree: CategoryTreeIndex) -> CategorySearchIndex:
+        index = self._indexes.get(tree.tree_id)
+        if index is not None and index.tree is tree:
+            return index
+
+        async with self._lock:
+            index = self._indexes.get(tree.tree_id)
+            if index is None or index.tree is not tree:
+                index = await asyncio.to_thread(CategorySearchIndex, tree)
+                self._indexes[tree.tree_id] = index
+            return index
+
+    async def resolve(
+        self, tree: CategoryTreeIndex, name: str
+    ) -> CategoryRecord | None:
+        record = tree.find(name)
+        if record is not None:
+            return record
+
+        index = await self.get(tree)
+        matches = await asyncio.to_thread(
+            index.search, name, limit=1, min_score=self.min_score
+        )
+        return matches[0].record if matches else None
@@ -0,0 +1,126 @@
+import asyncio
+import os
+import tempfile
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+from app.logger import logger
+
+from ..api_clients.ebay import CategoryTreeTable
+from .tree_index import CategoryTreeIndex
+
+
+@dataclass
+class CategoryTreeStore:
+    """Process-wide storage of category tree indexes.
+
+    Indexes are keyed by category tree id and version, kept in memory and
+    persisted to ``cache_dir`` so that a restarted process doesn't download
+    the trees again. Disk reads and writes run in worker threads.
+    """
+
+    cache_dir: str | None = None
+    _indexes: dict[str, CategoryTreeIndex] = field(
+        init=False, repr=False, default_factory=dict
+    )
+    _lock: asyncio.Lock = field(init=False, repr=False, default_factory=asyncio.Lock)
+
+    async def get(
+        self, tree_id: str, fetch: Callable[[str], Awaitable[CategoryTreeTable]]
+    ) -> CategoryTreeIndex:
+        index = self._indexes.get(tree_id)
+        if index is not None:
+            return index
+
+        async with self._lock:
+            index = self._indexes.get(tree_id)
+            if index is None:
+                index = await asyncio.to_thread(self._load, tree_id)
+            if index is None:
+                table = await fetch(tree_id)
+                index = await asyncio.to_thread(CategoryTreeIndex.from_table, table)
+                await asyncio.to_thread(self._persist, index)
+
+            self._indexes[tree_id] = index
+            return index
+
+    async def cached(self, tree_id: str) -> CategoryTreeIndex | None:
+        """Return the stored index without downloading the tree."""
+        index = self._indexes.get(tree_id)
+        if index is not None:
+            return index
+
+        async with self._lock:
+            index = self._indexes.get(tree_id)
+            if index is None:
+                index = await asyncio.to_thread(self._load, tree_id)
+            if index is not None:
+                self._indexes[tree_id] = index
+            return index
+
+    async def put(self, index: CategoryTreeIndex):
+        """Persist the index and atomically replace the one used by readers."""
+        await asyncio.to_thread(self._persist, index)
+        self._indexes[index.tree_id] = index
+
+    def _path(self, tree_id: str, version: str) -> str:
+        filename = f"category_tree_{tree_id}_{version}.json.gz"
+        return os.path.join(self.cache_dir, filename)
+
+    def _load(self, tree_id: str) -> CategoryTreeIndex | None:
+        if self.cache_dir is None or not os.path.isdir(self.cache_dir):
+            return None
+
+        prefix = f"category_tree_{tree_id}_"
+        candidates = [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir)
+            if name.startswith(prefix) and not name.endswith(".tmp")
+        ]
+        if not candidates:
+            return None
+
+        path = max(candidates, key=os.path.getmtime)
+        try:
+            with open(path, "rb") as f:
+                return CategoryTreeIndex.load(f)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Failed to load category tree from {path}: {e}")
+            return None
+
+    def _persist(self, index: CategoryTreeIndex):
+        if self.cache_dir is None:
+            return
+
+        path = self._path(index.tree_id, index.version)
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self.cache_dir, prefix=os.path.basename(path), suffix=".tmp"
+            )
+            with os.fdopen(fd, "wb") as f:
+                index.dump(f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to persist category tree to {path}: {e}")
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            return
+
+        # temporary files may belong to a write running in another process
+        prefix = f"category_tree_{index.tree_id}_"
+        for name in os.listdir(self.cache_dir):
+            outdated = os.path.join(self.cache_dir, name)
+            if (
+                name.startswith(prefix)
+                and not name.endswith(".tmp")
+                and outdated != path
+            ):
+                try:
+                    os.remove(outdated)
+                except OSError:
+                    pass
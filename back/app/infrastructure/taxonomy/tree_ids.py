@@ -0,0 +1,95 @@
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from redis import RedisError
+from redis.asyncio import Redis
+
+from app.logger import logger
+
+from ..api_clients.ebay import EbayTaxonomyClient, EbayTaxonomyClientError
+from ..api_clients.ebay.models import BaseCategoryTree, MarketplaceIdEnum
+from ..cache import CacheStats, TTLCache
+
+
+@dataclass
+class DefaultTreeIdCache:
+    """Marketplace to default category tree id mapping.
+
+    Values are kept in process memory and, when ``redis`` is set, shared
+    between workers through Redis.
+    """
+
+    ttl: timedelta
+    redis: Redis | None = None
+    _local: TTLCache[str, str] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._local = TTLCache(ttl=self.ttl.total_seconds())
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._local.stats
+
+    @staticmethod
+    def _to_key(marketplace_id: str) -> str:
+        return f"ebay:default_tree_id:{marketplace_id}"
+
+    async def get(
+        self, marketplace_id: str, fetch: Callable[[str], Awaitable[str]]
+    ) -> str:
+        tree_id = self._local.get(marketplace_id)
+        if tree_id is not None:
+            return tree_id
+
+        tree_id = await self._shared_get(marketplace_id)
+        if tree_id is None:
+            tree_id = await fetch(marketplace_id)
+            await self._shared_set(marketplace_id, tree_id)
+
+        self._local.set(marketplace_id, tree_id)
+        return tree_id
+
+    async def put(self, marketplace_id: str, tree_id: str):
+        self._local.set(marketplace_id, tree_id)
+        await self._shared_set(marketplace_id, tree_id)
+
+    async def warm(
+        self,
+        taxonomy_api: EbayTaxonomyClient,
+        marketplaces: Iterable[MarketplaceIdEnum] = tuple(MarketplaceIdEnum),
+    ) -> dict[MarketplaceIdEnum, BaseCategoryTree]:
+        """Fetch default trees of the marketplaces and cache their ids."""
+        trees = {}
+        for marketplace_id in marketplaces:
+            try:
+                tree = await taxonomy_api.get_default_tree(marketplace_id)
+            except EbayTaxonomyClientError as e:
+                logger.warning(
+                    f"Failed to get {marketplace_id} default category tree: {e}",
+                    exc_info=True,
+                )
+                continue
+
+            await self.put(marketplace_id, tree.category_tree_id)
+            trees[marketplace_id] = tree
+
+        return trees
+
+    async def _shared_get(self, marketplace_id: str) -> str | None:
+        if self.redis is None:
+            return None
+        try:
+            value = await self.redis.get(self._to_key(marketplace_id))
+        except RedisError as e:
+            logger.warning(f"Failed to read default tree id from redis: {e}")
+            return None
+        return value.decode() if isinstance(value, bytes) else value
+
+    async def _shared_set(self, marketplace_id: str, tree_id: str):
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(self._to_key(marketplace_id), tree_id, ex=self.ttl)
+        except RedisError as e:
+            logger.warning(f"Failed to store default tree id in redis: {e}")
@@ -0,0 +1,234 @@
+import gzip
+import json
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import IO, Self
+
+from ..api_clients.ebay import CategoryTreeTable
+from ..api_clients.ebay.models import CategoryTree
+
+
+@dataclass(frozen=True)
+class CategoryRecord:
+    category_id: str
+    name: str
+    is_leaf: bool
+    path: tuple[str, ...]
+
+
+@dataclass
+class CategoryTreeIndex:
+    """Compact case-folded index of a single category tree version.
+
+    Nodes are kept in breadth-first order in parallel arrays, so children of
+    a node occupy the contiguous range ``child_start[i]:child_end[i]``.
+    Names are stored once in ``names`` and referenced by ``name_ids``. The
+    root node is not included, top level categories have parent -1 and
+    level 1.
+
+    Only the category ids and the name lookup lists remain objects per
+    category. On a synthetic tree of 9k categories the index takes about
+    230 bytes per category, against about 1 KB for the parsed model tree.
+    """
+
+    tree_id: str
+    version: str
+    ids: list[str]
+    names: list[str]
+    name_ids: array
+    parents: array
+    levels: array
+    leaves: bytearray
+    child_start: array
+    child_end: array
+    _by_name: dict[str, list[int]] = field(init=False, repr=False, default_factory=dict)
+
+    def __post_init__(self):
+        positions_by_name: list[list[int]] = [[] for _ in self.names]
+        for position, name_id in enumerate(self.name_ids):
+            positions_by_name[name_id].append(position)
+
+        for name, positions in zip(self.names, positions_by_name, strict=True):
+            self._by_name.setdefault(name.casefold(), []).extend(positions)
+        for positions in self._by_name.values():
+            positions.sort()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def name(self, position: int) -> str:
+        return self.names[self.name_ids[position]]
+
+    def is_leaf(self, position: int) -> bool:
+        return bool(self.leaves[position])
+
+    def children(self, position: int) -> range:
+        return range(self.child_start[position], self.child_end[position])
+
+    def ancestors(self, position: int) -> list[int]:
+        """Positions of the node ancestors, starting from the top level."""
+        ancestors = []
+        parent = self.parents[position]
+        while parent >= 0:
+            ancestors.append(parent)
+            parent = self.parents[parent]
+        ancestors.reverse()
+        return ancestors
+
+    def path(self, position: int) -> tuple[str, ...]:
+        return tuple(self.name(p) for p in (*self.ancestors(position), position))
+
+    def record(self, position: int) -> CategoryRecord:
+        return CategoryRecord(
+            category_id=self.ids[position],
+            name=self.name(position),
+            is_leaf=self.is_leaf(position),
+            path=self.path(position),
+        )
+
+    def iter_leaves(self, position: int | None = None) -> Iterator[int]:
+        """Positions of leaves under the node or of the whole tree."""
+        if position is None:
+            yield from (i for i, is_leaf in enumerate(self.leaves) if is_leaf)
+            return
+
+        stack = [position]
+        while stack:
+            current = stack.pop()
+            if self.leaves[current]:
+                yield current
+            else:
+                stack.extend(reversed(self.children(current)))
+
+    def find(self, name: str, *, leaf_only: bool = True) -> CategoryRecord | None:
+        """Find the category by name, shallower categories are preferred."""
+        for position in self._by_name.get(name.casefold(), ()):
+            if self.leaves[position] or not leaf_only:
+                return self.record(position)
+        return None
+
+    @classmethod
+    def build(
+        cls,
+        tree_id: str,
+        version: str,
+        nodes: Iterable[tuple[str, str, int, bool]],
+    ) -> Self:
+        """Build the index from ``(id, name, parent, is_leaf)`` nodes.
+
+        Nodes may come in any order where parents precede their children.
+        """
+        ids: list[str] = []
+        name_ids = array("i")
+        names: list[str] = []
+        interned: dict[str, int] = {}
+        parents: list[int] = []
+        leaves = bytearray()
+        for category_id, name, parent, is_leaf in nodes:
+            ids.append(category_id)
+            name_id = interned.setdefault(name, len(names))
+            if name_id == len(names):
+                names.append(name)
+            name_ids.append(name_id)
+            parents.append(parent)
+            leaves.append(bool(is_leaf))
+
+        roots: list[int] = []
+        children: list[list[int]] = [[] for _ in ids]
+        for position, parent in enumerate(parents):
+            (roots if parent < 0 else children[parent]).append(position)
+
+        order = list(roots)
+        for position in order:
+            order.extend(children[position])
+
+        new_positions = array("i", [0]) * len(order)
+        for new, old in enumerate(order):
+            new_positions[old] = new
+
+        size = len(order)
+        index_parents = array("i", [0]) * size
+        levels = array("B", [0]) * size
+        child_start = array("i", [0]) * size
+        child_end = array("i", [0]) * size
+        cursor = len(roots)
+        for new, old in enumerate(order):
+            parent = parents[old]
+            if parent < 0:
+                index_parents[new] = -1
+                levels[new] = 1
+            else:
+                index_parents[new] = new_positions[parent]
+                levels[new] = levels[new_positions[parent]] + 1
+
+            child_start[new] = cursor
+            cursor += len(children[old])
+            child_end[new] = cursor
+
+        return cls(
+            tree_id=tree_id,
+            version=version,
+            ids=[ids[old] for old in order],
+            names=names,
+            name_ids=array("i", (name_ids[old] for old in order)),
+            parents=index_parents,
+            levels=levels,
+            leaves=bytearray(leaves[old] for old in order),
+            child_start=child_start,
+            child_end=child_end,
+        )
+
+    @classmethod
+    def from_table(cls, table: CategoryTreeTable) -> Self:
+        return cls.build(
+            table.tree_id,
+            table.version,
+            zip(table.ids, table.names, table.parents, table.leaves, strict=True),
+        )
+
+    @classmethod
+    def from_tree(cls, tree: CategoryTree) -> Self:
+        """Flatten the tree model, skipping the root node."""
+        table = CategoryTreeTable(tree.category_tree_id, tree.category_tree_version)
+
+        root = tree.root_category_node
+        stack = [(node, -1) for node in reversed(root.child_category_tree_nodes)]
+        while stack:
+            node, parent = stack.pop()
+            category = node.category
+            table.append(
+                category.category_id,
+                category.category_name,
+                parent,
+                bool(node.leaf_category_tree_node),
+            )
+
+            position = len(table) - 1
+            for child in reversed(node.child_category_tree_nodes):
+                stack.append((child, position))
+
+        return cls.from_table(table)
+
+    def dump(self, fp: IO[bytes]):
+        nodes = [
+            [self.ids[i], self.name(i), self.parents[i], self.is_leaf(i)]
+            for i in range(len(self))
+        ]
+
+        data = {
+            "category_tree_id": self.tree_id,
+            "category_tree_version": self.version,
+            "nodes": nodes,
+        }
+        with gzip.open(fp, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, fp: IO[bytes]) -> Self:
+        with gzip.open(fp, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+
+        return cls.build(
+            data["category_tree_id"], data["category_tree_version"], data["nodes"]
+        )
@@ -0,0 +1,13 @@
+from functools import lru_cache
+
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=128)
+def type_adapter[T](tp: type[T]) -> TypeAdapter[T]:
+    """TypeAdapter of ``tp`` shared between calls.
+
+    Building an adapter compiles the pydantic core schema of the type, which
+    costs much more than the validation itself.
+    """
+    return TypeAdapter(tp)
@@ -1,9 +1,11 @@
 import uuid
-from collections.abc import AsyncIterable
+from collections.abc import AsyncIterable, Iterable
+from datetime import timedelta
 from itertools import count
 from typing import Annotated
 
 from authlib.integrations.starlette_client import OAuth, StarletteOAuth2App
+from celery import Celery
 from dishka import (
     FromComponent,
     Provider,
@@ -11,14 +13,20 @@ from dishka import (
     from_context,
     provide,
 )
-from perplexity import Perplexity as PerplexityClient
+from perplexity import AsyncPerplexity
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.api.dependencies import OAuth2ClientMapping
 from app.config import DBConfig, EbayConfig, RedisConfig
 from app.data import Marketplace, OAuth2Settings
-from app.infrastructure.providers import EbayClientSettings, SKUGenerator
+from app.infrastructure.providers import (
+    EbayClientSettings,
+    EbayHTTPSettings,
+    EbayPublishSettings,
+    EbayTaxonomySettings,
+    SKUGenerator,
+)
 
 
 class DBProvider(Provider):
@@ -42,9 +50,20 @@ class DBProvider(Provider):
 class RedisProvider(Provider):
     redis_config = from_context(RedisConfig, scope=Scope.APP)
 
-    @provide(scope=Scope.REQUEST)
-    def redis(self, redis_config: RedisConfig) -> Redis:
-        return Redis.from_url(redis_config.get_url())
+    @provide(scope=Scope.APP)
+    async def redis(self, redis_config: RedisConfig) -> AsyncIterable[Redis]:
+        redis = Redis.from_url(redis_config.get_url())
+        yield redis
+        await redis.aclose()
+
+
+class CeleryProvider(Provider):
+    @provide(scope=Scope.APP)
+    def celery(self, redis_config: RedisConfig) -> Iterable[Celery]:
+        """Client used to send tasks to the workers of the tasks package"""
+        celery = Celery(broker=redis_config.get_url())
+        yield celery
+        celery.close()
 
 
 PerplexityToken = str
@@ -54,8 +73,12 @@ class PerplexityClientProvider(Provider):
     perplexity_token = from_context(PerplexityToken, scope=Scope.APP)
 
     @provide(scope=Scope.APP)
-    def perplexity_client(self, perplexity_token: PerplexityToken) -> PerplexityClient:
-        return PerplexityClient(api_key=perplexity_token)
+    async def perplexity_client(
+        self, perplexity_token: PerplexityToken
+    ) -> AsyncIterable[AsyncPerplexity]:
+        client = AsyncPerplexity(api_key=perplexity_token)
+        yield client
+        await client.close()
 
 
 class OAuthProvider(Provider):
@@ -94,6 +117,48 @@ class EbayProvider(Provider):
     ) -> EbayClientSettings:
         return EbayClientSettings(ebay_config.domain, settings)
 
+    @provide(scope=Scope.APP)
+    def ebay_http_settings(self, ebay_config: EbayConfig) -> EbayHTTPSettings:
+        http = ebay_config.http
+        return EbayHTTPSettings(
+            limit=http.limit,
+            limit_per_host=http.limit_per_host,
+            connect_timeout=http.connect_timeout,
+            read_timeout=http.read_timeout,
+        )
+
+    @provide(scope=Scope.APP)
+    def ebay_publish_settings(self, ebay_config: EbayConfig) -> EbayPublishSettings:
+        publish = ebay_config.publish
+        return EbayPublishSettings(
+            upload_concurrency=publish.upload_concurrency,
+            upload_attempts=publish.upload_attempts,
+            upload_retry_delay=publish.upload_retry_delay,
+            batch_concurrency=publish.batch_concurrency,
+            listing_settings_ttl=timedelta(
+                minutes=publish.listing_settings_ttl_minutes
+            ),
+        )
+
+    @provide(scope=Scope.APP)
+    def ebay_taxonomy_settings(self, ebay_config: EbayConfig) -> EbayTaxonomySettings:
+        taxonomy = ebay_config.taxonomy
+        return EbayTaxonomySettings(
+            cache_dir=taxonomy.cache_dir,
+            refresh_interval=timedelta(hours=taxonomy.refresh_interval_hours),
+            tree_id_ttl=timedelta(hours=taxonomy.tree_id_ttl_hours),
+            aspects_ttl=timedelta(hours=taxonomy.aspects_ttl_hours),
+            aspects_cache_size=taxonomy.aspects_cache_size,
+            marketplaces=taxonomy.marketplaces,
+            redis_shared=taxonomy.redis_shared,
+            bulk_aspects=taxonomy.bulk_aspects,
+            category_min_score=taxonomy.category_min_score,
+            local_prediction=taxonomy.local_prediction,
+            prediction_fallback=taxonomy.prediction_fallback,
+            prediction_min_score=taxonomy.prediction_min_score,
+            prediction_limit=taxonomy.prediction_limit,
+        )
+
     @provide(scope=Scope.APP)
     def starlette_oauth(
         self, settings: OAuth2Settings, oauth: Annotated[OAuth, FromComponent("")]
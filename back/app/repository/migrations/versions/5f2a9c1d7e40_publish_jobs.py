@@ -0,0 +1,62 @@
+"""publish jobs
+
+Revision ID: 5f2a9c1d7e40
+Revises: c3efe509beb0
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "5f2a9c1d7e40"
+down_revision: Union[str, Sequence[str], None] = "c3efe509beb0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "publish_jobs",
+        sa.Column("uuid", sa.UUID(), nullable=False),
+        sa.Column("user_uuid", sa.UUID(), nullable=False),
+        sa.Column("marketplace", sa.VARCHAR(), nullable=False),
+        sa.Column("item", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("images", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("status", sa.VARCHAR(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_uuid"],
+            ["users.uuid"],
+        ),
+        sa.PrimaryKeyConstraint("uuid"),
+    )
+    op.create_index(
+        op.f("ix_publish_jobs_user_uuid"),
+        "publish_jobs",
+        ["user_uuid"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_publish_jobs_user_uuid"), table_name="publish_jobs")
+    op.drop_table("publish_jobs")
@@ -2,6 +2,7 @@ from datetime import datetime
 from uuid import UUID
 
 from sqlalchemy import TIMESTAMP, VARCHAR, Boolean, ForeignKey, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, registry
 
@@ -36,3 +37,27 @@ class RefreshToken:
     expires_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), nullable=False
     )
+
+
+@mapper_registry.mapped
+class PublishJobModel:
+    __tablename__ = "publish_jobs"
+
+    uuid: Mapped[UUID] = mapped_column(PGUUID, primary_key=True)
+    user_uuid: Mapped[UUID] = mapped_column(
+        ForeignKey("users.uuid"), nullable=False, index=True
+    )
+    marketplace: Mapped[str] = mapped_column(VARCHAR, nullable=False)
+    item: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    images: Mapped[list] = mapped_column(JSONB, nullable=False)
+    status: Mapped[str] = mapped_column(VARCHAR, nullable=False)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
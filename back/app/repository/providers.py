@@ -1,7 +1,12 @@
 from dishka import Provider, Scope, provide
 
-from app.services.ports import IRefreshTokenStorage, IUserRepository
+from app.services.ports import (
+    IPublishJobRepository,
+    IRefreshTokenStorage,
+    IUserRepository,
+)
 
+from .publish_jobs import PublishJobRepository
 from .refresh_tokens import RefreshTokenRepository
 from .user import UserRepository
 
@@ -13,3 +18,6 @@ class RepositoryProvider(Provider):
     refresh_token_storage = provide(
         RefreshTokenRepository, provides=IRefreshTokenStorage, scope=Scope.REQUEST
     )
+    publish_job_repository = provide(
+        PublishJobRepository, provides=IPublishJobRepository, scope=Scope.REQUEST
+    )
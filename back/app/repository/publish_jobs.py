@@ -0,0 +1,80 @@
+import uuid
+
+from sqlalchemy import select, update
+
+from app.domain.entities import PublishJob, PublishJobStatus
+from app.services.ports import PublishJobRepositoryError
+
+from .base import BaseRepository
+from .models import PublishJobModel
+
+
+class PublishJobRepository(BaseRepository):
+    async def add(self, job: PublishJob):
+        row = PublishJobModel(
+            uuid=job.uuid,
+            user_uuid=job.user_uuid,
+            marketplace=job.marketplace,
+            item=job.item,
+            images=job.images,
+            status=job.status,
+            error=job.error,
+        )
+
+        try:
+            self.session.add(row)
+            await self.session.commit()
+        except Exception as e:
+            raise PublishJobRepositoryError() from e
+
+    async def get(self, job_uuid: uuid.UUID) -> PublishJob | None:
+        q = select(PublishJobModel).where(PublishJobModel.uuid == job_uuid)
+
+        try:
+            row = (await self.session.execute(q)).scalar_one_or_none()
+        except Exception as e:
+            raise PublishJobRepositoryError() from e
+
+        if row is None:
+            return
+
+        return PublishJob(
+            uuid=row.uuid,
+            user_uuid=row.user_uuid,
+            marketplace=row.marketplace,
+            item=row.item,
+            images=row.images,
+            status=PublishJobStatus(row.status),
+            error=row.error,
+        )
+
+    async def claim(self, job_uuid: uuid.UUID) -> bool:
+        stmt = (
+            update(PublishJobModel)
+            .where(
+                PublishJobModel.uuid == job_uuid,
+                PublishJobModel.status == PublishJobStatus.PENDING,
+            )
+            .values(status=PublishJobStatus.RUNNING)
+        )
+        try:
+            result = await self.session.execute(stmt)
+            await self.session.commit()
+        except Exception as e:
+            raise PublishJobRepositoryError() from e
+
+        return result.rowcount == 1
+
+    async def set_status(
+        self, job_uuid: uuid.UUID, status: PublishJobStatus, error: str | None = None
+    ):
+        stmt = (
+            update(PublishJobModel)
+            .where(PublishJobModel.uuid == job_uuid)
+            .values(status=status, error=error)
+        )
+        try:
+            await self.session.execute(stmt)
+            await self.session.commit()
+        except Exception as e:
+            raise PublishJobRepositoryError() from e
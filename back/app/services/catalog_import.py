@@ -0,0 +1,196 @@
+from collections.abc import AsyncIterable, AsyncIterator
+from contextlib import aclosing
+from dataclasses import dataclass, field
+
+from app.domain.dto import (
+    CatalogImportOptionsDTO,
+    ImportResultDTO,
+    ItemDTO,
+    MarketplaceAccountDTO,
+    ProductDTO,
+)
+from app.domain.ports import (
+    ISearchService,
+    ISellingService,
+    ProductCategoriesNotFound,
+    SearchServiceError,
+    SellingServiceError,
+)
+
+from .pipeline import Stage, StageResult, pipeline
+from .selling import publish_error_code
+
+
+class CatalogRowError(Exception):
+    pass
+
+
+@dataclass
+class _Row:
+    line: int
+    data: dict[str]
+    barcode: str | None = None
+    product_name: str | None = None
+    category: str | None = None
+    comment: str = ""
+    price: float = 0
+    quantity: int = 1
+    images: list[str] = field(default_factory=list)
+    product: ProductDTO | None = None
+    item: ItemDTO | None = None
+
+
+def _text(value) -> str | None:
+    if value is None:
+        return None
+    return str(value).strip() or None
+
+
+def _error_code(e: Exception) -> str:
+    if isinstance(e, CatalogRowError):
+        return "invalid_row"
+    if isinstance(e, ProductCategoriesNotFound):
+        return "categories_not_found"
+    if isinstance(e, SearchServiceError):
+        return "search_failed"
+    return publish_error_code(e)
+
+
+@dataclass
+class CatalogImportService:
+    """Publishes catalog rows through recognition, aspects search,
+    validation and publishing stages.
+
+    Stages overlap: while one row is published the next ones are already
+    searched, and every stage has its own concurrency limit.
+    """
+
+    searcher: ISearchService
+    seller: ISellingService
+    recognition_concurrency: int = 4
+    aspects_concurrency: int = 4
+    validation_concurrency: int = 4
+    publish_concurrency: int = 2
+
+    async def run(
+        self,
+        rows: AsyncIterable[tuple[int, dict[str]]],
+        account: MarketplaceAccountDTO,
+        options: CatalogImportOptionsDTO,
+    ) -> AsyncIterator[ImportResultDTO]:
+        marketplace = account.marketplace
+        settings = options.search_settings
+
+        async def recognize(row: _Row):
+            if row.product_name and row.category:
+                return
+
+            if row.product_name:
+                found = await self.searcher.product_categories(
+                    row.product_name, marketplace, **settings
+                )
+            else:
+                found = await self.searcher.recognize_barcode(
+                    row.barcode, marketplace, **settings
+                )
+                row.product_name = found.product_name
+
+            if not row.category:
+                if not found.categories:
+                    raise ProductCategoriesNotFound()
+                row.category = found.categories[0]
+
+        async def search_aspects(row: _Row):
+            row.product = await self.searcher.product_aspects(
+                row.product_name, row.category, row.comment, marketplace, **settings
+            )
+
+        async def validate(row: _Row):
+            row.item = self._to_item(row, options)
+            await self.seller.validate(row.item, account)
+
+        async def publish(row: _Row):
+            await self.seller.publish(row.item, account, *row.images)
+
+        stages = [
+            Stage("parse", self._parse),
+            Stage("recognition", recognize, self.recognition_concurrency),
+            Stage("aspects", search_aspects, self.aspects_concurrency),
+            Stage("validation", validate, self.validation_concurrency),
+            Stage("publish", publish, self.publish_concurrency),
+        ]
+
+        async def states() -> AsyncIterator[_Row]:
+            async for line, data in rows:
+                yield _Row(line=line, data=data)
+
+        results = pipeline(
+            states(),
+            stages,
+            errors=(CatalogRowError, SearchServiceError, SellingServiceError),
+        )
+        async with aclosing(results):
+            async for result in results:
+                yield self._to_result(result)
+
+    @staticmethod
+    async def _parse(row: _Row):
+        data = row.data
+        row.barcode = _text(data.get("barcode"))
+        row.product_name = _text(data.get("product_name"))
+        row.category = _text(data.get("category"))
+        row.comment = _text(data.get("comment")) or ""
+        if not (row.barcode or row.product_name):
+            raise CatalogRowError("Row needs a barcode or a product name")
+
+        try:
+            row.price = float(data["price"])
+            row.quantity = int(data.get("quantity") or 1)
+        except (KeyError, TypeError, ValueError) as e:
+            raise CatalogRowError("Invalid price or quantity") from e
+
+        images = data.get("images") or []
+        if not isinstance(images, list):
+            raise CatalogRowError("Images must be a list")
+        row.images = images
+
+    @staticmethod
+    def _to_item(row: _Row, options: CatalogImportOptionsDTO) -> ItemDTO:
+        metadata = row.product.metadata
+
+        marketplace_aspects_data = dict(options.marketplace_aspects_data)
+        if "package" in metadata:
+            marketplace_aspects_data.setdefault("package", metadata["package"])
+
+        return ItemDTO(
+            title=row.product_name,
+            description=metadata.get("description") or row.product_name,
+            price=row.price,
+            currency=options.currency,
+            country=options.country,
+            quantity=row.quantity,
+            category=row.category,
+            marketplace_aspects_data=marketplace_aspects_data,
+            product_aspects={
+                aspect.name: aspect.value
+                for aspect in row.product.aspects
+                if aspect.value is not None
+            },
+        )
+
+    @staticmethod
+    def _to_result(result: StageResult[_Row]) -> ImportResultDTO:
+        row = result.item
+        if result.error is None:
+            return ImportResultDTO(
+                line=row.line, published=True, product_name=row.product_name
+            )
+
+        return ImportResultDTO(
+            line=row.line,
+            published=False,
+            product_name=row.product_name,
+            stage=result.failed_stage,
+            error=_error_code(result.error),
+            message=str(result.error) or None,
+        )
@@ -21,7 +21,7 @@ class MarketplaceAccountService:
 
         try:
             token = await self.token_manager.access_token(entity.marketplace)
-            account_settings = api.get_account_settings(token)
+            account_settings = await api.get_account_settings(token, account=entity)
             return FromEntity.account_settings(account_settings)
 
         except MarketplaceAPIError as e:
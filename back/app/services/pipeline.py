@@ -0,0 +1,94 @@
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Sequence
+from dataclasses import dataclass
+
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class Stage[T]:
+    name: str
+    func: Callable[[T], Awaitable[None]]
+    concurrency: int = 1
+
+
+@dataclass
+class StageResult[T]:
+    item: T
+    failed_stage: str | None = None
+    error: Exception | None = None
+
+
+async def pipeline[T](
+    source: AsyncIterable[T],
+    stages: Sequence[Stage[T]],
+    *,
+    errors: tuple[type[Exception], ...] = (Exception,),
+) -> AsyncIterator[StageResult[T]]:
+    """Pass items of ``source`` through ``stages`` and yield them as they
+    finish.
+
+    Every stage runs ``concurrency`` workers fed by a queue of the same
+    size, so only a few items per stage are in memory and ``source`` is
+    read as fast as the stages take items. An item whose stage raises one
+    of ``errors`` skips the next stages and is yielded with the error,
+    other exceptions stop the pipeline and are raised.
+    """
+    queues = [asyncio.Queue(maxsize=stage.concurrency) for stage in stages]
+    results: asyncio.Queue = asyncio.Queue(maxsize=stages[-1].concurrency)
+
+    async def feed():
+        async for item in source:
+            await queues[0].put(item)
+        for _ in range(stages[0].concurrency):
+            await queues[0].put(_STOP)
+
+    async def work(i: int):
+        stage = stages[i]
+        while (item := await queues[i].get()) is not _STOP:
+            try:
+                await stage.func(item)
+            except errors as e:
+                await results.put(StageResult(item, stage.name, e))
+                continue
+
+            if i + 1 < len(stages):
+                await queues[i + 1].put(item)
+            else:
+                await results.put(StageResult(item))
+
+    async def run_stage(i: int):
+        await asyncio.gather(*(work(i) for _ in range(stages[i].concurrency)))
+        if i + 1 < len(stages):
+            for _ in range(stages[i + 1].concurrency):
+                await queues[i + 1].put(_STOP)
+        else:
+            await results.put(_STOP)
+
+    tasks = [asyncio.ensure_future(feed())]
+    tasks += [asyncio.ensure_future(run_stage(i)) for i in range(len(stages))]
+
+    async def failure():
+        # the first task that raises stops the pipeline
+        for task in asyncio.as_completed(tasks):
+            await task
+        await asyncio.Future()
+
+    watcher = asyncio.ensure_future(failure())
+    try:
+        while True:
+            get = asyncio.ensure_future(results.get())
+            await asyncio.wait({get, watcher}, return_when=asyncio.FIRST_COMPLETED)
+            if not get.done():
+                get.cancel()
+                watcher.result()
+
+            result = get.result()
+            if result is _STOP:
+                break
+            yield result
+    finally:
+        watcher.cancel()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(watcher, *tasks, return_exceptions=True)
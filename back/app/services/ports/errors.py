@@ -2,6 +2,10 @@ class SearchEngineError(Exception):
     pass
 
 
+class SearchEngineBusyError(SearchEngineError):
+    pass
+
+
 class JWTAuthError(Exception):
     pass
 
@@ -68,3 +72,15 @@ class MarketplaceOAuthError(Exception):
 
 class OAuthParsingError(Exception):
     pass
+
+
+class PublishJobRepositoryError(Exception):
+    pass
+
+
+class PublishImageStorageError(Exception):
+    pass
+
+
+class PublishJobQueueError(Exception):
+    pass
@@ -1,38 +1,106 @@
 import uuid
+from collections.abc import AsyncIterator, Sequence
 from dataclasses import dataclass
 from typing import Protocol
 
 from ...domain.entities import (
     AccountSettings,
     AspectField,
+    AspectValue,
     IMetadata,
     Item,
     MarketplaceAccount,
     Product,
     ProductStructure,
+    PublishJob,
+    PublishJobStatus,
     User,
 )
 
 
+@dataclass
+class ProductQuery:
+    product_name: str
+    comment: str = ""
+
+
+@dataclass
+class ProductSearchResult:
+    """Result of searching one product of a batch.
+
+    ``error`` is SearchEngineError if the product was not found.
+    """
+
+    product: Product | None = None
+    error: Exception | None = None
+
+
 class ISearchEngine(Protocol):
-    def by_product_name(
+    async def by_product_name(
         self,
         metadata_type: type[IMetadata],
-        product_structure: ProductStructure,
+        product_name: str,
         comment: str,
+        product_structure: ProductStructure,
     ) -> Product:
         """raise SearchEngineError"""
         pass
 
-    def product_name_by_barecode(self, barecode: str) -> str:
+    async def metadata_by_product_name(
+        self,
+        metadata_type: type[IMetadata],
+        product_name: str,
+        comment: str,
+    ) -> IMetadata:
+        """raise SearchEngineError"""
+        pass
+
+    async def aspects_by_product_name(
+        self,
+        product_name: str,
+        comment: str,
+        product_structure: ProductStructure,
+    ) -> list[AspectValue]:
+        """raise SearchEngineError"""
+        pass
+
+    async def by_product_names(
+        self,
+        metadata_type: type[IMetadata],
+        queries: Sequence[ProductQuery],
+        product_structure: ProductStructure,
+    ) -> list[ProductSearchResult]:
+        """Search several products of one structure at once, results keep
+        the order of the queries.
+
+        raise SearchEngineError if the structure can't be searched
+        """
+        pass
+
+    def stream_by_product_name(
+        self,
+        metadata_type: type[IMetadata],
+        product_name: str,
+        comment: str,
+        product_structure: ProductStructure,
+    ) -> AsyncIterator[AspectValue | IMetadata]:
+        """Yield aspect values and metadata as soon as they are found.
+
+        raise SearchEngineError
+        """
+        pass
+
+    async def product_name_by_barecode(self, barecode: str) -> str:
         """Search product name by barecode.
 
         raise SearchEngineError
         """
         pass
 
-    def barecodes_on_image(self, img_path: str) -> list[str]:
-        """raise SearchEngineError"""
+    async def barecodes_on_image(self, img_path: str) -> list[str]:
+        """raise SearchEngineBusyError if images can't be accepted now,
+        raise SearchEngineError
+        """
         pass
 
 
@@ -58,21 +126,58 @@ class IHasher(Protocol):
         pass
 
 
+@dataclass
+class PublishResult:
+    """Result of publishing one item of a batch.
+
+    ``error`` is CategoryNotFound, AccountSettingsNotFound or
+    MarketplaceAPIError if the item was not published.
+    """
+
+    listing_id: str | None = None
+    error: Exception | None = None
+
+
 class IMarketplaceAPI(Protocol):
-    def publish(self, product: Item, token: str, *images: str) -> None:
+    async def publish(
+        self,
+        product: Item,
+        token: str,
+        *images: str,
+        account: MarketplaceAccount | None = None,
+    ) -> None:
         pass
 
-    def get_product_aspects(
+    async def publish_batch(
+        self,
+        items: Sequence[tuple[Item, Sequence[str]]],
+        token: str,
+        *,
+        account: MarketplaceAccount | None = None,
+    ) -> list[PublishResult]:
+        """Publish items with their images, results keep the order of items.
+
+        Errors of single items are reported in the results, errors that
+        affect the whole batch raise MarketplaceAPIError
+        """
+        pass
+
+    async def get_product_aspects(
         self, category_name: str, **marketplace_settings: dict
     ) -> list[AspectField]:
         pass
 
-    def get_account_settings(self, token: str) -> AccountSettings:
+    async def get_account_settings(
+        self, token: str, *, account: MarketplaceAccount | None = None
+    ) -> AccountSettings:
+        """Load settings of the account and drop its cached listing settings"""
         pass
 
 
 class ICategoryPredictor(Protocol):
-    def predict(self, product_name: str, **marketplace_settings: dict) -> list[str]:
+    async def predict(
+        self, product_name: str, **marketplace_settings: dict
+    ) -> list[str]:
         pass
 
 
@@ -116,3 +221,45 @@ class IMarketplaceOAuth(Protocol):
 
     def parse(self, data: dict[str]) -> OAuth2Tokens:
         pass
+
+
+class IPublishJobRepository(Protocol):
+    async def add(self, job: PublishJob):
+        """raise PublishJobRepositoryError"""
+        pass
+
+    async def get(self, job_uuid: uuid.UUID) -> PublishJob | None:
+        """raise PublishJobRepositoryError"""
+        pass
+
+    async def claim(self, job_uuid: uuid.UUID) -> bool:
+        """Move a pending job to running, return False if the job is not
+        pending anymore.
+
+        raise PublishJobRepositoryError
+        """
+        pass
+
+    async def set_status(
+        self, job_uuid: uuid.UUID, status: PublishJobStatus, error: str | None = None
+    ):
+        """raise PublishJobRepositoryError"""
+        pass
+
+
+class IPublishImageStorage(Protocol):
+    async def save(self, job_uuid: uuid.UUID, *images: str) -> list[str]:
+        """Move images of the job to the storage and return their new pathes.
+
+        raise PublishImageStorageError
+        """
+        pass
+
+    async def delete(self, job_uuid: uuid.UUID):
+        pass
+
+
+class IPublishJobQueue(Protocol):
+    async def enqueue(self, job_uuid: uuid.UUID):
+        """raise PublishJobQueueError"""
+        pass
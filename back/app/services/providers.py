@@ -5,8 +5,10 @@ from dishka import FromComponent, Provider, Scope, from_context, provide
 
 from app.domain.ports import (
     IAuthService,
+    ICatalogImportService,
     IMarketplaceAccountService,
     IMarketplaceOAuthService,
+    IPublishJobService,
     IRegistrationService,
     ISearchService,
     ISellingService,
@@ -14,9 +16,11 @@ from app.domain.ports import (
 
 from . import ports
 from .auth import AuthService
+from .catalog_import import CatalogImportService
 from .common import MarketplaceTokenManager
 from .marketplace_account import MarketplaceAccountService
 from .marketplace_oauth import MarketplaceOAuthService
+from .publish_jobs import PublishJobService
 from .search import SearchService
 from .selling import SellingService
 
@@ -26,8 +30,14 @@ class TokenUpdateSettings:
     token_ttl_threshold: int
 
 
+@dataclass
+class SearchSettings:
+    pipelined: bool
+
+
 class ServicesProvider(Provider):
     token_update_settings = from_context(TokenUpdateSettings, scope=Scope.APP)
+    search_settings = from_context(SearchSettings, scope=Scope.APP)
 
     @provide(scope=Scope.REQUEST)
     def token_maneger(
@@ -44,9 +54,22 @@ class ServicesProvider(Provider):
             token_ttl_threshold=settings.token_ttl_threshold,
         )
 
-    search_service = provide(
-        SearchService, provides=ISearchService, scope=Scope.REQUEST
-    )
+    @provide(scope=Scope.REQUEST)
+    def search_service(
+        self,
+        search: ports.ISearchEngine,
+        api_factory: ports.IMarketplaceAPIFactory,
+        predictors_factory: ports.ICategoryPredictorFactory,
+        metadata_factory: ports.IMetadataFactory,
+        settings: SearchSettings,
+    ) -> ISearchService:
+        return SearchService(
+            search=search,
+            api_factory=api_factory,
+            predictors_factory=predictors_factory,
+            metadata_factory=metadata_factory,
+            pipelined=settings.pipelined,
+        )
 
     account_service = provide(
         MarketplaceAccountService,
@@ -56,6 +79,15 @@ class ServicesProvider(Provider):
     selling_service = provide(
         SellingService, provides=ISellingService, scope=Scope.REQUEST
     )
+    publish_job_service = provide(
+        PublishJobService, provides=IPublishJobService, scope=Scope.REQUEST
+    )
+
+    @provide(scope=Scope.REQUEST)
+    def catalog_import_service(
+        self, searcher: ISearchService, seller: ISellingService
+    ) -> ICatalogImportService:
+        return CatalogImportService(searcher=searcher, seller=seller)
 
     auth_service = provide(AuthService, scope=Scope.REQUEST)
 
@@ -0,0 +1,137 @@
+import uuid
+from dataclasses import asdict, dataclass
+
+from app.domain.dto import ItemDTO, MarketplaceAccountDTO, PublishJobDTO
+from app.domain.entities import PublishJob, PublishJobStatus
+from app.domain.ports import (
+    ISellingService,
+    MarketplaceAuthorizationFailed,
+    PublishJobNotFound,
+    PublishJobServiceError,
+    SellingServiceError,
+)
+from app.logger import logger
+
+from .ports import (
+    IPublishImageStorage,
+    IPublishJobQueue,
+    IPublishJobRepository,
+    PublishImageStorageError,
+    PublishJobQueueError,
+    PublishJobRepositoryError,
+)
+from .selling import DEFAULT_ERROR_CODE, publish_error_code
+
+
+@dataclass
+class PublishJobService:
+    """Publishes items in background workers.
+
+    ``submit`` only stores the item and its images and enqueues the job,
+    workers call ``run`` which goes through ``ISellingService.publish``.
+    """
+
+    job_repository: IPublishJobRepository
+    image_storage: IPublishImageStorage
+    job_queue: IPublishJobQueue
+    seller: ISellingService
+
+    async def submit(
+        self, item_data: ItemDTO, account: MarketplaceAccountDTO, *images: str
+    ) -> uuid.UUID:
+        job_uuid = uuid.uuid4()
+        added = False
+        try:
+            stored_images = await self.image_storage.save(job_uuid, *images)
+            await self.job_repository.add(
+                PublishJob(
+                    uuid=job_uuid,
+                    user_uuid=account.user_uuid,
+                    marketplace=account.marketplace,
+                    item=asdict(item_data),
+                    images=stored_images,
+                )
+            )
+            added = True
+            await self.job_queue.enqueue(job_uuid)
+
+        except (
+            PublishImageStorageError,
+            PublishJobRepositoryError,
+            PublishJobQueueError,
+        ) as e:
+            await self.image_storage.delete(job_uuid)
+            if added:
+                await self._mark_failed(job_uuid)
+            raise PublishJobServiceError() from e
+
+        return job_uuid
+
+    async def status(
+        self, job_uuid: uuid.UUID, account: MarketplaceAccountDTO
+    ) -> PublishJobDTO:
+        try:
+            job = await self.job_repository.get(job_uuid)
+        except PublishJobRepositoryError as e:
+            raise PublishJobServiceError() from e
+
+        if (
+            job is None
+            or job.user_uuid != account.user_uuid
+            or job.marketplace != account.marketplace
+        ):
+            raise PublishJobNotFound()
+
+        return PublishJobDTO(job_uuid=job.uuid, status=job.status, error=job.error)
+
+    async def run(self, job_uuid: uuid.UUID):
+        try:
+            # the queue delivers at least once, publishing twice would
+            # create a duplicate listing, so only the delivery that moves
+            # the job out of pending publishes it
+            if not await self.job_repository.claim(job_uuid):
+                logger.warning(f"Skipping publish job {job_uuid}: not pending")
+                return
+
+            job = await self.job_repository.get(job_uuid)
+        except PublishJobRepositoryError as e:
+            raise PublishJobServiceError() from e
+
+        if job is None:
+            logger.warning(f"Skipping publish job {job_uuid}: not found")
+            return
+
+        try:
+            await self.seller.publish(
+                ItemDTO(**job.item),
+                MarketplaceAccountDTO(
+                    user_uuid=job.user_uuid, marketplace=job.marketplace
+                ),
+                *job.images,
+            )
+        except (SellingServiceError, MarketplaceAuthorizationFailed) as e:
+            logger.info(f"Publish job {job_uuid} failed: {e!r}")
+            await self._finish(job_uuid, PublishJobStatus.FAILED, publish_error_code(e))
+        except Exception:
+            await self._finish(job_uuid, PublishJobStatus.FAILED, DEFAULT_ERROR_CODE)
+            raise
+        else:
+            await self._finish(job_uuid, PublishJobStatus.SUCCEEDED)
+
+    async def _mark_failed(self, job_uuid: uuid.UUID):
+        """Keep a job that never reached the queue from staying pending"""
+        try:
+            await self.job_repository.set_status(
+                job_uuid, PublishJobStatus.FAILED, DEFAULT_ERROR_CODE
+            )
+        except PublishJobRepositoryError as e:
+            logger.warning(f"Failed to mark publish job {job_uuid} failed: {e!r}")
+
+    async def _finish(
+        self, job_uuid: uuid.UUID, status: PublishJobStatus, error: str | None = None
+    ):
+        await self.image_storage.delete(job_uuid)
+        try:
+            await self.job_repository.set_status(job_uuid, status, error)
+        except PublishJobRepositoryError as e:
+            raise PublishJobServiceError() from e
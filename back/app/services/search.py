@@ -1,9 +1,22 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import aclosing
 from dataclasses import dataclass
 
-from app.domain.dto import ProductCategoriesDTO, ProductDTO
-from app.domain.entities import ProductStructure
+from app.domain.dto import (
+    AspectsSkeletonDTO,
+    AspectValueDTO,
+    ProductCategoriesDTO,
+    ProductDTO,
+    ProductMetadataDTO,
+    ProductPartDTO,
+    ProductQueryDTO,
+    ProductSearchResultDTO,
+)
+from app.domain.entities import AspectValue, Product, ProductStructure
 from app.domain.ports import (
     ProductCategoriesNotFound,
+    SearchServiceBusy,
     SearchServiceError,
 )
 
@@ -12,7 +25,10 @@ from .ports import (
     CategoriesNotFoundError,
     ICategoryPredictorFactory,
     IMarketplaceAPIFactory,
+    IMetadataFactory,
     ISearchEngine,
+    ProductQuery,
+    SearchEngineBusyError,
     SearchEngineError,
 )
 
@@ -22,8 +38,12 @@ class SearchService:
     search: ISearchEngine
     api_factory: IMarketplaceAPIFactory
     predictors_factory: ICategoryPredictorFactory
+    metadata_factory: IMetadataFactory
+    pipelined: bool = False
+    """Search the metadata while the aspects of the category are fetched,
+    and the aspects with a separate request"""
 
-    def product_aspects(
+    async def product_aspects(
         self,
         product_name: str,
         category: str,
@@ -31,29 +51,160 @@ class SearchService:
         marketplace,
         **settings: dict,
     ) -> ProductDTO:
+        if self.pipelined:
+            return await self._pipelined_product_aspects(
+                product_name, category, comment, marketplace, **settings
+            )
+
         try:
             marketplace_api = self.api_factory.get(marketplace)
-            aspects = marketplace_api.get_product_aspects(category, **settings)
+            aspects = await marketplace_api.get_product_aspects(category, **settings)
 
-            product = self.search.by_product_name(
-                product_name, ProductStructure(aspects), comment
+            product = await self.search.by_product_name(
+                self.metadata_factory.get(marketplace),
+                product_name,
+                comment,
+                ProductStructure(aspects),
             )
             return FromEntity.product_dto(product)
 
         except SearchEngineError as e:
             raise SearchServiceError() from e
 
-    def recognize_product(
+    async def _pipelined_product_aspects(
+        self,
+        product_name: str,
+        category: str,
+        comment: str,
+        marketplace,
+        **settings: dict,
+    ) -> ProductDTO:
+        async def search_aspects() -> list[AspectValue]:
+            marketplace_api = self.api_factory.get(marketplace)
+            aspects = await marketplace_api.get_product_aspects(category, **settings)
+
+            return await self.search.aspects_by_product_name(
+                product_name, comment, ProductStructure(aspects)
+            )
+
+        tasks = [
+            asyncio.create_task(
+                self.search.metadata_by_product_name(
+                    self.metadata_factory.get(marketplace), product_name, comment
+                )
+            ),
+            asyncio.create_task(search_aspects()),
+        ]
+        try:
+            metadata, aspect_values = await asyncio.gather(*tasks)
+
+        except SearchEngineError as e:
+            raise SearchServiceError() from e
+
+        finally:
+            # the other request is not needed once one of them failed
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return FromEntity.product_dto(Product(metadata=metadata, aspects=aspect_values))
+
+    async def products_aspects(
+        self,
+        queries: list[ProductQueryDTO],
+        category: str,
+        marketplace,
+        **settings: dict,
+    ) -> list[ProductSearchResultDTO]:
+        try:
+            marketplace_api = self.api_factory.get(marketplace)
+            aspects = await marketplace_api.get_product_aspects(category, **settings)
+
+            results = await self.search.by_product_names(
+                self.metadata_factory.get(marketplace),
+                [ProductQuery(q.product_name, q.comment) for q in queries],
+                ProductStructure(aspects),
+            )
+        except SearchEngineError as e:
+            raise SearchServiceError() from e
+
+        return [
+            ProductSearchResultDTO(product=FromEntity.product_dto(result.product))
+            if result.error is None
+            else ProductSearchResultDTO(error=str(result.error) or None)
+            for result in results
+        ]
+
+    async def stream_product_aspects(
+        self,
+        product_name: str,
+        category: str,
+        comment: str,
+        marketplace,
+        **settings: dict,
+    ) -> AsyncIterator[ProductPartDTO]:
+        try:
+            marketplace_api = self.api_factory.get(marketplace)
+            aspects = await marketplace_api.get_product_aspects(category, **settings)
+
+            yield AspectsSkeletonDTO(
+                aspects=[
+                    AspectValueDTO(name=a.name, value=None, is_required=a.is_required)
+                    for a in aspects
+                ]
+            )
+
+            parts = self.search.stream_by_product_name(
+                self.metadata_factory.get(marketplace),
+                product_name,
+                comment,
+                ProductStructure(aspects),
+            )
+            async with aclosing(parts):
+                async for part in parts:
+                    if isinstance(part, AspectValue):
+                        yield AspectValueDTO(
+                            name=part.name,
+                            value=part.value,
+                            is_required=part.is_required,
+                        )
+                    else:
+                        yield ProductMetadataDTO(metadata=part.asdict())
+
+        except SearchEngineError as e:
+            raise SearchServiceError() from e
+
+    async def recognize_product(
         self, img_path: str, marketplace: str, **settings: dict
     ) -> ProductCategoriesDTO:
-        barecodes = self.search.barecodes_on_image(img_path)
+        try:
+            barecodes = await self.search.barecodes_on_image(img_path)
+        except SearchEngineBusyError as e:
+            raise SearchServiceBusy() from e
+        except SearchEngineError as e:
+            raise SearchServiceError() from e
+
         if len(barecodes) != 1:
             raise SearchServiceError("Image must contain exactly one barcode")
 
+        return await self.recognize_barcode(barecodes[0], marketplace, **settings)
+
+    async def recognize_barcode(
+        self, barcode: str, marketplace: str, **settings: dict
+    ) -> ProductCategoriesDTO:
+        try:
+            product_name = await self.search.product_name_by_barecode(barcode)
+        except SearchEngineError as e:
+            raise SearchServiceError() from e
+
+        return await self.product_categories(product_name, marketplace, **settings)
+
+    async def product_categories(
+        self, product_name: str, marketplace: str, **settings: dict
+    ) -> ProductCategoriesDTO:
         try:
             category_predictor = self.predictors_factory.get(marketplace)
-            product_name = self.search.product_name_by_barecode(barecodes[0])
-            categories = category_predictor.predict(product_name, **settings)
+            categories = await category_predictor.predict(product_name, **settings)
 
             return ProductCategoriesDTO(product_name, categories)
 
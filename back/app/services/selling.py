@@ -1,6 +1,12 @@
+import asyncio
 from dataclasses import asdict, dataclass
 
-from app.domain.dto import ItemDTO, MarketplaceAccountDTO
+from app.domain.dto import (
+    BatchItemDTO,
+    ItemDTO,
+    MarketplaceAccountDTO,
+    PublishResultDTO,
+)
 from app.domain.entities import (
     AspectValue,
     Item,
@@ -21,12 +27,31 @@ from .common import MarketplaceTokenManager
 from .mapping import FromDTO
 from .ports import (
     AccountSettingsNotFound,
+    CategoriesNotFoundError,
     CategoryNotFound,
     IMarketplaceAPIFactory,
     IMarketplaceAspectsFactory,
     MarketplaceAPIError,
+    PublishResult,
 )
 
+_ERROR_CODES = {
+    InvalidCategory: "invalid_category",
+    InvalidMarketplaceAspects: "invalid_marketplace_aspects",
+    InvalidProductAspects: "invalid_product_aspects",
+    MarketplaceAuthorizationFailed: "marketplace_unauthorised",
+}
+
+DEFAULT_ERROR_CODE = "publish_failed"
+
+
+def publish_error_code(e: Exception) -> str:
+    """Code of a publish error reported to clients"""
+    for cls in type(e).__mro__:
+        if cls in _ERROR_CODES:
+            return _ERROR_CODES[cls]
+    return DEFAULT_ERROR_CODE
+
 
 @dataclass
 class SellingService:
@@ -35,30 +60,13 @@ class SellingService:
     type_factory: IMarketplaceAspectsFactory
 
     async def publish(self, dto: ItemDTO, account: MarketplaceAccountDTO, *images: str):
-        item_data = asdict(dto)
-        markeplace_aspects_type = self.type_factory.get(account.marketplace)
-        marketplace_aspects = markeplace_aspects_type.validate(
-            item_data.pop("marketplace_aspects_data")
-        )
-        if marketplace_aspects is None:
-            raise InvalidMarketplaceAspects()
-
-        product_aspects = self._validate_product_structure(
-            item_data["category"],
-            item_data.pop("product_aspects"),
-            marketplace=account.marketplace,
-        )
+        item = await self._to_item(dto, account.marketplace)
         try:
-            item = Item(
-                **item_data,
-                marketplace_aspects=marketplace_aspects,
-                product_aspects=product_aspects,
-            )
-
-            token = await self.token_manager.access_token(FromDTO.account(account))
+            entity = FromDTO.account(account)
+            token = await self.token_manager.access_token(entity)
 
             marketplace_api = self.api_factory.get(account.marketplace)
-            marketplace_api.publish(item, token, *images)
+            await marketplace_api.publish(item, token, *images, account=entity)
 
         except AccountSettingsNotFound as e:
             raise InvalidMarketplaceAspects() from e
@@ -67,12 +75,101 @@ class SellingService:
         except MarketplaceAuthorizationFailed:
             raise
 
-    def _validate_product_structure(
-        self, category_name: str, aspects_data: dict[str], marketplace: str
+    async def validate(self, dto: ItemDTO, account: MarketplaceAccountDTO):
+        await self._to_item(dto, account.marketplace)
+
+    async def publish_batch(
+        self, items: list[BatchItemDTO], account: MarketplaceAccountDTO
+    ) -> list[PublishResultDTO]:
+        results: list[PublishResultDTO | None] = [None] * len(items)
+
+        converted = await asyncio.gather(
+            *(self._to_item(b.item, account.marketplace) for b in items),
+            return_exceptions=True,
+        )
+
+        batch, indexes = [], []
+        for i, (batch_item, item) in enumerate(zip(items, converted)):
+            if isinstance(item, SellingServiceError):
+                results[i] = self._failed(item)
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                batch.append((item, batch_item.images))
+                indexes.append(i)
+
+        if not batch:
+            return results
+
+        try:
+            entity = FromDTO.account(account)
+            token = await self.token_manager.access_token(entity)
+
+            marketplace_api = self.api_factory.get(account.marketplace)
+            published = await marketplace_api.publish_batch(
+                batch, token, account=entity
+            )
+
+        except MarketplaceAPIError as e:
+            raise SellingServiceError() from e
+        except MarketplaceAuthorizationFailed:
+            raise
+
+        for i, result in zip(indexes, published):
+            results[i] = self._to_result(result)
+        return results
+
+    @staticmethod
+    def _failed(e: Exception, message: str | None = None) -> PublishResultDTO:
+        return PublishResultDTO(
+            published=False, error=publish_error_code(e), message=message
+        )
+
+    @classmethod
+    def _to_result(cls, result: PublishResult) -> PublishResultDTO:
+        if result.error is None:
+            return PublishResultDTO(published=True, listing_id=result.listing_id)
+
+        message = str(result.error) or None
+        if isinstance(result.error, CategoryNotFound):
+            return cls._failed(InvalidCategory(), message)
+        if isinstance(result.error, AccountSettingsNotFound):
+            return cls._failed(InvalidMarketplaceAspects(), message)
+        return cls._failed(SellingServiceError(), message)
+
+    async def _to_item(self, dto: ItemDTO, marketplace: str) -> Item:
+        item_data = asdict(dto)
+        markeplace_aspects_type = self.type_factory.get(marketplace)
+        marketplace_aspects = markeplace_aspects_type.validate(
+            item_data.pop("marketplace_aspects_data")
+        )
+        if marketplace_aspects is None:
+            raise InvalidMarketplaceAspects()
+
+        product_aspects = await self._validate_product_structure(
+            item_data["category"],
+            item_data.pop("product_aspects"),
+            marketplace=marketplace,
+            marketplace_id=marketplace_aspects.marketplace,
+        )
+        return Item(
+            **item_data,
+            marketplace_aspects=marketplace_aspects,
+            product_aspects=product_aspects,
+        )
+
+    async def _validate_product_structure(
+        self,
+        category_name: str,
+        aspects_data: dict[str],
+        marketplace: str,
+        **marketplace_settings: dict,
     ) -> list[AspectValue]:
         try:
             marketplace_api = self.api_factory.get(marketplace)
-            fields = marketplace_api.get_product_aspects(category_name)
+            fields = await marketplace_api.get_product_aspects(
+                category_name, **marketplace_settings
+            )
 
             product_structure = ProductStructure(fields=fields)
             return product_structure.validate(aspects_data)
@@ -80,11 +177,13 @@ class SellingService:
         except (
             MarketplaceAPIError,
             CategoryNotFound,
+            CategoriesNotFoundError,
             AspectsValidationError,
         ) as e:
             error_mapping = {
                 MarketplaceAPIError: SellingServiceError(),
                 CategoryNotFound: InvalidCategory(),
+                CategoriesNotFoundError: InvalidCategory(),
                 AspectsValidationError: InvalidProductAspects(),
             }
             raise error_mapping[type(e)] from e
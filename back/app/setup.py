@@ -1,3 +1,4 @@
+from collections.abc import AsyncGenerator
 from datetime import timedelta
 
 from dishka import AsyncContainer, make_async_container
@@ -8,15 +9,19 @@ from passlib.hash import pbkdf2_sha256
 from app.api import AppBuilder
 from app.config import Config, DBConfig, EbayConfig, RedisConfig
 from app.infrastructure.providers import (
+    BarcodeDecoderSettings,
     EbayInfrastructureProvider,
     FactoriesProvider,
     InfrastructureProvider,
     JWTAuthSettings,
     OAuthStateAuthProvider,
     OAuthStateAuthSettings,
+    PublishJobsSettings,
     SearchEngineSettings,
 )
+from app.infrastructure.taxonomy import CategoryTreeRefresher
 from app.providers import (
+    CeleryProvider,
     DBProvider,
     EbayProvider,
     MarketplaceMappingsProvider,
@@ -28,6 +33,7 @@ from app.providers import (
 from app.repository.providers import RepositoryProvider
 from app.services.ports import IHasher
 from app.services.providers import (
+    SearchSettings,
     ServicesProvider,
     TokenUpdateSettings,
 )
@@ -37,8 +43,25 @@ def load_config() -> Config:
     return Config()
 
 
+async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    container: AsyncContainer = app.state.dishka_container
+
+    refresher = await container.get(CategoryTreeRefresher, component="ebay")
+    refresher.start()
+
+    yield
+
+    refresher.shutdown()
+    await container.close()
+
+
 def app(config: Config) -> FastAPI:
-    app = AppBuilder(root_path="/api").root_router().middlewares(config.secrets).app()
+    app = (
+        AppBuilder(root_path="/api", lifespan=lifespan)
+        .root_router()
+        .middlewares(config.secrets)
+        .app()
+    )
     return app
 
 
@@ -46,6 +69,7 @@ def container(config: Config) -> AsyncContainer:
     providers = [
         DBProvider(),
         RedisProvider(),
+        CeleryProvider(),
         OAuthProvider(),
         EbayProvider(),
         MarketplaceMappingsProvider(),
@@ -68,12 +92,27 @@ def container(config: Config) -> AsyncContainer:
         SearchEngineSettings: SearchEngineSettings(
             barcode_search_token=config.tokens.barcode_search_token,
             perplexity_model=ext_services.perplexity.model,
+            cache_ttl=timedelta(hours=ext_services.perplexity.cache_ttl_hours),
+            request_timeout=ext_services.perplexity.request_timeout_seconds,
+            batch_size=ext_services.perplexity.batch_size,
+            batch_attempts=ext_services.perplexity.batch_attempts,
+        ),
+        SearchSettings: SearchSettings(
+            pipelined=ext_services.perplexity.pipelined_lookup
+        ),
+        BarcodeDecoderSettings: BarcodeDecoderSettings(
+            workers=config.recognition.workers,
+            queue_size=config.recognition.queue_size,
+            stats_log_interval=config.recognition.stats_log_interval_seconds,
         ),
         TokenUpdateSettings: TokenUpdateSettings(
             token_ttl_threshold=timedelta(hours=1, minutes=40).total_seconds()
         ),
         OAuthStateAuthSettings: OAuthStateAuthSettings(5, "HS256", config.secrets.jwt),
         JWTAuthSettings: JWTAuthSettings(20, "HS256", config.secrets.jwt),
+        PublishJobsSettings: PublishJobsSettings(
+            images_dir=config.publish_jobs.images_dir
+        ),
         IHasher: pbkdf2_sha256,
     }
     return make_async_container(*providers, context=context)
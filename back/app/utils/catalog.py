@@ -0,0 +1,70 @@
+import asyncio
+import csv
+import json
+import os
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import asdict
+
+from app.domain.dto import ImportResultDTO
+
+IMAGES_SEPARATOR = ";"
+
+
+def _csv_rows(file) -> Iterator[tuple[int, dict[str]]]:
+    reader = csv.DictReader(file)
+    for row in reader:
+        images = row.get("images") or ""
+        row["images"] = [
+            name.strip() for name in images.split(IMAGES_SEPARATOR) if name.strip()
+        ]
+        yield reader.line_num, row
+
+
+def _jsonl_rows(file) -> Iterator[tuple[int, dict[str]]]:
+    for line_num, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            row = None
+        # invalid rows are reported by the import instead of stopping it
+        yield line_num, row if isinstance(row, dict) else {}
+
+
+async def read_catalog(
+    path: str, images_dir: str | None = None
+) -> AsyncIterator[tuple[int, dict[str]]]:
+    """Reads a CSV or JSONL catalog row by row without loading the whole file.
+
+    Image names of the rows are resolved relative to ``images_dir``.
+    """
+    _, ext = os.path.splitext(path)
+    rows_of = _jsonl_rows if ext.lower() in (".jsonl", ".ndjson") else _csv_rows
+
+    file = await asyncio.to_thread(open, path, encoding="utf-8", newline="")
+    try:
+        rows = rows_of(file)
+        while (row := await asyncio.to_thread(next, rows, None)) is not None:
+            line_num, data = row
+            images = data.get("images")
+            if images_dir is not None and isinstance(images, list):
+                data["images"] = [
+                    os.path.join(images_dir, os.path.basename(str(name)))
+                    for name in images
+                ]
+            yield line_num, data
+    finally:
+        await asyncio.to_thread(file.close)
+
+
+def report_line(result: ImportResultDTO) -> str:
+    """Formats an import result as a line of the JSONL report"""
+    data = asdict(result)
+    data["status"] = "published" if data.pop("published") else "failed"
+    return json.dumps(data, ensure_ascii=False) + "\n"
+
+
+def error_line(message: str) -> str:
+    """Formats an error that stopped the import as the last report line"""
+    return json.dumps({"status": "aborted", "message": message}) + "\n"
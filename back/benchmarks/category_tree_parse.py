@@ -0,0 +1,136 @@
+"""Compare peak memory and time of category tree parsers.
+
+Run from the ``back`` directory:
+
+    python -m benchmarks.category_tree_parse [--file tree.json.gz] [--nodes N]
+
+``--file`` takes a gzip getCategoryTree response saved from the API,
+otherwise a synthetic tree with about ``--nodes`` categories is generated.
+Every parser runs in a fresh process and reports the peak traced allocation
+and the growth of the peak RSS caused by parsing.
+"""
+
+import argparse
+import gzip
+import io
+import json
+import multiprocessing
+import os
+import random
+import resource
+import tempfile
+import time
+import tracemalloc
+
+from app.infrastructure.api_clients.ebay.models import CategoryTree
+from app.infrastructure.api_clients.ebay.streaming import parse_category_tree
+
+
+def generate_tree(nodes: int, seed: int = 0) -> dict:
+    rnd = random.Random(seed)
+    counter = 0
+
+    def make_node(level: int, budget: int) -> dict:
+        nonlocal counter
+        counter += 1
+        node = {
+            "category": {
+                "categoryId": str(counter),
+                "categoryName": f"Category {counter} {rnd.random():.6f}",
+            },
+            "categoryTreeNodeLevel": level,
+            "parentCategoryTreeNodeHref": "https://api.ebay.com/commerce/taxonomy",
+        }
+        if budget <= 1 or level >= 6:
+            node["leafCategoryTreeNode"] = True
+            return node
+
+        width = rnd.randint(2, 12)
+        share = (budget - 1) // width
+        node["childCategoryTreeNodes"] = [
+            make_node(level + 1, share) for _ in range(width) if share > 0
+        ]
+        if not node["childCategoryTreeNodes"]:
+            del node["childCategoryTreeNodes"]
+            node["leafCategoryTreeNode"] = True
+        return node
+
+    return {
+        "applicableMarketplaceIds": ["EBAY_US"],
+        "categoryTreeId": "0",
+        "categoryTreeVersion": "1",
+        "rootCategoryNode": make_node(0, nodes),
+    }
+
+
+def parse_model(path: str) -> int:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        tree = CategoryTree.model_validate(json.load(f))
+
+    count = 0
+    stack = [tree.root_category_node]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.child_category_tree_nodes)
+    return count - 1
+
+
+def parse_table(path: str) -> int:
+    with gzip.open(path, "rb") as f:
+        table = parse_category_tree(io.TextIOWrapper(f, encoding="utf-8"))
+    return len(table)
+
+
+PARSERS = {"pydantic model": parse_model, "streaming table": parse_table}
+
+
+def measure(name: str, path: str, queue: multiprocessing.Queue):
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    started = time.perf_counter()
+
+    count = PARSERS[name](path)
+
+    elapsed = time.perf_counter() - started
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((count, elapsed, traced_peak, (rss_after - rss_before) * 1024))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--file", help="gzip getCategoryTree response")
+    parser.add_argument("--nodes", type=int, default=20000)
+    args = parser.parse_args()
+
+    path = args.file
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix=".json.gz")
+        with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+            json.dump(generate_tree(args.nodes), f)
+
+    try:
+        context = multiprocessing.get_context("spawn")
+        print(
+            f"{'parser':<18}{'nodes':>8}{'time, s':>10}"
+            f"{'alloc, MB':>12}{'+RSS, MB':>10}"
+        )
+        for name in PARSERS:
+            queue = context.Queue()
+            process = context.Process(target=measure, args=(name, path, queue))
+            process.start()
+            count, elapsed, traced, rss = queue.get()
+            process.join()
+            print(
+                f"{name:<18}{count:>8}{elapsed:>10.3f}"
+                f"{traced / 2**20:>12.1f}{rss / 2**20:>10.1f}"
+            )
+    finally:
+        if args.file is None:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
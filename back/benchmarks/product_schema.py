@@ -0,0 +1,80 @@
+"""Compare building product schemas and validators per call with the caches.
+
+Run from the ``back`` directory:
+
+    python -m benchmarks.product_schema [--aspects N] [--categories N] [--calls N]
+
+Every call takes the aspects of one of ``--categories`` categories, as the
+``/aspects`` requests do, builds the JSON schema of the product and validates
+an answer against it.
+"""
+
+import argparse
+import time
+
+from pydantic import TypeAdapter
+
+from app.domain.entities import AspectField, AspectType, ProductStructure
+from app.infrastructure.adapter import ProductAdapter
+from app.infrastructure.metadata import EbayMetadata
+
+ANSWER_METADATA = {
+    "description": "Product description",
+    "package": {"weight": {"unit": "KILOGRAM", "value": 0.5}},
+}
+
+
+def generate_categories(categories: int, aspects: int) -> list[ProductStructure]:
+    types = list(AspectType)
+    return [
+        ProductStructure(
+            fields=[
+                AspectField(
+                    name=f"Aspect {c}-{i}",
+                    data_type=types[i % len(types)],
+                    is_required=i % 3 == 0,
+                    allowed_values=frozenset(
+                        f"Value {j}" for j in range(10 if i % 4 == 0 else 0)
+                    ),
+                )
+                for i in range(aspects)
+            ]
+        )
+        for c in range(categories)
+    ]
+
+
+def uncached(structure: ProductStructure) -> EbayMetadata:
+    ProductAdapter._build_schema(EbayMetadata, tuple(structure.fields), False)
+    return TypeAdapter(EbayMetadata).validate_python(ANSWER_METADATA)
+
+
+def cached(structure: ProductStructure) -> EbayMetadata:
+    adapter = ProductAdapter(metadata_type=EbayMetadata)
+    adapter.to_schema(structure.fields)
+    return adapter.to_product({"metadata": ANSWER_METADATA}, ProductStructure([]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--aspects", type=int, default=40)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    categories = generate_categories(args.categories, args.aspects)
+
+    print(f"{'variant':<10}{'calls':>8}{'time, s':>10}{'per call, us':>15}")
+    for name, func in (("uncached", uncached), ("cached", cached)):
+        started = time.perf_counter()
+        for i in range(args.calls):
+            func(categories[i % len(categories)])
+        elapsed = time.perf_counter() - started
+        print(
+            f"{name:<10}{args.calls:>8}{elapsed:>10.3f}"
+            f"{elapsed / args.calls * 1e6:>15.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+from uuid import UUID
+
+from dishka import AsyncContainer
+
+from app.domain.ports import IPublishJobService
+from app.infrastructure.publish_jobs import PUBLISH_JOB_TASK
+
+from .worker import celery, run
+
+
+@celery.task(name=PUBLISH_JOB_TASK)
+def publish_item(job_uuid: str):
+    async def publish(container: AsyncContainer):
+        jobs = await container.get(IPublishJobService)
+        await jobs.run(UUID(job_uuid))
+
+    run(publish)
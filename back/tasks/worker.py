@@ -0,0 +1,54 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from celery import Celery
+from celery.signals import worker_process_shutdown, worker_shutdown
+from dishka import AsyncContainer
+
+from app import setup
+from app.config import RedisConfig
+
+celery = Celery("tasks", broker=RedisConfig().get_url(), include=["tasks.publish"])
+celery.conf.update(task_ignore_result=True, worker_prefetch_multiplier=1)
+
+
+class _WorkerContext:
+    """Event loop and DI container of a worker process.
+
+    Both are created on the first task so that they belong to the child
+    process rather than the parent of the prefork pool.
+    """
+
+    def __init__(self):
+        self._runner = asyncio.Runner()
+        self._container: AsyncContainer | None = None
+
+    def run[T](self, func: Callable[[AsyncContainer], Awaitable[T]]) -> T:
+        async def call() -> T:
+            if self._container is None:
+                self._container = setup.container(setup.load_config())
+
+            async with self._container() as request_container:
+                return await func(request_container)
+
+        return self._runner.run(call())
+
+    def close(self):
+        if self._container is not None:
+            self._runner.run(self._container.close())
+            self._container = None
+        self._runner.close()
+
+
+_context = _WorkerContext()
+
+
+def run[T](func: Callable[[AsyncContainer], Awaitable[T]]) -> T:
+    """Run ``func`` with a request scoped container on the worker loop"""
+    return _context.run(func)
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _close_context(**kwargs):
+    _context.close()
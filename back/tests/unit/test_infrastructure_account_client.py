@@ -0,0 +1,97 @@
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import Mock
+
+import pytest
+
+from app.infrastructure.api_clients.ebay import (
+    EbayAccountClient,
+    EbayAccountClientError,
+)
+from app.infrastructure.api_clients.ebay.models import MarketplaceIdEnum
+
+
+class FakeResponse:
+    def __init__(self, data, status=200):
+        self.data = data
+        self.status = status
+        self.ok = status < 400
+        self.request_info = Mock()
+        self.history = ()
+        self.headers = {}
+
+    async def json(self):
+        return self.data
+
+    async def text(self):
+        return str(self.data)
+
+
+class FakeSession:
+    def __init__(self, status=200):
+        self.status = status
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @asynccontextmanager
+    async def get(self, url, params, headers):
+        policy_type = url.rsplit("/", 1)[-1].removesuffix("_policy")
+        marketplace_id = params["marketplace_id"]
+        self.requests.append((policy_type, marketplace_id))
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+
+        policy = {
+            f"{policy_type}PolicyId": f"{policy_type}_{marketplace_id}",
+            "name": f"{policy_type} {marketplace_id}",
+            "categoryTypes": [{"name": "ALL_EXCLUDING_MOTORS_VEHICLES"}],
+        }
+        yield FakeResponse({f"{policy_type}Policies": [policy]}, self.status)
+
+
+def make_client(session):
+    return EbayAccountClient("api.ebay.com", Mock(), session)
+
+
+class TestGetAllPolicies:
+    @pytest.mark.asyncio
+    async def test_fans_out_with_concurrency_cap(self):
+        session = FakeSession()
+
+        policies = await make_client(session).get_all_policies("token", concurrency=5)
+
+        assert len(session.requests) == 3 * len(MarketplaceIdEnum)
+        assert session.max_in_flight == 5
+        assert len(policies["payment_policies"]) == len(MarketplaceIdEnum)
+        assert [p["marketplace_id"] for p in policies["return_policies"]] == list(
+            MarketplaceIdEnum
+        )
+
+    @pytest.mark.asyncio
+    async def test_restricted_to_marketplaces(self):
+        session = FakeSession()
+
+        policies = await make_client(session).get_all_policies("token", ["EBAY_US"])
+
+        assert sorted(session.requests) == [
+            ("fulfillment", "EBAY_US"),
+            ("payment", "EBAY_US"),
+            ("return", "EBAY_US"),
+        ]
+        assert policies["fulfillment_policies"][0]["id"] == "fulfillment_EBAY_US"
+        assert policies["fulfillment_policies"][0]["category_types"] == [
+            "ALL_EXCLUDING_MOTORS_VEHICLES"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_http_error(self):
+        with pytest.raises(EbayAccountClientError) as exc_info:
+            await make_client(FakeSession(status=500)).get_all_policies(
+                "token", ["EBAY_US"]
+            )
+
+        assert exc_info.value.status == 500
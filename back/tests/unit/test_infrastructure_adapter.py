@@ -196,6 +196,79 @@ class TestProductAdapterToSchema:
         assert schema["required"] is not None
         assert "additionalProperties" in schema
 
+    def test_to_schema_requires_both_parts(self):
+        schema = ProductAdapter(metadata_type=MockMetadata).to_schema([])
+
+        assert schema["required"] == ["aspects", "metadata"]
+
+    def test_partial_schemas(self, product_structure):
+        adapter = ProductAdapter(metadata_type=MockMetadata)
+
+        metadata_schema = adapter.to_metadata_schema()
+        aspects_schema = ProductAdapter.to_aspects_schema(product_structure.fields)
+
+        assert metadata_schema["required"] == ["metadata"]
+        assert "Aspects" not in metadata_schema["$defs"]
+        assert aspects_schema["required"] == ["aspects"]
+        assert list(aspects_schema["$defs"]) == ["Aspects"]
+
+    def test_partial_answers(self, product_structure, valid_raw_data):
+        adapter = ProductAdapter(metadata_type=MockMetadata)
+
+        metadata = adapter.to_metadata(valid_raw_data)
+        aspects = ProductAdapter.to_aspects(valid_raw_data, product_structure)
+
+        assert metadata.title == "iPhone 13"
+        assert {a.name: a.value for a in aspects}["brand"] == "Apple"
+        with pytest.raises(InvalidMetadataError):
+            adapter.to_metadata({"aspects": valid_raw_data["aspects"]})
+
+
+class TestProductAdapterSchemaCache:
+    def test_schema_is_built_once_per_structure(self, product_structure):
+        first = ProductAdapter(metadata_type=MockMetadata).to_schema(
+            product_structure.fields
+        )
+        second = ProductAdapter(metadata_type=MockMetadata).to_schema(
+            list(product_structure.fields)
+        )
+
+        assert first is second
+
+    def test_schema_depends_on_aspects(self, product_structure):
+        adapter = ProductAdapter(metadata_type=MockMetadata)
+        other = [
+            AspectField(
+                name="brand",
+                data_type=AspectType.STR,
+                is_required=True,
+                allowed_values=frozenset({"Apple"}),
+            )
+        ]
+
+        schema = adapter.to_schema(product_structure.fields)
+
+        assert adapter.to_schema(other) is not schema
+        assert adapter.to_schema(other)["$defs"]["Aspects"]["$defs"]["brand"] == {
+            "type": "string",
+            "enum": ["Apple"],
+        }
+        assert (
+            adapter.to_schema(product_structure.fields, allow_additional_aspects=True)
+            is not schema
+        )
+
+    def test_schema_depends_on_metadata_type(self, product_structure):
+        @dataclass
+        class OtherMetadata:
+            title: str
+
+        schema = ProductAdapter(metadata_type=MockMetadata).to_schema([])
+        other = ProductAdapter(metadata_type=OtherMetadata).to_schema([])
+
+        assert "price" in schema["$defs"]["Metadata"]["properties"]
+        assert "price" not in other["$defs"]["Metadata"]["properties"]
+
 
 class TestProductAdapterAspectsSchema:
     def test_build_aspects_schema_with_different_types(self):
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.infrastructure.barcode_decoder import BarcodeDecoder, BarcodeDecoderBusyError
+from app.utils import recognition
+
+
+@pytest.fixture
+def executor():
+    executor = ThreadPoolExecutor(max_workers=1)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+@pytest.fixture
+def release():
+    return threading.Event()
+
+
+@pytest.fixture
+def blocking_decode(monkeypatch, release):
+    def extract_barcodes(img_path):
+        release.wait(1)
+        return [img_path]
+
+    monkeypatch.setattr(recognition, "extract_barcodes", extract_barcodes)
+
+
+class TestBarcodeDecoder:
+    @pytest.mark.asyncio
+    async def test_decode_records_stats(self, monkeypatch, executor):
+        monkeypatch.setattr(recognition, "extract_barcodes", lambda path: ["123"])
+        decoder = BarcodeDecoder(workers=1, queue_size=1, executor=executor)
+
+        assert await decoder.decode("image.jpg") == ["123"]
+        assert decoder.stats.decoded == 1
+        assert decoder.stats.decode_seconds >= 0
+        assert decoder.stats.queue_wait_seconds >= 0
+        assert decoder.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_is_full(self, executor, release, blocking_decode):
+        decoder = BarcodeDecoder(workers=1, queue_size=1, executor=executor)
+
+        first = asyncio.ensure_future(decoder.decode("first.jpg"))
+        second = asyncio.ensure_future(decoder.decode("second.jpg"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(BarcodeDecoderBusyError):
+            await decoder.decode("third.jpg")
+
+        release.set()
+        assert await asyncio.gather(first, second) == [["first.jpg"], ["second.jpg"]]
+        assert decoder.stats.rejected == 1
+        assert decoder.stats.decoded == 2
+        assert decoder.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_call_holds_slot_until_decoded(
+        self, executor, release, blocking_decode
+    ):
+        decoder = BarcodeDecoder(workers=1, queue_size=0, executor=executor)
+
+        task = asyncio.ensure_future(decoder.decode("image.jpg"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        with pytest.raises(BarcodeDecoderBusyError):
+            await decoder.decode("other.jpg")
+
+        release.set()
+        executor.shutdown(wait=True)
+        assert decoder.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_logs_stats(self, monkeypatch, executor, caplog):
+        monkeypatch.setattr(recognition, "extract_barcodes", lambda path: ["123"])
+        decoder = BarcodeDecoder(
+            workers=1, queue_size=1, stats_log_interval=0, executor=executor
+        )
+
+        with caplog.at_level(logging.INFO, logger="app"):
+            await decoder.decode("image.jpg")
+
+        assert "1 decoded" in caplog.text
+        assert "avg queue wait" in caplog.text
+        assert "avg decode" in caplog.text
+
+    def test_default_pool_spawns_workers(self):
+        decoder = BarcodeDecoder(workers=1)
+
+        assert decoder._executor._mp_context.get_start_method() == "spawn"
+        decoder.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_decode(self, monkeypatch, executor):
+        def extract_barcodes(img_path):
+            raise ValueError("Unreadable image")
+
+        monkeypatch.setattr(recognition, "extract_barcodes", extract_barcodes)
+        decoder = BarcodeDecoder(workers=1, queue_size=1, executor=executor)
+
+        with pytest.raises(ValueError):
+            await decoder.decode("image.jpg")
+        assert decoder.stats.failed == 1
+        assert decoder.pending == 0
@@ -0,0 +1,152 @@
+import gzip
+import io
+import json
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.infrastructure.api_clients.ebay.streaming import iter_json_array
+from app.infrastructure.taxonomy import (
+    BulkAspectsIndex,
+    BulkAspectsStore,
+    ItemAspectsCache,
+)
+
+ASPECT = {
+    "localizedAspectName": "Brand",
+    "aspectConstraint": {
+        "aspectDataType": "STRING",
+        "aspectEnabledForVariations": False,
+        "aspectMode": "FREE_TEXT",
+        "aspectRequired": True,
+        "aspectUsage": "RECOMMENDED",
+        "itemToAspectCardinality": "SINGLE",
+    },
+}
+
+
+def make_bulk_file(count: int = 3) -> bytes:
+    document = {
+        "categoryTreeId": "0",
+        "categoryTreeVersion": "119",
+        "categoryAspects": [
+            {
+                "category": {"categoryId": str(i), "categoryName": f"Category {i}"},
+                "aspects": [ASPECT],
+            }
+            for i in range(count)
+        ],
+    }
+    return gzip.compress(json.dumps(document, indent=2).encode())
+
+
+class TestIterJsonArray:
+    def test_yields_items_across_chunks(self):
+        document = json.dumps(
+            {"a": {"items": 1}, "items": [{"x": i} for i in range(50)]}
+        )
+
+        items = list(iter_json_array(io.StringIO(document), "items", chunk_size=7))
+
+        assert items == [{"x": i} for i in range(50)]
+
+    def test_empty_array(self):
+        assert list(iter_json_array(io.StringIO('{"items": [ ]}'), "items")) == []
+
+    def test_missing_key(self):
+        with pytest.raises(ValueError):
+            list(iter_json_array(io.StringIO('{"other": []}'), "items"))
+
+    def test_truncated_document(self):
+        with pytest.raises(ValueError):
+            list(iter_json_array(io.StringIO('{"items": [{"x": 1}, {"x"'), "items"))
+
+
+class TestBulkAspectsIndex:
+    def test_build_and_get(self, tmp_path):
+        index = BulkAspectsIndex.build(
+            str(tmp_path / "aspects.sqlite"), io.BytesIO(make_bulk_file())
+        )
+
+        metadata = index.get("2")
+
+        assert metadata.aspects[0].localized_aspect_name == "Brand"
+        assert index.get("404") is None
+
+
+class TestBulkAspectsStore:
+    @pytest.mark.asyncio
+    async def test_load_replaces_old_version(self, tmp_path):
+        api = AsyncMock()
+        api.fetch_item_aspects.side_effect = lambda tree_id, dest: dest.write(
+            make_bulk_file()
+        )
+        store = BulkAspectsStore(cache_dir=str(tmp_path))
+
+        await store.load("0", "118", api)
+        await store.load("0", "119", api)
+
+        assert store.get("0", "118") is None
+        assert store.get("0", "119").get("1") is not None
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "item_aspects_0_119.sqlite"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_load_keeps_temporary_files_of_other_loads(self, tmp_path):
+        api = AsyncMock()
+        api.fetch_item_aspects.side_effect = lambda tree_id, dest: dest.write(
+            make_bulk_file()
+        )
+        other = tmp_path / "item_aspects_0_119.sqliteabc123.tmp"
+        other.write_bytes(b"")
+
+        await BulkAspectsStore(cache_dir=str(tmp_path)).load("0", "119", api)
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "item_aspects_0_119.sqlite",
+            other.name,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_failed_load_removes_temporary_files(self, tmp_path):
+        api = AsyncMock()
+        api.fetch_item_aspects.side_effect = lambda tree_id, dest: dest.write(
+            b"not gzip"
+        )
+        store = BulkAspectsStore(cache_dir=str(tmp_path))
+
+        with pytest.raises(OSError):
+            await store.load("0", "119", api)
+
+        assert list(tmp_path.iterdir()) == []
+        assert store.get("0", "119") is None
+
+    @pytest.mark.asyncio
+    async def test_get_reopens_index_from_disk(self, tmp_path):
+        api = AsyncMock()
+        api.fetch_item_aspects.side_effect = lambda tree_id, dest: dest.write(
+            make_bulk_file()
+        )
+        await BulkAspectsStore(cache_dir=str(tmp_path)).load("0", "119", api)
+
+        store = BulkAspectsStore(cache_dir=str(tmp_path))
+
+        assert store.get("0", "119").get("0") is not None
+
+    @pytest.mark.asyncio
+    async def test_item_aspects_cache_uses_bulk_index(self, tmp_path):
+        api = AsyncMock()
+        api.fetch_item_aspects.side_effect = lambda tree_id, dest: dest.write(
+            make_bulk_file()
+        )
+        store = BulkAspectsStore(cache_dir=str(tmp_path))
+        await store.load("0", "119", api)
+        cache = ItemAspectsCache(ttl=timedelta(hours=1), maxsize=8, bulk=store)
+        fetch = AsyncMock()
+
+        aspects = await cache.get("0", "119", "1", fetch, Mock(return_value=[]))
+
+        assert aspects.metadata.aspects[0].localized_aspect_name == "Brand"
+        fetch.assert_not_called()
@@ -0,0 +1,68 @@
+import pytest
+
+from app.infrastructure.cache import TTLCache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def timer():
+    return FakeTimer()
+
+
+class TestTTLCache:
+    def test_get_missing_key(self):
+        cache = TTLCache()
+
+        assert cache.get("key") is None
+        assert cache.stats.misses == 1
+
+    def test_set_and_get(self):
+        cache = TTLCache()
+
+        cache.set("key", "value")
+
+        assert cache.get("key") == "value"
+        assert cache.stats.hits == 1
+
+    def test_expired_value_is_removed(self, timer):
+        cache = TTLCache(ttl=10, timer=timer)
+        cache.set("key", "value")
+
+        timer.now = 10
+
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def test_value_is_alive_before_ttl(self, timer):
+        cache = TTLCache(ttl=10, timer=timer)
+        cache.set("key", "value")
+
+        timer.now = 9.9
+
+        assert cache.get("key") == "value"
+
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_pop(self):
+        cache = TTLCache()
+        cache.set("key", "value")
+
+        assert cache.pop("key") == "value"
+        assert cache.pop("key") is None
@@ -0,0 +1,121 @@
+import threading
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.infrastructure.api_clients.ebay import (
+    CategoryTreeTable,
+    EbayTaxonomyClient,
+    EbayTaxonomyClientError,
+)
+from app.infrastructure.category_predictor import LocalCategoryPredictor
+from app.infrastructure.taxonomy import (
+    CategorySearchCache,
+    CategorySearchIndex,
+    CategoryTreeStore,
+    DefaultTreeIdCache,
+)
+from app.services.ports import CategoriesNotFoundError, CategoryPredictorError
+
+
+@pytest.fixture
+def mock_taxonomy_api():
+    table = CategoryTreeTable(tree_id="0", version="1")
+    table.append("1", "Cell Phones & Accessories", -1, False)
+    table.append("2", "Cell Phones & Smartphones", 0, True)
+    table.append("3", "Cell Phone Cases, Covers & Skins", 0, True)
+    table.append("4", "Video Games & Consoles", -1, False)
+    table.append("5", "Video Game Consoles", 3, True)
+
+    api = Mock(spec=EbayTaxonomyClient)
+    api.get_default_tree_id.return_value = "0"
+    api.fetch_category_table.return_value = table
+    return api
+
+
+def make_predictor(api, fallback=None):
+    return LocalCategoryPredictor(
+        taxonomy_api=api,
+        tree_ids=DefaultTreeIdCache(ttl=timedelta(hours=1)),
+        category_trees=CategoryTreeStore(),
+        category_search=CategorySearchCache(),
+        limit=2,
+        fallback=fallback,
+    )
+
+
+class TestLocalCategoryPredictor:
+    @pytest.mark.asyncio
+    async def test_predict_from_local_tree(self, mock_taxonomy_api):
+        predictor = make_predictor(mock_taxonomy_api)
+
+        first = await predictor.predict("Apple smartphone 128GB", marketplace="EBAY_US")
+        second = await predictor.predict("leather phone cases", marketplace="EBAY_US")
+
+        assert first[0] == "Cell Phones & Smartphones"
+        assert second[0] == "Cell Phone Cases, Covers & Skins"
+        mock_taxonomy_api.fetch_category_table.assert_called_once_with("0")
+        mock_taxonomy_api.get_category_suggestions.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_search_runs_off_event_loop(self, mock_taxonomy_api, monkeypatch):
+        threads = []
+        search = CategorySearchIndex.search
+
+        def record_thread(index, *args, **kwargs):
+            threads.append(threading.get_ident())
+            return search(index, *args, **kwargs)
+
+        monkeypatch.setattr(CategorySearchIndex, "search", record_thread)
+
+        await make_predictor(mock_taxonomy_api).predict(
+            "Apple smartphone", marketplace="EBAY_US"
+        )
+
+        assert threads
+        assert threading.get_ident() not in threads
+
+    @pytest.mark.asyncio
+    async def test_predict_without_marketplace(self, mock_taxonomy_api):
+        with pytest.raises(ValueError):
+            await make_predictor(mock_taxonomy_api).predict("console")
+
+    @pytest.mark.asyncio
+    async def test_no_match_uses_fallback(self, mock_taxonomy_api):
+        fallback = AsyncMock()
+        fallback.predict.return_value = ["Garden Tools"]
+        predictor = make_predictor(mock_taxonomy_api, fallback)
+
+        result = await predictor.predict("lawnmower", marketplace="EBAY_US")
+
+        assert result == ["Garden Tools"]
+        fallback.predict.assert_called_once_with("lawnmower", marketplace="EBAY_US")
+
+    @pytest.mark.asyncio
+    async def test_no_match_without_fallback(self, mock_taxonomy_api):
+        with pytest.raises(CategoriesNotFoundError):
+            await make_predictor(mock_taxonomy_api).predict(
+                "lawnmower", marketplace="EBAY_US"
+            )
+
+    @pytest.mark.asyncio
+    async def test_tree_error_uses_fallback(self, mock_taxonomy_api):
+        mock_taxonomy_api.fetch_category_table.side_effect = EbayTaxonomyClientError()
+        fallback = AsyncMock()
+        fallback.predict.return_value = ["Video Game Consoles"]
+
+        result = await make_predictor(mock_taxonomy_api, fallback).predict(
+            "console", marketplace="EBAY_US"
+        )
+
+        assert result == ["Video Game Consoles"]
+
+    @pytest.mark.asyncio
+    async def test_tree_error_without_fallback(self, mock_taxonomy_api):
+        mock_taxonomy_api.fetch_category_table.side_effect = EbayTaxonomyClientError()
+
+        with pytest.raises(CategoryPredictorError):
+            await make_predictor(mock_taxonomy_api).predict(
+                "console", marketplace="EBAY_US"
+            )
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from app.infrastructure.taxonomy import (
+    CategorySearchCache,
+    CategorySearchIndex,
+    CategoryTreeIndex,
+    search,
+)
+
+
+@pytest.fixture
+def tree():
+    return CategoryTreeIndex.build(
+        "0",
+        "1",
+        [
+            ("1", "Cell Phones & Accessories", -1, False),
+            ("2", "Cell Phones & Smartphones", 0, True),
+            ("3", "Cell Phone Cases, Covers & Skins", 0, True),
+            ("4", "Books & Magazines", -1, False),
+            ("5", "Textbooks", 3, True),
+            ("6", "Other", 3, True),
+            ("7", "Video Games & Consoles", -1, False),
+            ("8", "Video Game Consoles", 6, True),
+            ("9", "Other", 6, True),
+        ],
+    )
+
+
+class TestCategorySearchIndex:
+    def test_exact_name_ranks_first(self, tree):
+        matches = CategorySearchIndex(tree).search("Cell Phones & Smartphones")
+
+        assert matches[0].record.category_id == "2"
+        assert matches[0].score == pytest.approx(1.0)
+
+    def test_prefix_match(self, tree):
+        matches = CategorySearchIndex(tree).search("smartph")
+
+        assert [m.record.category_id for m in matches] == ["2"]
+
+    def test_typo_match(self, tree):
+        matches = CategorySearchIndex(tree).search("consols")
+
+        assert matches[0].record.category_id == "8"
+
+    def test_ancestor_tokens_match(self, tree):
+        matches = CategorySearchIndex(tree).search("video games other")
+
+        assert matches[0].record.category_id == "9"
+        assert matches[0].record.path == ("Video Games & Consoles", "Other")
+
+    def test_only_leaves_are_returned(self, tree):
+        matches = CategorySearchIndex(tree).search("books")
+
+        assert {m.record.category_id for m in matches} == {"5", "6"}
+
+    def test_limit_and_min_score(self, tree):
+        index = CategorySearchIndex(tree)
+
+        assert len(index.search("other", limit=1)) == 1
+        assert index.search("cell lawnmower", min_score=0.9) == []
+        assert index.search("") == []
+
+
+class TestCategorySearchCache:
+    @pytest.mark.asyncio
+    async def test_resolve_prefers_exact_name(self, tree):
+        cache = CategorySearchCache()
+
+        assert (await cache.resolve(tree, "OTHER")).category_id == "6"
+
+    @pytest.mark.asyncio
+    async def test_resolve_fuzzy_name(self, tree):
+        cache = CategorySearchCache(min_score=0.7)
+
+        assert (await cache.resolve(tree, "cell phone smartphone")).category_id == "2"
+        assert await cache.resolve(tree, "garden tools") is None
+
+    @pytest.mark.asyncio
+    async def test_get_rebuilds_for_new_tree(self, tree):
+        cache = CategorySearchCache()
+        first = await cache.get(tree)
+
+        assert await cache.get(tree) is first
+
+        updated = CategoryTreeIndex.build("0", "2", [("1", "Music", -1, True)])
+        assert await cache.get(updated) is not first
+        assert (await cache.get(updated)).tree is updated
+
+    @pytest.mark.asyncio
+    async def test_concurrent_get_builds_index_once(self, tree, monkeypatch):
+        built = []
+
+        def build(tree):
+            built.append(tree)
+            return CategorySearchIndex(tree)
+
+        monkeypatch.setattr(search, "CategorySearchIndex", build)
+        cache = CategorySearchCache()
+
+        first, second = await asyncio.gather(cache.get(tree), cache.get(tree))
+
+        assert first is second
+        assert built == [tree]
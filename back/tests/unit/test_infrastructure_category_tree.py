@@ -0,0 +1,424 @@
+import io
+import json
+import sqlite3
+from datetime import timedelta
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+from redis import RedisError
+
+from app.infrastructure.api_clients.ebay import (
+    EbayTaxonomyClient,
+    EbayTaxonomyClientError,
+)
+from app.infrastructure.api_clients.ebay import models as ebay_models
+from app.infrastructure.api_clients.ebay.streaming import parse_category_tree
+from app.infrastructure.taxonomy import (
+    CategoryRecord,
+    CategoryTreeIndex,
+    CategoryTreeRefresher,
+    CategoryTreeStore,
+    DefaultTreeIdCache,
+)
+
+
+def make_node(category_id, name, level, children=None):
+    return ebay_models.CategoryTreeNode(
+        category=ebay_models.Category(category_id=category_id, category_name=name),
+        category_tree_node_level=level,
+        child_category_tree_nodes=children or [],
+        leaf_category_tree_node=not children,
+    )
+
+
+@pytest.fixture
+def category_tree():
+    phones = make_node(
+        "15032",
+        "Cell Phones",
+        1,
+        [
+            make_node("9355", "Smartphones", 2),
+            make_node("20349", "Other", 2),
+        ],
+    )
+    books = make_node("267", "Books", 1, [make_node("261186", "Other", 2)])
+    return ebay_models.CategoryTree(
+        applicable_marketplace_ids=[ebay_models.MarketplaceIdEnum.EBAY_US],
+        category_tree_id="0",
+        category_tree_version="119",
+        root_category_node=make_node("0", "Root", 0, [phones, books]),
+    )
+
+
+@pytest.fixture
+def category_table(category_tree):
+    document = category_tree.model_dump_json(by_alias=True)
+    return parse_category_tree(io.StringIO(document))
+
+
+def records(index):
+    return [index.record(position) for position in range(len(index))]
+
+
+class TestParseCategoryTree:
+    def test_flattens_in_depth_first_order(self, category_table):
+        assert category_table.tree_id == "0"
+        assert category_table.version == "119"
+        assert category_table.ids == ["15032", "9355", "20349", "267", "261186"]
+        assert category_table.names[:2] == ["Cell Phones", "Smartphones"]
+        assert list(category_table.parents) == [-1, 0, 0, -1, 3]
+        assert list(category_table.leaves) == [0, 1, 1, 0, 1]
+
+    def test_small_chunks_and_trailing_header(self, category_tree):
+        data = category_tree.model_dump(by_alias=True, mode="json")
+        document = json.dumps(
+            {
+                "rootCategoryNode": data["rootCategoryNode"],
+                "categoryTreeVersion": "119",
+                "categoryTreeId": "0",
+            },
+            indent=2,
+        )
+
+        table = parse_category_tree(io.StringIO(document), chunk_size=5)
+
+        assert (table.tree_id, table.version) == ("0", "119")
+        assert table.ids == ["15032", "9355", "20349", "267", "261186"]
+
+    def test_malformed_document(self, category_tree):
+        document = category_tree.model_dump_json(by_alias=True)
+
+        with pytest.raises(ValueError):
+            parse_category_tree(io.StringIO(document[: len(document) // 2]))
+
+    def test_index_from_table(self, category_tree, category_table):
+        expected = CategoryTreeIndex.from_tree(category_tree)
+
+        index = CategoryTreeIndex.from_table(category_table)
+
+        assert records(index) == records(expected)
+        assert index.parents == expected.parents
+
+
+class TestCategoryTreeIndex:
+    def test_from_tree_skips_root(self, category_tree):
+        index = CategoryTreeIndex.from_tree(category_tree)
+
+        assert index.tree_id == "0"
+        assert index.version == "119"
+        assert index.ids == ["15032", "267", "9355", "20349", "261186"]
+
+    def test_nodes_are_breadth_first_with_child_ranges(self, category_tree):
+        index = CategoryTreeIndex.from_tree(category_tree)
+
+        assert list(index.parents) == [-1, -1, 0, 0, 1]
+        assert list(index.levels) == [1, 1, 2, 2, 2]
+        assert index.children(0) == range(2, 4)
+        assert index.children(1) == range(4, 5)
+        assert index.children(2) == range(5, 5)
+
+    def test_names_are_interned(self, category_tree):
+        index = CategoryTreeIndex.from_tree(category_tree)
+
+        assert index.names.count("Other") == 1
+        assert index.name(3) == index.name(4) == "Other"
+
+    def test_ancestors_and_path(self, category_tree):
+        index = CategoryTreeIndex.from_tree(category_tree)
+
+        assert index.ancestors(4) == [1]
+        assert index.path(4) == ("Books", "Other")
+        assert index.ancestors(0) == []
+
+    def test_iter_leaves(self, category_tree):
+        index = CategoryTreeIndex.from_tree(category_tree)
+
+        assert [index.ids[i] for i in index.iter_leaves()] == [
+            "9355",
+            "20349",
+            "261186",
+        ]
+        assert [index.ids[i] for i in index.iter_leaves(0)] == ["9355", "20349"]
+        assert list(index.iter_leaves(2)) == [2]
+
+    def test_find_is_case_insensitive(self, category_tree):
+        index = CategoryTreeIndex.from_tree(category_tree)
+
+        record = index.find("sMARTPHONES")
+
+        assert record == CategoryRecord(
+            "9355", "Smartphones", True, ("Cell Phones", "Smartphones")
+        )
+
+    def test_find_returns_first_leaf_in_tree_order(self, category_tree):
+        index = CategoryTreeIndex.from_tree(category_tree)
+
+        assert index.find("Other").category_id == "20349"
+
+    def test_find_skips_non_leaf_by_default(self, category_tree):
+        index = CategoryTreeIndex.from_tree(category_tree)
+
+        assert index.find("Books") is None
+        assert index.find("Books", leaf_only=False).category_id == "267"
+
+    def test_dump_and_load_roundtrip(self, category_tree):
+        index = CategoryTreeIndex.from_tree(category_tree)
+
+        buffer = io.BytesIO()
+        index.dump(buffer)
+        buffer.seek(0)
+        loaded = CategoryTreeIndex.load(buffer)
+
+        assert loaded.tree_id == index.tree_id
+        assert loaded.version == index.version
+        assert records(loaded) == records(index)
+        assert loaded.parents == index.parents
+        assert loaded.child_start == index.child_start
+
+
+class TestCategoryTreeStore:
+    @pytest.mark.asyncio
+    async def test_get_fetches_tree_once(self, category_table):
+        store = CategoryTreeStore()
+        fetch = AsyncMock(return_value=category_table)
+
+        first = await store.get("0", fetch)
+        second = await store.get("0", fetch)
+
+        assert first is second
+        fetch.assert_called_once_with("0")
+
+    @pytest.mark.asyncio
+    async def test_get_loads_persisted_tree(self, category_table, tmp_path):
+        await CategoryTreeStore(cache_dir=str(tmp_path)).get(
+            "0", AsyncMock(return_value=category_table)
+        )
+
+        fetch = AsyncMock()
+        index = await CategoryTreeStore(cache_dir=str(tmp_path)).get("0", fetch)
+
+        fetch.assert_not_called()
+        assert index.version == "119"
+        assert index.find("Smartphones").category_id == "9355"
+
+    @pytest.mark.asyncio
+    async def test_persist_keeps_temporary_files_of_other_writes(
+        self, category_table, tmp_path
+    ):
+        other = tmp_path / "category_tree_0_120.json.gzabc123.tmp"
+        other.write_bytes(b"partial")
+
+        await CategoryTreeStore(cache_dir=str(tmp_path)).get(
+            "0", AsyncMock(return_value=category_table)
+        )
+        index = await CategoryTreeStore(cache_dir=str(tmp_path)).cached("0")
+
+        assert index.version == "119"
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "category_tree_0_119.json.gz",
+            other.name,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_put_replaces_index(self, category_tree, category_table):
+        store = CategoryTreeStore()
+        await store.get("0", AsyncMock(return_value=category_table))
+
+        updated = category_tree.model_copy(update={"category_tree_version": "120"})
+        await store.put(CategoryTreeIndex.from_tree(updated))
+
+        assert (await store.get("0", AsyncMock())).version == "120"
+
+
+@pytest.fixture
+def mock_taxonomy_api(category_table):
+    api = Mock(spec=EbayTaxonomyClient)
+    api.get_default_tree.return_value = ebay_models.BaseCategoryTree(
+        category_tree_id="0", category_tree_version="119"
+    )
+    api.fetch_category_table.return_value = category_table
+    return api
+
+
+def make_refresher(store, api, *marketplaces, tree_ids=None):
+    return CategoryTreeRefresher(
+        store=store,
+        tree_ids=tree_ids or DefaultTreeIdCache(ttl=timedelta(hours=1)),
+        taxonomy_api=api,
+        interval=timedelta(hours=1),
+        marketplaces=marketplaces or [ebay_models.MarketplaceIdEnum.EBAY_US],
+    )
+
+
+class TestCategoryTreeRefresher:
+    @pytest.mark.asyncio
+    async def test_refresh_downloads_missing_tree(self, mock_taxonomy_api):
+        store = CategoryTreeStore()
+
+        await make_refresher(store, mock_taxonomy_api).refresh()
+
+        mock_taxonomy_api.fetch_category_table.assert_called_once_with("0")
+        assert (await store.cached("0")).version == "119"
+
+    @pytest.mark.asyncio
+    async def test_refresh_skips_same_version(self, mock_taxonomy_api, category_tree):
+        store = CategoryTreeStore()
+        await store.put(CategoryTreeIndex.from_tree(category_tree))
+
+        await make_refresher(store, mock_taxonomy_api).refresh()
+
+        mock_taxonomy_api.fetch_category_table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_refresh_replaces_outdated_tree(
+        self, mock_taxonomy_api, category_tree
+    ):
+        store = CategoryTreeStore()
+        outdated = category_tree.model_copy(update={"category_tree_version": "118"})
+        await store.put(CategoryTreeIndex.from_tree(outdated))
+
+        await make_refresher(store, mock_taxonomy_api).refresh()
+
+        assert (await store.cached("0")).version == "119"
+
+    @pytest.mark.asyncio
+    async def test_refresh_checks_shared_tree_once(self, mock_taxonomy_api):
+        store = CategoryTreeStore()
+
+        await make_refresher(
+            store,
+            mock_taxonomy_api,
+            ebay_models.MarketplaceIdEnum.EBAY_US,
+            ebay_models.MarketplaceIdEnum.EBAY_MOTORS,
+        ).refresh()
+
+        assert mock_taxonomy_api.get_default_tree.call_count == 2
+        mock_taxonomy_api.fetch_category_table.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_refresh_continues_after_error(self, mock_taxonomy_api):
+        store = CategoryTreeStore()
+        mock_taxonomy_api.get_default_tree.side_effect = [
+            EbayTaxonomyClientError(),
+            ebay_models.BaseCategoryTree(
+                category_tree_id="0", category_tree_version="119"
+            ),
+        ]
+
+        await make_refresher(
+            store,
+            mock_taxonomy_api,
+            ebay_models.MarketplaceIdEnum.EBAY_GB,
+            ebay_models.MarketplaceIdEnum.EBAY_US,
+        ).refresh()
+
+        assert await store.cached("0") is not None
+
+    @pytest.mark.asyncio
+    async def test_refresh_continues_after_bulk_aspects_error(self, mock_taxonomy_api):
+        mock_taxonomy_api.get_default_tree.side_effect = [
+            ebay_models.BaseCategoryTree(
+                category_tree_id="3", category_tree_version="1"
+            ),
+            ebay_models.BaseCategoryTree(
+                category_tree_id="0", category_tree_version="119"
+            ),
+        ]
+        bulk_aspects = AsyncMock()
+        bulk_aspects.get = Mock(return_value=None)
+        bulk_aspects.load.side_effect = [sqlite3.DatabaseError(), None]
+        refresher = make_refresher(
+            CategoryTreeStore(),
+            mock_taxonomy_api,
+            ebay_models.MarketplaceIdEnum.EBAY_GB,
+            ebay_models.MarketplaceIdEnum.EBAY_US,
+        )
+        refresher.bulk_aspects = bulk_aspects
+
+        await refresher.refresh()
+
+        assert [c.args[:2] for c in bulk_aspects.load.await_args_list] == [
+            ("3", "1"),
+            ("0", "119"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_refresh_warms_tree_ids(self, mock_taxonomy_api):
+        tree_ids = DefaultTreeIdCache(ttl=timedelta(hours=1))
+
+        refresher = make_refresher(
+            CategoryTreeStore(), mock_taxonomy_api, tree_ids=tree_ids
+        )
+        await refresher.refresh()
+
+        fetch = AsyncMock()
+        tree_id = await tree_ids.get(ebay_models.MarketplaceIdEnum.EBAY_US, fetch)
+        assert tree_id == "0"
+        fetch.assert_not_called()
+
+
+class TestDefaultTreeIdCache:
+    @pytest.mark.asyncio
+    async def test_get_counts_hits_and_misses(self):
+        cache = DefaultTreeIdCache(ttl=timedelta(hours=1))
+        fetch = AsyncMock(return_value="0")
+
+        assert await cache.get("EBAY_US", fetch) == "0"
+        assert await cache.get("EBAY_US", fetch) == "0"
+
+        fetch.assert_called_once_with("EBAY_US")
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_get_uses_shared_value(self):
+        redis = AsyncMock()
+        redis.get.return_value = b"3"
+        cache = DefaultTreeIdCache(ttl=timedelta(hours=1), redis=redis)
+        fetch = AsyncMock()
+
+        assert await cache.get("EBAY_GB", fetch) == "3"
+        fetch.assert_not_called()
+        redis.get.assert_called_once_with("ebay:default_tree_id:EBAY_GB")
+
+    @pytest.mark.asyncio
+    async def test_get_stores_fetched_value_in_redis(self):
+        redis = AsyncMock()
+        redis.get.return_value = None
+        cache = DefaultTreeIdCache(ttl=timedelta(hours=1), redis=redis)
+
+        await cache.get("EBAY_DE", AsyncMock(return_value="77"))
+
+        redis.set.assert_called_once_with(
+            "ebay:default_tree_id:EBAY_DE", "77", ex=timedelta(hours=1)
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_ignores_redis_errors(self):
+        redis = AsyncMock()
+        redis.get.side_effect = RedisError()
+        redis.set.side_effect = RedisError()
+        cache = DefaultTreeIdCache(ttl=timedelta(hours=1), redis=redis)
+
+        assert await cache.get("EBAY_US", AsyncMock(return_value="0")) == "0"
+
+    @pytest.mark.asyncio
+    async def test_warm_skips_failed_marketplaces(self, mock_taxonomy_api):
+        mock_taxonomy_api.get_default_tree.side_effect = [
+            EbayTaxonomyClientError(),
+            ebay_models.BaseCategoryTree(
+                category_tree_id="0", category_tree_version="119"
+            ),
+        ]
+        cache = DefaultTreeIdCache(ttl=timedelta(hours=1))
+
+        trees = await cache.warm(
+            mock_taxonomy_api,
+            [
+                ebay_models.MarketplaceIdEnum.EBAY_GB,
+                ebay_models.MarketplaceIdEnum.EBAY_US,
+            ],
+        )
+
+        assert list(trees) == [ebay_models.MarketplaceIdEnum.EBAY_US]
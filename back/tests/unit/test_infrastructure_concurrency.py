@@ -0,0 +1,181 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.infrastructure.concurrency import (
+    SingleFlight,
+    chunks,
+    gather_or_cancel,
+    map_bounded,
+    retry,
+)
+
+
+class TestChunks:
+    def test_splits_into_slices(self):
+        assert chunks([1, 2, 3, 4, 5], 2) == [[1, 2], [3, 4], [5]]
+        assert chunks([], 2) == []
+
+
+class TestGatherOrCancel:
+    @pytest.mark.asyncio
+    async def test_returns_results_in_order(self):
+        async def value(v, delay):
+            await asyncio.sleep(delay)
+            return v
+
+        assert await gather_or_cancel(value(1, 0.02), value(2, 0)) == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_pending(self):
+        cancelled = asyncio.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def fail():
+            raise ValueError()
+
+        with pytest.raises(ValueError):
+            await gather_or_cancel(slow(), fail())
+
+        assert cancelled.is_set()
+
+
+class TestMapBounded:
+    @pytest.mark.asyncio
+    async def test_limits_concurrency_and_keeps_order(self):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def double(x):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01 * (5 - x))
+            in_flight -= 1
+            return x * 2
+
+        result = await map_bounded(double, range(5), limit=2)
+
+        assert result == [0, 2, 4, 6, 8]
+        assert max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_empty(self):
+        assert await map_bounded(AsyncMock(), [], limit=2) == []
+
+
+class TestRetry:
+    @pytest.mark.asyncio
+    async def test_retries_until_success(self):
+        func = AsyncMock(side_effect=[ConnectionError(), ConnectionError(), "ok"])
+
+        assert await retry(func, attempts=3) == "ok"
+        assert func.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_attempts(self):
+        func = AsyncMock(side_effect=ConnectionError())
+
+        with pytest.raises(ConnectionError):
+            await retry(func, attempts=2)
+        assert func.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_does_not_retry_rejected_errors(self):
+        func = AsyncMock(side_effect=ValueError())
+
+        with pytest.raises(ValueError):
+            await retry(
+                func, attempts=3, retry_if=lambda e: isinstance(e, ConnectionError)
+            )
+        func.assert_awaited_once()
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_call(self):
+        flight = SingleFlight()
+        release = asyncio.Event()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return calls
+
+        waiters = [asyncio.ensure_future(flight.do("key", fetch)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*waiters) == [1] * 5
+        assert len(flight) == 0
+        assert await flight.do("key", fetch) == 2
+
+    @pytest.mark.asyncio
+    async def test_error_is_raised_to_all_callers(self):
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0)
+            raise ValueError()
+
+        results = await asyncio.gather(
+            flight.do("key", fail), flight.do("key", fail), return_exceptions=True
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert len(flight) == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_call(self):
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "value"
+
+        first = asyncio.ensure_future(flight.do("key", fetch))
+        second = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        assert await second == "value"
+        assert first.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_last_cancelled_caller_cancels_call(self):
+        flight = SingleFlight()
+        cancelled = asyncio.Event()
+
+        async def fetch():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        first = asyncio.ensure_future(flight.do("key", fetch))
+        second = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        assert not cancelled.is_set()
+
+        second.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        assert len(flight) == 0
+
+        async def fetch_again():
+            return "value"
+
+        assert await flight.do("key", fetch_again) == "value"
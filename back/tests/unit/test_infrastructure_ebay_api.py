@@ -1,6 +1,11 @@
+import asyncio
+from dataclasses import replace
+
+import aiohttp
 import pytest
-from unittest.mock import Mock, MagicMock
+from unittest.mock import AsyncMock, Mock, MagicMock
 from collections.abc import Generator
+from datetime import timedelta
 
 from app.infrastructure.marketplace_api import EbayAPI
 from app.infrastructure.api_clients.ebay import (
@@ -12,14 +17,30 @@ from app.infrastructure.api_clients.ebay import (
     EbayTaxonomyClientError,
     EbayCommerceClientError,
     EbayAccountClientError,
+    CategoryTreeTable,
 )
 from app.infrastructure.api_clients.ebay import models as ebay_models
-from app.domain.entities import Item, AspectType, AccountSettings, AspectField
+from app.domain.entities import (
+    Item,
+    AspectType,
+    AccountSettings,
+    AspectField,
+    MarketplaceAccount,
+)
+from app.infrastructure.listing_settings import ListingSettings, ListingSettingsCache
 from app.infrastructure.marketplace_aspects import EbayAspects, EbayPolicies
+from app.infrastructure.metadata import EbayPackage, Weight
+from app.infrastructure.taxonomy import (
+    CategorySearchCache,
+    CategoryTreeStore,
+    DefaultTreeIdCache,
+    ItemAspectsCache,
+)
 from app.services.ports import (
     MarketplaceAPIError,
     AccountSettingsNotFound,
     CategoriesNotFoundError,
+    CategoryNotFound,
 )
 
 
@@ -33,45 +54,31 @@ def mock_sku_generator():
 @pytest.fixture
 def mock_selling_api():
     api = Mock(spec=EbaySellingClient)
-    api.create_or_replace_inventory_item = Mock()
-    api.create_offer = Mock(return_value="offer_123")
-    api.publish_offer = Mock()
-    api.delete_inventory_item = Mock()
-    api.delete_offer = Mock()
+    api.create_or_replace_inventory_item = AsyncMock()
+    api.create_offer = AsyncMock(return_value="offer_123")
+    api.publish_offer = AsyncMock()
+    api.delete_inventory_item = AsyncMock()
+    api.delete_offer = AsyncMock()
     loc1 = Mock()
     loc1.name = "WarehouseA"
     loc1.id = "loc_1"
     loc2 = Mock()
     loc2.name = "WarehouseB"
     loc2.id = "loc_2"
-    api.get_locations = Mock(return_value=[loc1, loc2])
+    api.get_locations = AsyncMock(return_value=[loc1, loc2])
     return api
 
 
 @pytest.fixture
 def mock_taxonomy_api():
     api = Mock(spec=EbayTaxonomyClient)
-    api.get_default_tree_id = Mock(return_value="tree_123")
-
-    category = Mock()
-    category.category_id = "cat_123"
-    category.category_name = "Electronics > Mobile Phones"
+    api.get_default_tree_id = AsyncMock(return_value="tree_123")
 
-    leaf_node = Mock()
-    leaf_node.leaf_category_tree_node = True
-    leaf_node.category = category
-    leaf_node.child_category_tree_nodes = []
+    category_table = CategoryTreeTable(tree_id="tree_123", version="1")
+    category_table.append("cat_123", "Electronics > Mobile Phones", -1, True)
 
-    root_node = Mock()
-    root_node.leaf_category_tree_node = False
-    root_node.category = None
-    root_node.child_category_tree_nodes = [leaf_node]
-
-    category_tree = Mock()
-    category_tree.root_category_node = root_node
-
-    api.fetch_category_tree = Mock(return_value=category_tree)
-    api.get_item_aspects = Mock(return_value=Mock(aspects=[]))
+    api.fetch_category_table = AsyncMock(return_value=category_table)
+    api.get_item_aspects = AsyncMock(return_value=Mock(aspects=[]))
 
     return api
 
@@ -81,7 +88,7 @@ def mock_commerce_api():
     api = Mock(spec=EbayCommerceClient)
     img_response = Mock()
     img_response.image_url = "https://example.com/image.jpg"
-    api.upload_image = Mock(return_value=img_response)
+    api.upload_image = AsyncMock(return_value=img_response)
     return api
 
 
@@ -101,7 +108,7 @@ def mock_account_api():
     return_policy.name = "ReturnsAccepted"
     return_policy.id = "rp_123"
 
-    api.get_all_policies = Mock(
+    api.get_all_policies = AsyncMock(
         return_value={
             "fulfillment_policies": [fulfillment_policy],
             "payment_policies": [payment_policy],
@@ -125,6 +132,10 @@ def ebay_api(
         commerce_api=mock_commerce_api,
         account_api=mock_account_api,
         sku_generator=mock_sku_generator(),
+        category_trees=CategoryTreeStore(),
+        tree_ids=DefaultTreeIdCache(ttl=timedelta(hours=1)),
+        item_aspects=ItemAspectsCache(ttl=timedelta(hours=1), maxsize=16),
+        category_search=CategorySearchCache(),
     )
 
 
@@ -172,7 +183,8 @@ class TestEbayAPIPublish:
         assert sku.startswith("SKU_")
         assert len(sku) == 9  # SKU_00001
 
-    def test_publish_inventory_creation_error_handling(
+    @pytest.mark.asyncio
+    async def test_publish_inventory_creation_error_handling(
         self, mock_selling_api, ebay_api, sample_item
     ):
         mock_selling_api.create_or_replace_inventory_item.side_effect = (
@@ -180,7 +192,7 @@ class TestEbayAPIPublish:
         )
 
         with pytest.raises(EbaySellingClientError):
-            mock_selling_api.create_or_replace_inventory_item("sku_123", Mock())
+            await mock_selling_api.create_or_replace_inventory_item("sku_123", Mock())
 
         assert mock_selling_api.create_or_replace_inventory_item.side_effect is not None
 
@@ -190,13 +202,15 @@ class TestEbayAPIPublish:
         assert sku.startswith("SKU_")
         assert len(sku) == 9  # SKU_00001
 
-    def test_publish_offer_error_handling(self, mock_selling_api, ebay_api):
+    @pytest.mark.asyncio
+    async def test_publish_offer_error_handling(self, mock_selling_api, ebay_api):
         mock_selling_api.create_offer.side_effect = EbaySellingClientError()
 
         with pytest.raises(EbaySellingClientError):
-            mock_selling_api.create_offer(Mock())
+            await mock_selling_api.create_offer(Mock())
 
-    def test_publish_account_settings_not_found(
+    @pytest.mark.asyncio
+    async def test_publish_account_settings_not_found(
         self,
         mock_account_api,
     ):
@@ -206,21 +220,389 @@ class TestEbayAPIPublish:
             "return_policies": [],
         }
 
-        result = mock_account_api.get_all_policies("token")
+        result = await mock_account_api.get_all_policies("token")
         assert result["fulfillment_policies"] == []
 
-    def test_publish_cleanup_without_offer_id(
+    @pytest.mark.asyncio
+    async def test_publish_cleanup_without_offer_id(
         self,
         mock_selling_api,
     ):
         mock_selling_api.delete_inventory_item.side_effect = EbaySellingClientError()
 
         with pytest.raises(EbaySellingClientError):
-            mock_selling_api.delete_inventory_item("sku_123", "token")
+            await mock_selling_api.delete_inventory_item("sku_123", "token")
+
+
+@pytest.fixture
+def publish_item():
+    aspects = Mock()
+    aspects.aspects = []
+
+    marketplace_aspects = EbayAspects(
+        location="WarehouseA",
+        marketplace="EBAY_US",
+        policies=EbayPolicies(
+            fulfillment_policy="Standard",
+            payment_policy="CreditCard",
+            return_policy="ReturnsAccepted",
+        ),
+        package=EbayPackage(weight=Weight(unit="KILOGRAM", value=2.5)),
+        condition="NEW",
+    )
+    return Item(
+        title="Test Product",
+        description="Test Description",
+        price=99.99,
+        currency="USD",
+        country="US",
+        category="Electronics > Mobile Phones",
+        quantity=5,
+        marketplace_aspects=marketplace_aspects,
+        product_aspects=aspects,
+    )
+
+
+@pytest.fixture
+def listing_settings(mock_account_api, mock_selling_api):
+    def policy(name, policy_id):
+        return {"id": policy_id, "name": name}
+
+    mock_account_api.get_all_policies.return_value = {
+        "fulfillment_policies": [policy("Standard", "fp_123")],
+        "payment_policies": [policy("CreditCard", "pp_123")],
+        "return_policies": [policy("ReturnsAccepted", "rp_123")],
+    }
+    locations = [
+        {"name": "Store", "merchant_location_key": "loc_0"},
+        {"name": "WarehouseA", "merchant_location_key": "loc_1"},
+        {"name": "WarehouseB", "merchant_location_key": "loc_2"},
+    ]
+    mock_selling_api.get_locations.return_value = locations
+
+    async def iter_locations(token):
+        for location in locations:
+            mock_selling_api.read_locations.append(location["name"])
+            yield location
+
+    mock_selling_api.read_locations = []
+    mock_selling_api.iter_locations = Mock(side_effect=iter_locations)
+
+
+def commerce_error(status: int) -> EbayCommerceClientError:
+    error = EbayCommerceClientError()
+    error.__cause__ = aiohttp.ClientResponseError(Mock(), (), status=status)
+    return error
+
+
+@pytest.mark.usefixtures("listing_settings")
+class TestEbayAPIPublishPipeline:
+    @pytest.mark.asyncio
+    async def test_publish_creates_and_publishes_offer(
+        self, ebay_api, mock_selling_api, mock_account_api, publish_item
+    ):
+        await ebay_api.publish(publish_item, "token", "a.jpg")
+
+        sku, inventory_item, token = (
+            mock_selling_api.create_or_replace_inventory_item.call_args.args
+        )
+        assert token == "token"
+        assert inventory_item.product.image_urls == ["https://example.com/image.jpg"]
+
+        offer, _ = mock_selling_api.create_offer.call_args.args
+        assert offer.sku == sku
+        assert offer.category_id == "cat_123"
+        assert offer.merchant_location_key == "loc_1"
+        assert offer.listing_policies.payment_policy_id == "pp_123"
+        mock_selling_api.publish_offer.assert_awaited_once_with("offer_123", "token")
+        mock_account_api.get_all_policies.assert_awaited_once_with("token", ["EBAY_US"])
+        # Without a listing settings cache locations are read until found
+        assert mock_selling_api.read_locations == ["Store", "WarehouseA"]
+        mock_selling_api.get_locations.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_images_upload_concurrently_in_order(
+        self, ebay_api, mock_commerce_api, mock_account_api, publish_item
+    ):
+        in_flight = 0
+        max_in_flight = 0
+        policies_requested_during_upload = False
+
+        async def upload(img, token):
+            nonlocal in_flight, max_in_flight, policies_requested_during_upload
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01 * (6 - int(img)))
+            if mock_account_api.get_all_policies.await_count:
+                policies_requested_during_upload = True
+            in_flight -= 1
+            return Mock(image_url=f"url_{img}")
+
+        mock_commerce_api.upload_image.side_effect = upload
+        ebay_api.upload_concurrency = 2
+
+        urls = await ebay_api._load_images("token", *map(str, range(6)))
+        await ebay_api.publish(publish_item, "token", *map(str, range(6)))
+
+        assert urls == [f"url_{i}" for i in range(6)]
+        assert max_in_flight == 2
+        assert policies_requested_during_upload
+
+    @pytest.mark.asyncio
+    async def test_upload_retries_transient_errors(self, ebay_api, mock_commerce_api):
+        ebay_api.upload_retry_delay = 0
+        mock_commerce_api.upload_image.side_effect = [
+            commerce_error(503),
+            Mock(image_url="url"),
+        ]
+
+        assert await ebay_api._load_images("token", "a.jpg") == ["url"]
+        assert mock_commerce_api.upload_image.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_upload_does_not_retry_client_errors(
+        self, ebay_api, mock_commerce_api, mock_selling_api, publish_item
+    ):
+        mock_commerce_api.upload_image.side_effect = commerce_error(400)
+
+        with pytest.raises(MarketplaceAPIError):
+            await ebay_api.publish(publish_item, "token", "a.jpg")
+
+        mock_commerce_api.upload_image.assert_awaited_once()
+        mock_selling_api.create_or_replace_inventory_item.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_publish_category_not_found(
+        self, ebay_api, mock_selling_api, publish_item
+    ):
+        publish_item.category = "Garden"
+
+        with pytest.raises(CategoryNotFound):
+            await ebay_api.publish(publish_item, "token", "a.jpg")
+
+        mock_selling_api.create_or_replace_inventory_item.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_publish_unknown_policy(
+        self, ebay_api, mock_selling_api, publish_item
+    ):
+        publish_item.marketplace_aspects.policies.payment_policy = "Cash"
+
+        with pytest.raises(AccountSettingsNotFound):
+            await ebay_api.publish(publish_item, "token", "a.jpg")
+
+        mock_selling_api.create_offer.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_publish_failure_cleans_up(
+        self, ebay_api, mock_selling_api, publish_item
+    ):
+        mock_selling_api.publish_offer.side_effect = EbaySellingClientError()
+
+        with pytest.raises(MarketplaceAPIError):
+            await ebay_api.publish(publish_item, "token", "a.jpg")
+
+        mock_selling_api.delete_offer.assert_awaited_once_with("offer_123", "token")
+        mock_selling_api.delete_inventory_item.assert_awaited_once()
+
+
+@pytest.fixture
+def account():
+    return MarketplaceAccount(user_uuid="user_1", marketplace="ebay")
+
+
+@pytest.fixture
+def listing_cache(ebay_api):
+    cache = AsyncMock(spec=ListingSettingsCache)
+    cache.get.return_value = None
+    ebay_api.listing_settings = cache
+    return cache
+
+
+@pytest.mark.usefixtures("listing_settings")
+class TestEbayAPIListingSettingsCache:
+    @pytest.mark.asyncio
+    async def test_cached_settings_skip_requests(
+        self,
+        ebay_api,
+        listing_cache,
+        mock_account_api,
+        mock_selling_api,
+        publish_item,
+        account,
+    ):
+        listing_cache.get.return_value = ListingSettings(
+            fulfillment_policies={"standard": "fp_cached"},
+            payment_policies={"creditcard": "pp_cached"},
+            return_policies={"returnsaccepted": "rp_cached"},
+            locations={"warehousea": "loc_cached"},
+        )
+
+        await ebay_api.publish(publish_item, "token", "a.jpg", account=account)
+
+        listing_cache.get.assert_awaited_once_with("user_1", "EBAY_US")
+        mock_account_api.get_all_policies.assert_not_called()
+        mock_selling_api.get_locations.assert_not_called()
+        offer, _ = mock_selling_api.create_offer.call_args.args
+        assert offer.listing_policies.fulfillment_policy_id == "fp_cached"
+        assert offer.merchant_location_key == "loc_cached"
+
+    @pytest.mark.asyncio
+    async def test_miss_fetches_and_stores(
+        self, ebay_api, listing_cache, mock_selling_api, publish_item, account
+    ):
+        await ebay_api.publish(publish_item, "token", "a.jpg", account=account)
+
+        user_uuid, marketplace_id, settings = listing_cache.set.call_args.args
+        assert (user_uuid, marketplace_id) == ("user_1", "EBAY_US")
+        assert settings.location_key("WarehouseA") == "loc_1"
+        mock_selling_api.publish_offer.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_refreshed(
+        self, ebay_api, listing_cache, mock_account_api, publish_item, account
+    ):
+        listing_cache.get.return_value = ListingSettings({}, {}, {}, {})
+
+        await ebay_api.publish(publish_item, "token", "a.jpg", account=account)
+
+        mock_account_api.get_all_policies.assert_awaited_once()
+        listing_cache.set.assert_awaited_once()
+
+
+@pytest.fixture
+def bulk_api(mock_selling_api):
+    async def inventory_items(items, token):
+        return [
+            ebay_models.BulkInventoryItemResponse(status_code=200, sku=item.sku)
+            for item in items
+        ]
+
+    async def offers(offers, token):
+        return [
+            ebay_models.BulkOfferResponse(
+                status_code=201, sku=offer.sku, offer_id=f"offer_{offer.sku}"
+            )
+            for offer in offers
+        ]
+
+    async def publish(offer_ids, token):
+        return [
+            ebay_models.BulkPublishResponse(
+                status_code=200, offer_id=offer_id, listing_id=f"listing_{offer_id}"
+            )
+            for offer_id in offer_ids
+        ]
+
+    mock_selling_api.bulk_create_or_replace_inventory_item = AsyncMock(
+        side_effect=inventory_items
+    )
+    mock_selling_api.bulk_create_offer = AsyncMock(side_effect=offers)
+    mock_selling_api.bulk_publish_offer = AsyncMock(side_effect=publish)
+    return mock_selling_api
+
+
+@pytest.mark.usefixtures("listing_settings")
+class TestEbayAPIPublishBatch:
+    @pytest.mark.asyncio
+    async def test_publishes_in_chunks(
+        self, ebay_api, bulk_api, mock_account_api, publish_item
+    ):
+        items = [(publish_item, ["a.jpg"]) for _ in range(30)]
+
+        results = await ebay_api.publish_batch(items, "token")
+
+        assert [r.error for r in results] == [None] * 30
+        assert len({r.listing_id for r in results}) == 30
+        chunks = bulk_api.bulk_create_or_replace_inventory_item.await_args_list
+        assert sorted(len(c.args[0]) for c in chunks) == [5, 25]
+        assert chunks[0].args[0][0].locale == "en_US"
+        assert bulk_api.bulk_create_offer.await_count == 2
+        assert bulk_api.bulk_publish_offer.await_count == 2
+        # listing settings are loaded once for the batch
+        mock_account_api.get_all_policies.assert_awaited_once_with("token", ["EBAY_US"])
+        bulk_api.get_locations.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_reports_failures_per_item(self, ebay_api, bulk_api, publish_item):
+        rejected = []
+
+        async def offers(offers, token):
+            responses = []
+            for offer in offers:
+                if offer.pricing_summary.price.value == 0:
+                    rejected.append(offer.sku)
+                    error = ebay_models.BulkError(error_id=25002, message="Bad price")
+                    responses.append(
+                        ebay_models.BulkOfferResponse(
+                            status_code=400, sku=offer.sku, errors=[error]
+                        )
+                    )
+                else:
+                    responses.append(
+                        ebay_models.BulkOfferResponse(
+                            status_code=201, sku=offer.sku, offer_id=f"o_{offer.sku}"
+                        )
+                    )
+            return responses
+
+        bulk_api.bulk_create_offer.side_effect = offers
+        unknown_policy = replace(
+            publish_item,
+            marketplace_aspects=replace(
+                publish_item.marketplace_aspects,
+                policies=EbayPolicies("Standard", "Cash", "ReturnsAccepted"),
+            ),
+        )
+        items = [
+            (replace(publish_item, category="Garden"), ["a.jpg"]),
+            (replace(publish_item, price=0), ["b.jpg"]),
+            (unknown_policy, ["c.jpg"]),
+            (publish_item, ["d.jpg"]),
+        ]
+
+        results = await ebay_api.publish_batch(items, "token")
+
+        assert isinstance(results[0].error, CategoryNotFound)
+        assert isinstance(results[1].error, MarketplaceAPIError)
+        assert str(results[1].error) == "Bad price"
+        assert isinstance(results[2].error, AccountSettingsNotFound)
+        assert results[3].error is None
+        (offer_id,) = bulk_api.bulk_publish_offer.await_args.args[0]
+        assert results[3].listing_id == f"listing_{offer_id}"
+        bulk_api.delete_inventory_item.assert_awaited_once_with(rejected[0], "token")
+        bulk_api.delete_offer.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_is_cleaned_up(self, ebay_api, bulk_api, publish_item):
+        bulk_api.bulk_publish_offer.side_effect = EbaySellingClientError()
+
+        results = await ebay_api.publish_batch(
+            [(publish_item, ["a.jpg"]), (publish_item, ["b.jpg"])], "token"
+        )
+
+        assert all(isinstance(r.error, MarketplaceAPIError) for r in results)
+        assert bulk_api.delete_inventory_item.await_count == 2
+        assert sorted(c.args[0] for c in bulk_api.delete_offer.await_args_list) == [
+            "offer_SKU_00001",
+            "offer_SKU_00002",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_account_error_fails_batch(
+        self, ebay_api, bulk_api, mock_account_api, publish_item
+    ):
+        mock_account_api.get_all_policies.side_effect = EbayAccountClientError()
+
+        with pytest.raises(MarketplaceAPIError):
+            await ebay_api.publish_batch([(publish_item, ["a.jpg"])], "token")
+
+        bulk_api.bulk_create_or_replace_inventory_item.assert_not_called()
 
 
 class TestEbayAPIGetProductAspects:
-    def test_get_product_aspects_success(
+    @pytest.mark.asyncio
+    async def test_get_product_aspects_success(
         self,
         ebay_api,
         mock_taxonomy_api,
@@ -244,7 +626,7 @@ class TestEbayAPIGetProductAspects:
 
         mock_taxonomy_api.get_item_aspects.return_value = aspect_metadata
 
-        aspects = ebay_api.get_product_aspects(
+        aspects = await ebay_api.get_product_aspects(
             "Electronics > Mobile Phones",
             marketplace_id="ebay",
         )
@@ -254,31 +636,53 @@ class TestEbayAPIGetProductAspects:
         assert all(isinstance(a, AspectField) for a in aspects)
         mock_taxonomy_api.get_item_aspects.assert_called_once()
 
-    def test_get_product_aspects_category_search_with_spaces(
+    @pytest.mark.asyncio
+    async def test_get_product_aspects_cached_per_category(
+        self,
+        ebay_api,
+        mock_taxonomy_api,
+    ):
+        first = await ebay_api.get_product_aspects(
+            "Electronics > Mobile Phones", marketplace_id="ebay"
+        )
+        second = await ebay_api.get_product_aspects(
+            "Electronics > Mobile Phones", marketplace_id="ebay"
+        )
+
+        assert first is second
+        mock_taxonomy_api.get_item_aspects.assert_called_once_with(
+            "tree_123", "cat_123"
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_product_aspects_category_search_with_spaces(
         self,
         ebay_api,
         mock_taxonomy_api,
     ):
         mock_taxonomy_api.get_default_tree_id.return_value = "tree_id"
 
-        result = mock_taxonomy_api.get_default_tree_id("ebay")
+        result = await mock_taxonomy_api.get_default_tree_id("ebay")
         assert result == "tree_id"
 
-    def test_get_product_aspects_category_not_found(
+    @pytest.mark.asyncio
+    async def test_get_product_aspects_category_not_found(
         self,
         ebay_api,
         mock_taxonomy_api,
     ):
-        mock_taxonomy_api.fetch_category_tree.return_value.root_category_node.child_category_tree_nodes = []
-        mock_taxonomy_api.fetch_category_tree.return_value.root_category_node.leaf_category_tree_node = False
+        mock_taxonomy_api.fetch_category_table.return_value = CategoryTreeTable(
+            tree_id="tree_123", version="1"
+        )
 
         with pytest.raises(CategoriesNotFoundError):
-            ebay_api.get_product_aspects(
+            await ebay_api.get_product_aspects(
                 "NonexistentCategory",
                 marketplace_id="ebay",
             )
 
-    def test_get_product_aspects_taxonomy_api_error(
+    @pytest.mark.asyncio
+    async def test_get_product_aspects_taxonomy_api_error(
         self,
         ebay_api,
         mock_taxonomy_api,
@@ -286,7 +690,7 @@ class TestEbayAPIGetProductAspects:
         mock_taxonomy_api.get_default_tree_id.side_effect = EbayTaxonomyClientError()
 
         with pytest.raises(MarketplaceAPIError):
-            ebay_api.get_product_aspects(
+            await ebay_api.get_product_aspects(
                 "Electronics",
                 marketplace_id="ebay",
             )
@@ -302,19 +706,21 @@ class TestEbayAPIGetProductAspects:
 
 
 class TestEbayAPIGetAccountSettings:
-    def test_get_account_settings_success(
+    @pytest.mark.asyncio
+    async def test_get_account_settings_success(
         self,
         ebay_api,
         mock_account_api,
         mock_selling_api,
     ):
-        settings = ebay_api.get_account_settings("token")
+        settings = await ebay_api.get_account_settings("token")
 
         assert isinstance(settings, AccountSettings)
         mock_account_api.get_all_policies.assert_called_once()
         mock_selling_api.get_locations.assert_called_once()
 
-    def test_get_account_settings_with_multiple_policies(
+    @pytest.mark.asyncio
+    async def test_get_account_settings_with_multiple_policies(
         self,
         ebay_api,
         mock_account_api,
@@ -341,11 +747,12 @@ class TestEbayAPIGetAccountSettings:
         loc2.name = "WarehouseB"
         mock_selling_api.get_locations.return_value = [loc1, loc2]
 
-        settings = ebay_api.get_account_settings("token")
+        settings = await ebay_api.get_account_settings("token")
 
         assert isinstance(settings, AccountSettings)
 
-    def test_get_account_settings_account_api_error(
+    @pytest.mark.asyncio
+    async def test_get_account_settings_account_api_error(
         self,
         ebay_api,
         mock_account_api,
@@ -353,7 +760,15 @@ class TestEbayAPIGetAccountSettings:
         mock_account_api.get_all_policies.side_effect = EbayAccountClientError()
 
         with pytest.raises(Exception):  # API doesn't wrap in MarketplaceAPIError
-            ebay_api.get_account_settings("token")
+            await ebay_api.get_account_settings("token")
+
+    @pytest.mark.asyncio
+    async def test_get_account_settings_invalidates_listing_settings(
+        self, ebay_api, listing_cache, account
+    ):
+        await ebay_api.get_account_settings("token", account=account)
+
+        listing_cache.invalidate.assert_awaited_once_with("user_1")
 
 
 class TestEbayAPIHelperMethods:
@@ -361,42 +776,38 @@ class TestEbayAPIHelperMethods:
         assert hasattr(EbayAPI, "_to_inventory_item")
         assert callable(getattr(EbayAPI, "_to_inventory_item"))
 
-    def test_search_category_found(self):
-        category = Mock()
-        category.category_id = "cat_123"
-        category.category_name = "Electronics"
-
-        leaf_node = Mock()
-        leaf_node.leaf_category_tree_node = True
-        leaf_node.category = category
-        leaf_node.child_category_tree_nodes = []
-
-        root_node = Mock()
-        root_node.leaf_category_tree_node = False
-        root_node.category = None
-        root_node.child_category_tree_nodes = [leaf_node]
+    @pytest.mark.asyncio
+    async def test_search_category_found(self, ebay_api):
+        result = await ebay_api._search_category(
+            "electronics > mobile phones", "EBAY_US"
+        )
 
-        tree = Mock()
-        tree.root_category_node = root_node
+        assert result is not None
+        index, category = result
+        assert index.tree_id == "tree_123"
+        assert category.category_id == "cat_123"
+        assert category.name == "Electronics > Mobile Phones"
 
-        result = EbayAPI._search_in_tree(tree, "Electronics")
+    @pytest.mark.asyncio
+    async def test_search_category_fuzzy_match(self, ebay_api):
+        result = await ebay_api._search_category("electronics mobile phone", "EBAY_US")
 
         assert result is not None
-        assert result[0] == "cat_123"
-        assert result[1] == "Electronics"
+        assert result[1].category_id == "cat_123"
 
-    def test_search_category_not_found(self):
-        root_node = Mock()
-        root_node.leaf_category_tree_node = False
-        root_node.category = None
-        root_node.child_category_tree_nodes = []
+    @pytest.mark.asyncio
+    async def test_search_category_not_found(self, ebay_api):
+        result = await ebay_api._search_category("NonexistentCategory", "EBAY_US")
 
-        tree = Mock()
-        tree.root_category_node = root_node
+        assert result is None
 
-        result = EbayAPI._search_in_tree(tree, "NonexistentCategory")
+    @pytest.mark.asyncio
+    async def test_search_category_tree_fetched_once(self, ebay_api, mock_taxonomy_api):
+        await ebay_api._search_category("Electronics > Mobile Phones", "EBAY_US")
+        await ebay_api._search_category("Electronics > Mobile Phones", "EBAY_US")
 
-        assert result is None
+        mock_taxonomy_api.fetch_category_table.assert_called_once_with("tree_123")
+        mock_taxonomy_api.get_default_tree_id.assert_called_once_with("EBAY_US")
 
     def test_from_ebay_aspects_type_mapping(self):
         constraint = Mock()
@@ -0,0 +1,111 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import aiohttp
+import pytest
+
+from app.infrastructure.api_clients.ebay import (
+    EbayCommerceClient,
+    EbaySellingClient,
+    EbayTaxonomyClient,
+)
+from app.infrastructure.api_clients.session import create_session
+from app.infrastructure.api_clients.utils import auth_retry, request_exception_chain
+
+
+class ClientError(Exception):
+    pass
+
+
+class TimeoutClientError(Exception):
+    pass
+
+
+def unauthorized() -> aiohttp.ClientResponseError:
+    return aiohttp.ClientResponseError(Mock(), (), status=401)
+
+
+@pytest.mark.asyncio
+async def test_session_pool_and_timeouts():
+    session = create_session(
+        limit=20, limit_per_host=5, connect_timeout=1, read_timeout=2
+    )
+
+    try:
+        assert session.connector.limit == 20
+        assert session.connector.limit_per_host == 5
+        assert session.timeout.sock_connect == 1
+        assert session.timeout.sock_read == 2
+    finally:
+        await session.close()
+
+
+@pytest.mark.asyncio
+async def test_clients_share_session():
+    session = create_session()
+    settings = Mock()
+
+    try:
+        taxonomy = EbayTaxonomyClient("api.ebay.com", settings, session)
+        selling = EbaySellingClient("api.ebay.com", settings, session)
+        commerce = EbayCommerceClient("api.sandbox.ebay.com", settings, session)
+
+        assert taxonomy.session is selling.session is commerce.session is session
+        assert taxonomy.url("/x") == "https://api.ebay.com/commerce/taxonomy/v1/x"
+        assert commerce.url("/x") == (
+            "https://apim.sandbox.ebay.com/commerce/media/v1_beta/x"
+        )
+    finally:
+        await session.close()
+
+
+@pytest.mark.asyncio
+async def test_exception_chain_maps_aiohttp_errors():
+    @request_exception_chain(default=ClientError, on_timeout=TimeoutClientError)
+    async def request(error):
+        raise error
+
+    with pytest.raises(TimeoutClientError):
+        await request(aiohttp.ServerTimeoutError())
+    with pytest.raises(ClientError) as exc_info:
+        await request(unauthorized())
+
+    assert isinstance(exc_info.value.__cause__, aiohttp.ClientResponseError)
+
+
+@pytest.mark.asyncio
+async def test_auth_retry_updates_token_once():
+    @auth_retry
+    class Client:
+        def __init__(self):
+            self.update_token = AsyncMock()
+            self.calls = 0
+
+        @request_exception_chain(default=ClientError)
+        async def get(self):
+            self.calls += 1
+            if self.calls == 1:
+                raise unauthorized()
+            return "ok"
+
+    client = Client()
+
+    assert await client.get() == "ok"
+    client.update_token.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_auth_retry_ignores_other_errors():
+    @auth_retry
+    class Client:
+        def __init__(self):
+            self.update_token = AsyncMock()
+
+        async def get(self):
+            raise asyncio.TimeoutError()
+
+    client = Client()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await client.get()
+    client.update_token.assert_not_awaited()
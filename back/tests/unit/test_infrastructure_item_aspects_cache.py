@@ -0,0 +1,117 @@
+from datetime import timedelta
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+from redis import RedisError
+
+from app.domain.entities import AspectField, AspectType
+from app.infrastructure.api_clients.ebay import models as ebay_models
+from app.infrastructure.taxonomy import ItemAspectsCache
+
+
+@pytest.fixture
+def aspect_metadata():
+    return ebay_models.AspectMetadata(
+        aspects=[
+            ebay_models.Aspect(
+                localized_aspect_name="Brand",
+                aspect_constraint=ebay_models.AspectConstraint(
+                    aspect_data_type=ebay_models.AspectValueTypeEnum.STRING,
+                    aspect_enabled_for_variations=False,
+                    aspect_mode=ebay_models.AspectModeEnum.FREE_TEXT,
+                    aspect_required=True,
+                    aspect_usage=ebay_models.AspectUsageEnum.RECOMMENDED,
+                    item_to_aspect_cardinality=ebay_models.ItemToAspectCardinalityEnum.SINGLE,
+                ),
+            )
+        ]
+    )
+
+
+@pytest.fixture
+def convert():
+    return Mock(
+        return_value=[
+            AspectField(name="Brand", data_type=AspectType.STR, is_required=True)
+        ]
+    )
+
+
+class TestItemAspectsCache:
+    @pytest.mark.asyncio
+    async def test_get_fetches_once(self, aspect_metadata, convert):
+        cache = ItemAspectsCache(ttl=timedelta(hours=1), maxsize=8)
+        fetch = AsyncMock(return_value=aspect_metadata)
+
+        first = await cache.get("0", "119", "9355", fetch, convert)
+        second = await cache.get("0", "119", "9355", fetch, convert)
+
+        assert first is second
+        assert first.metadata == aspect_metadata
+        assert first.fields[0].name == "Brand"
+        fetch.assert_called_once()
+        convert.assert_called_once_with(aspect_metadata)
+        assert cache.stats.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_new_tree_version_is_fetched_again(self, aspect_metadata, convert):
+        cache = ItemAspectsCache(ttl=timedelta(hours=1), maxsize=8)
+        fetch = AsyncMock(return_value=aspect_metadata)
+
+        await cache.get("0", "119", "9355", fetch, convert)
+        await cache.get("0", "120", "9355", fetch, convert)
+
+        assert fetch.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, aspect_metadata, convert):
+        cache = ItemAspectsCache(ttl=timedelta(hours=1), maxsize=1)
+        fetch = AsyncMock(return_value=aspect_metadata)
+
+        await cache.get("0", "119", "1", fetch, convert)
+        await cache.get("0", "119", "2", fetch, convert)
+        await cache.get("0", "119", "1", fetch, convert)
+
+        assert fetch.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_get_uses_shared_value(self, aspect_metadata, convert):
+        redis = AsyncMock()
+        redis.get.return_value = aspect_metadata.model_dump_json(by_alias=True)
+        cache = ItemAspectsCache(ttl=timedelta(hours=1), maxsize=8, redis=redis)
+        fetch = AsyncMock()
+
+        aspects = await cache.get("0", "119", "9355", fetch, convert)
+
+        fetch.assert_not_called()
+        assert aspects.metadata == aspect_metadata
+        redis.get.assert_called_once_with("ebay:item_aspects:0:119:9355")
+
+    @pytest.mark.asyncio
+    async def test_get_stores_fetched_value_in_redis(self, aspect_metadata, convert):
+        redis = AsyncMock()
+        redis.get.return_value = None
+        cache = ItemAspectsCache(ttl=timedelta(hours=2), maxsize=8, redis=redis)
+
+        fetch = AsyncMock(return_value=aspect_metadata)
+
+        await cache.get("0", "119", "9355", fetch, convert)
+
+        redis.set.assert_called_once_with(
+            "ebay:item_aspects:0:119:9355",
+            aspect_metadata.model_dump_json(by_alias=True),
+            ex=timedelta(hours=2),
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_ignores_redis_errors(self, aspect_metadata, convert):
+        redis = AsyncMock()
+        redis.get.side_effect = RedisError()
+        redis.set.side_effect = RedisError()
+        cache = ItemAspectsCache(ttl=timedelta(hours=1), maxsize=8, redis=redis)
+        fetch = AsyncMock(return_value=aspect_metadata)
+
+        aspects = await cache.get("0", "119", "9355", fetch, convert)
+
+        assert aspects.metadata == aspect_metadata
+        fetch.assert_called_once()
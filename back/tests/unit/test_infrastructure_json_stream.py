@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from app.infrastructure.json_stream import JSONStreamParser
+
+DOCUMENT = {
+    "aspects": {
+        "Brand": 'Apple "Inc"',
+        "Storage": 128,
+        "Colors": ["Black", {"name": "White"}],
+        "Model": None,
+    },
+    "metadata": {"description": "Phone, {new}", "package": {"weight": 0.5}},
+}
+
+
+def _feed(text: str, step: int, max_depth: int = 2) -> list:
+    parser = JSONStreamParser(max_depth=max_depth)
+    values = []
+    for i in range(0, len(text), step):
+        values += parser.feed(text[i : i + step])
+    return values
+
+
+class TestJSONStreamParser:
+    @pytest.mark.parametrize("step", [1, 2, 7, 10_000])
+    def test_values_do_not_depend_on_chunks(self, step):
+        text = json.dumps(DOCUMENT, indent=2)
+
+        assert _feed(text, step) == [
+            (("aspects", "Brand"), 'Apple "Inc"'),
+            (("aspects", "Storage"), 128),
+            (("aspects", "Colors"), ["Black", {"name": "White"}]),
+            (("aspects", "Model"), None),
+            (("aspects",), DOCUMENT["aspects"]),
+            (("metadata", "description"), "Phone, {new}"),
+            (("metadata", "package"), {"weight": 0.5}),
+            (("metadata",), DOCUMENT["metadata"]),
+        ]
+
+    def test_value_is_reported_when_complete(self):
+        parser = JSONStreamParser()
+
+        assert parser.feed('{"aspects": {"Brand": "Ap') == []
+        assert parser.feed('ple", "Storage": 12') == [(("aspects", "Brand"), "Apple")]
+        assert parser.feed("8}") == [
+            (("aspects", "Storage"), 128),
+            (("aspects",), {"Brand": "Apple", "Storage": 128}),
+        ]
+        assert parser.text == '{"aspects": {"Brand": "Apple", "Storage": 128}'
+
+    def test_array_indexes(self):
+        values = _feed('{"items": [1, [2, 3], "x"]}', 1, max_depth=3)
+
+        assert values[:4] == [
+            (("items", 0), 1),
+            (("items", 1, 0), 2),
+            (("items", 1, 1), 3),
+            (("items", 1), [2, 3]),
+        ]
+
+    def test_invalid_document(self):
+        parser = JSONStreamParser()
+
+        with pytest.raises(ValueError):
+            parser.feed('{"a": 1}}')
@@ -0,0 +1,102 @@
+import json
+import uuid
+from dataclasses import asdict
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+from redis import RedisError
+
+from app.infrastructure.api_clients.ebay.models import MarketplaceIdEnum
+from app.infrastructure.listing_settings import ListingSettings, ListingSettingsCache
+from app.infrastructure.marketplace_aspects import EbayPolicies
+
+USER = uuid.UUID("00000000-0000-0000-0000-000000000001")
+
+
+@pytest.fixture
+def listing_settings():
+    return ListingSettings.build(
+        {
+            "fulfillment_policies": [{"id": "fp_1", "name": "Standard"}],
+            "payment_policies": [{"id": "pp_1", "name": "CreditCard"}],
+            "return_policies": [{"id": "rp_1", "name": "ReturnsAccepted"}],
+        },
+        [{"name": "Warehouse A", "merchant_location_key": "loc_1"}],
+    )
+
+
+class TestListingSettings:
+    def test_lookups_ignore_case(self, listing_settings):
+        policies = EbayPolicies(
+            fulfillment_policy="STANDARD",
+            payment_policy="creditcard",
+            return_policy="ReturnsAccepted",
+        )
+
+        assert listing_settings.policy_ids(policies) == ("fp_1", "pp_1", "rp_1")
+        assert listing_settings.location_key("warehouse a") == "loc_1"
+
+    def test_unknown_names(self, listing_settings):
+        policies = EbayPolicies(
+            fulfillment_policy="Standard",
+            payment_policy="Cash",
+            return_policy="ReturnsAccepted",
+        )
+
+        assert listing_settings.policy_ids(policies) is None
+        assert listing_settings.location_key("Warehouse B") is None
+
+
+class TestListingSettingsCache:
+    @pytest.mark.asyncio
+    async def test_set_and_get(self, listing_settings):
+        redis = AsyncMock()
+        cache = ListingSettingsCache(redis=redis, ttl=timedelta(minutes=5))
+
+        await cache.set(USER, "EBAY_US", listing_settings)
+        key, value = redis.set.call_args.args
+        redis.get.return_value = value
+
+        assert key == f"ebay:listing_settings:{USER}:EBAY_US"
+        assert redis.set.call_args.kwargs == {"ex": timedelta(minutes=5)}
+        assert await cache.get(USER, "EBAY_US") == listing_settings
+
+    @pytest.mark.asyncio
+    async def test_get_missing(self):
+        redis = AsyncMock()
+        redis.get.return_value = None
+        cache = ListingSettingsCache(redis=redis, ttl=timedelta(minutes=5))
+
+        assert await cache.get(USER, "EBAY_US") is None
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_all_marketplaces(self):
+        redis = AsyncMock()
+        cache = ListingSettingsCache(redis=redis, ttl=timedelta(minutes=5))
+
+        await cache.invalidate(USER)
+
+        keys = redis.delete.call_args.args
+        assert len(keys) == len(MarketplaceIdEnum)
+        assert f"ebay:listing_settings:{USER}:EBAY_GB" in keys
+
+    @pytest.mark.asyncio
+    async def test_ignores_redis_and_format_errors(self, listing_settings):
+        redis = AsyncMock()
+        redis.set.side_effect = RedisError()
+        redis.delete.side_effect = RedisError()
+        redis.get.return_value = json.dumps({"unknown": {}})
+        cache = ListingSettingsCache(redis=redis, ttl=timedelta(minutes=5))
+
+        await cache.set(USER, "EBAY_US", listing_settings)
+        await cache.invalidate(USER)
+        assert await cache.get(USER, "EBAY_US") is None
+
+        redis.get.side_effect = RedisError()
+        assert await cache.get(USER, "EBAY_US") is None
+
+    def test_settings_roundtrip(self, listing_settings):
+        data = json.loads(json.dumps(asdict(listing_settings)))
+
+        assert ListingSettings(**data) == listing_settings
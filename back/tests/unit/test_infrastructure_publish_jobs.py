@@ -0,0 +1,65 @@
+import os
+import uuid
+from unittest.mock import Mock
+
+import pytest
+from kombu.exceptions import OperationalError
+
+from app.infrastructure.publish_jobs import (
+    PUBLISH_JOB_TASK,
+    CeleryPublishJobQueue,
+    PublishImageStorage,
+)
+from app.services.ports import PublishImageStorageError, PublishJobQueueError
+
+
+class TestPublishImageStorage:
+    @pytest.mark.asyncio
+    async def test_save_and_delete(self, tmp_path):
+        uploads = tmp_path / "uploads"
+        uploads.mkdir()
+        for name in ("b.jpg", "a.jpg"):
+            (uploads / name).write_bytes(name.encode())
+        storage = PublishImageStorage(str(tmp_path / "storage"))
+        job_uuid = uuid.uuid4()
+
+        pathes = await storage.save(
+            job_uuid, str(uploads / "b.jpg"), str(uploads / "a.jpg")
+        )
+
+        assert [os.path.basename(p) for p in pathes] == ["0_b.jpg", "1_a.jpg"]
+        assert open(pathes[0], "rb").read() == b"b.jpg"
+        assert not os.listdir(uploads)
+
+        await storage.delete(job_uuid)
+        assert not os.path.exists(os.path.dirname(pathes[0]))
+
+    @pytest.mark.asyncio
+    async def test_missing_image(self, tmp_path):
+        storage = PublishImageStorage(str(tmp_path))
+
+        with pytest.raises(PublishImageStorageError):
+            await storage.save(uuid.uuid4(), str(tmp_path / "missing.jpg"))
+
+    @pytest.mark.asyncio
+    async def test_delete_missing_job(self, tmp_path):
+        await PublishImageStorage(str(tmp_path)).delete(uuid.uuid4())
+
+
+class TestCeleryPublishJobQueue:
+    @pytest.mark.asyncio
+    async def test_enqueue(self):
+        celery = Mock()
+        job_uuid = uuid.uuid4()
+
+        await CeleryPublishJobQueue(celery).enqueue(job_uuid)
+
+        celery.send_task.assert_called_once_with(PUBLISH_JOB_TASK, args=[str(job_uuid)])
+
+    @pytest.mark.asyncio
+    async def test_broker_error(self):
+        celery = Mock()
+        celery.send_task.side_effect = OperationalError()
+
+        with pytest.raises(PublishJobQueueError):
+            await CeleryPublishJobQueue(celery).enqueue(uuid.uuid4())
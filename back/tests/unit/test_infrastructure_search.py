@@ -0,0 +1,490 @@
+import asyncio
+import json
+from dataclasses import dataclass
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from perplexity import PerplexityError
+
+from app.domain.entities import (
+    AspectField,
+    AspectType,
+    AspectValue,
+    ProductStructure,
+)
+from app.infrastructure.barcode_decoder import BarcodeDecoderBusyError
+from app.infrastructure.search import SearchEngine
+from app.infrastructure.search_cache import ProductSearchCache
+from app.services.ports import ProductQuery, SearchEngineBusyError, SearchEngineError
+
+
+@dataclass
+class MockMetadata:
+    description: str
+
+
+@pytest.fixture
+def product_structure():
+    return ProductStructure(
+        fields=[AspectField(name="brand", data_type=AspectType.STR, is_required=True)]
+    )
+
+
+@pytest.fixture
+def client():
+    client = Mock()
+    client.chat.completions.create = AsyncMock()
+    return client
+
+
+def _completion(content: str):
+    response = Mock()
+    response.choices = [Mock()]
+    response.choices[0].message.content = content
+    return response
+
+
+class TestSearchEngineByProductName:
+    @pytest.mark.asyncio
+    async def test_success(self, client, product_structure):
+        answer = {"aspects": {"brand": "Apple"}, "metadata": {"description": "Phone"}}
+        client.chat.completions.create.return_value = _completion(json.dumps(answer))
+        engine = SearchEngine(client=client, model="sonar-pro", barcode_search_token="")
+
+        product = await engine.by_product_name(
+            MockMetadata, "iPhone 13", "used", product_structure
+        )
+
+        assert product.metadata == MockMetadata("Phone")
+        assert product.aspects[0].value == "Apple"
+        kwargs = client.chat.completions.create.await_args.kwargs
+        assert kwargs["model"] == "sonar-pro"
+        assert kwargs["response_format"]["type"] == "json_schema"
+        assert "Comment: used" in kwargs["messages"][1]["content"][0]["text"]
+
+    @pytest.mark.asyncio
+    async def test_timeout(self, client, product_structure):
+        async def slow(**kwargs):
+            await asyncio.sleep(10)
+
+        client.chat.completions.create.side_effect = slow
+        engine = SearchEngine(
+            client=client,
+            model="sonar-pro",
+            barcode_search_token="",
+            request_timeout=0.01,
+        )
+
+        with pytest.raises(SearchEngineError, match="timed out"):
+            await engine.by_product_name(MockMetadata, "iPhone", "", product_structure)
+
+    @pytest.mark.asyncio
+    async def test_client_error(self, client, product_structure):
+        client.chat.completions.create.side_effect = PerplexityError()
+        engine = SearchEngine(client=client, model="sonar-pro", barcode_search_token="")
+
+        with pytest.raises(SearchEngineError):
+            await engine.by_product_name(MockMetadata, "iPhone", "", product_structure)
+
+    @pytest.mark.asyncio
+    async def test_invalid_answer(self, client, product_structure):
+        client.chat.completions.create.return_value = _completion("not json")
+        engine = SearchEngine(client=client, model="sonar-pro", barcode_search_token="")
+
+        with pytest.raises(SearchEngineError, match="parse"):
+            await engine.by_product_name(MockMetadata, "iPhone", "", product_structure)
+
+    @pytest.mark.asyncio
+    async def test_cancellation_reaches_request(self, client, product_structure):
+        cancelled = asyncio.Event()
+
+        async def slow(**kwargs):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        client.chat.completions.create.side_effect = slow
+        engine = SearchEngine(client=client, model="sonar-pro", barcode_search_token="")
+
+        task = asyncio.ensure_future(
+            engine.by_product_name(MockMetadata, "iPhone", "", product_structure)
+        )
+        await asyncio.sleep(0.01)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_cancellation_reaches_cached_request(self, client, product_structure):
+        cancelled = asyncio.Event()
+
+        async def slow(**kwargs):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        redis = AsyncMock()
+        redis.get.return_value = None
+        client.chat.completions.create.side_effect = slow
+        engine = SearchEngine(
+            client=client,
+            model="sonar-pro",
+            barcode_search_token="",
+            cache=ProductSearchCache(redis=redis, ttl=timedelta(hours=1)),
+        )
+
+        task = asyncio.ensure_future(
+            engine.by_product_name(MockMetadata, "iPhone", "", product_structure)
+        )
+        await asyncio.sleep(0.01)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+
+def _stream(*contents: str):
+    class Stream:
+        def __init__(self):
+            self.closed = False
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            self.closed = True
+
+        async def __aiter__(self):
+            for content in contents:
+                chunk = Mock()
+                chunk.choices = [Mock()]
+                chunk.choices[0].delta.content = content
+                yield chunk
+
+    return Stream()
+
+
+class TestSearchEnginePartialLookups:
+    @pytest.mark.asyncio
+    async def test_metadata_by_product_name(self, client):
+        answer = {"metadata": {"description": "Phone"}}
+        client.chat.completions.create.return_value = _completion(json.dumps(answer))
+        engine = SearchEngine(client=client, model="sonar-pro", barcode_search_token="")
+
+        metadata = await engine.metadata_by_product_name(MockMetadata, "iPhone", "")
+
+        assert metadata == MockMetadata("Phone")
+        kwargs = client.chat.completions.create.await_args.kwargs
+        schema = kwargs["response_format"]["json_schema"]["schema"]
+        assert schema["required"] == ["metadata"]
+
+    @pytest.mark.asyncio
+    async def test_aspects_by_product_name(self, client, product_structure):
+        answer = {"aspects": {"brand": "Apple"}}
+        client.chat.completions.create.return_value = _completion(json.dumps(answer))
+        engine = SearchEngine(client=client, model="sonar-pro", barcode_search_token="")
+
+        aspects = await engine.aspects_by_product_name("iPhone", "", product_structure)
+
+        assert aspects == [AspectValue(name="brand", value="Apple", is_required=True)]
+        kwargs = client.chat.completions.create.await_args.kwargs
+        schema = kwargs["response_format"]["json_schema"]["schema"]
+        assert schema["required"] == ["aspects"]
+
+    @pytest.mark.asyncio
+    async def test_metadata_uses_cache(self, client):
+        async def single_flight(key, func):
+            return await func()
+
+        cache = AsyncMock()
+        cache.key = Mock(return_value="key")
+        cache.get.return_value = json.dumps({"metadata": {"description": "X"}})
+        cache.single_flight.side_effect = single_flight
+        engine = SearchEngine(
+            client=client, model="sonar-pro", barcode_search_token="", cache=cache
+        )
+
+        metadata = await engine.metadata_by_product_name(MockMetadata, "iPhone", "")
+
+        assert metadata == MockMetadata("X")
+        client.chat.completions.create.assert_not_called()
+
+
+class TestSearchEngineStreamByProductName:
+    @pytest.mark.asyncio
+    async def test_yields_parts_as_they_arrive(self, client, product_structure):
+        client.chat.completions.create.return_value = _stream(
+            '{"aspects": {"br',
+            'and": "Apple"}, "metadata": ',
+            '{"description": "Phone"}}',
+        )
+        engine = SearchEngine(client=client, model="sonar-pro", barcode_search_token="")
+
+        parts = [
+            part
+            async for part in engine.stream_by_product_name(
+                MockMetadata, "iPhone", "", product_structure
+            )
+        ]
+
+        assert parts == [
+            AspectValue(name="brand", value="Apple", is_required=True),
+            MockMetadata("Phone"),
+        ]
+        assert client.chat.completions.create.await_args.kwargs["stream"] is True
+
+    @pytest.mark.asyncio
+    async def test_skips_invalid_values(self, client, product_structure):
+        client.chat.completions.create.return_value = _stream(
+            '{"aspects": {"brand": 1, "brand": "Apple"}, '
+            '"metadata": {"description": "Phone"}}'
+        )
+        engine = SearchEngine(client=client, model="sonar-pro", barcode_search_token="")
+
+        parts = [
+            part
+            async for part in engine.stream_by_product_name(
+                MockMetadata, "iPhone", "", product_structure
+            )
+        ]
+
+        assert parts[0] == AspectValue(name="brand", value="Apple", is_required=True)
+
+    @pytest.mark.asyncio
+    async def test_incomplete_answer(self, client, product_structure):
+        client.chat.completions.create.return_value = _stream(
+            '{"aspects": {}, "metadata": {"description": "Phone"}}'
+        )
+        engine = SearchEngine(client=client, model="sonar-pro", barcode_search_token="")
+
+        parts = engine.stream_by_product_name(
+            MockMetadata, "iPhone", "", product_structure
+        )
+        assert await anext(parts) == MockMetadata("Phone")
+        with pytest.raises(SearchEngineError, match="parse"):
+            await anext(parts)
+
+    @pytest.mark.asyncio
+    async def test_answer_is_cached(self, client, product_structure):
+        answer = '{"aspects": {"brand": "Apple"}, "metadata": {"description": "P"}}'
+        client.chat.completions.create.return_value = _stream(answer)
+        cache = AsyncMock()
+        cache.key = Mock(return_value="key")
+        cache.get.return_value = None
+        engine = SearchEngine(
+            client=client, model="sonar-pro", barcode_search_token="", cache=cache
+        )
+
+        async for _ in engine.stream_by_product_name(
+            MockMetadata, "iPhone", "", product_structure
+        ):
+            pass
+
+        cache.set.assert_awaited_once_with("key", answer)
+
+        cache.get.return_value = answer
+        client.chat.completions.create.reset_mock()
+        parts = [
+            part
+            async for part in engine.stream_by_product_name(
+                MockMetadata, "iPhone", "", product_structure
+            )
+        ]
+
+        assert len(parts) == 2
+        client.chat.completions.create.assert_not_awaited()
+
+
+def _batch_answer(*entries: tuple[int, str]) -> str:
+    return json.dumps(
+        {
+            "products": [
+                {
+                    "index": index,
+                    "product": {
+                        "aspects": {"brand": brand},
+                        "metadata": {"description": f"{brand} phone"},
+                    },
+                }
+                for index, brand in entries
+            ]
+        }
+    )
+
+
+def _prompt(call) -> str:
+    return call.kwargs["messages"][1]["content"][0]["text"]
+
+
+class TestSearchEngineBarcodesOnImage:
+    @pytest.mark.asyncio
+    async def test_decoder_busy(self, client):
+        decoder = Mock()
+        decoder.decode = AsyncMock(side_effect=BarcodeDecoderBusyError())
+        engine = SearchEngine(
+            client=client,
+            model="sonar-pro",
+            barcode_search_token="",
+            barcode_decoder=decoder,
+        )
+
+        with pytest.raises(SearchEngineBusyError):
+            await engine.barecodes_on_image("image.jpg")
+
+    @pytest.mark.asyncio
+    async def test_decode_error(self, client):
+        decoder = Mock()
+        decoder.decode = AsyncMock(side_effect=ValueError())
+        engine = SearchEngine(
+            client=client,
+            model="sonar-pro",
+            barcode_search_token="",
+            barcode_decoder=decoder,
+        )
+
+        with pytest.raises(SearchEngineError, match="decode"):
+            await engine.barecodes_on_image("image.jpg")
+
+
+class TestSearchEngineByProductNames:
+    @pytest.mark.asyncio
+    async def test_one_request_per_batch(self, client, product_structure):
+        client.chat.completions.create.return_value = _completion(
+            _batch_answer((1, "Samsung"), (0, "Apple"))
+        )
+        engine = SearchEngine(client=client, model="sonar-pro", barcode_search_token="")
+
+        results = await engine.by_product_names(
+            MockMetadata,
+            [ProductQuery("iPhone"), ProductQuery("Galaxy", "used")],
+            product_structure,
+        )
+
+        assert [r.product.aspects[0].value for r in results] == ["Apple", "Samsung"]
+        assert all(r.error is None for r in results)
+        call = client.chat.completions.create.await_args
+        assert "0. iPhone\n1. Galaxy (comment: used)" in _prompt(call)
+        schema = call.kwargs["response_format"]["json_schema"]["schema"]
+        assert schema["properties"]["products"]["type"] == "array"
+        assert "Aspects" in schema["$defs"]
+        assert "Product" in schema["$defs"]
+
+    @pytest.mark.asyncio
+    async def test_retries_only_failed_products(self, client, product_structure):
+        client.chat.completions.create.side_effect = [
+            _completion(
+                json.dumps(
+                    {
+                        "products": [
+                            {
+                                "index": 0,
+                                "product": {
+                                    "aspects": {"brand": "Apple"},
+                                    "metadata": {"description": "Phone"},
+                                },
+                            },
+                            {
+                                "index": 1,
+                                "product": {"aspects": {}, "metadata": {}},
+                            },
+                        ]
+                    }
+                )
+            ),
+            _completion(_batch_answer((0, "Samsung"), (1, "Sony"))),
+        ]
+        engine = SearchEngine(client=client, model="sonar-pro", barcode_search_token="")
+
+        results = await engine.by_product_names(
+            MockMetadata,
+            [ProductQuery("iPhone"), ProductQuery("Galaxy"), ProductQuery("Xperia")],
+            product_structure,
+        )
+
+        assert [r.product.aspects[0].value for r in results] == [
+            "Apple",
+            "Samsung",
+            "Sony",
+        ]
+        retry = client.chat.completions.create.await_args_list[1]
+        assert "0. Galaxy\n1. Xperia" in _prompt(retry)
+        assert "iPhone" not in _prompt(retry)
+
+    @pytest.mark.asyncio
+    async def test_reports_products_failed_after_attempts(
+        self, client, product_structure
+    ):
+        client.chat.completions.create.side_effect = [
+            _completion(_batch_answer((0, "Apple"))),
+            _completion(_batch_answer()),
+            _completion("not json"),
+        ]
+        engine = SearchEngine(
+            client=client,
+            model="sonar-pro",
+            barcode_search_token="",
+            batch_attempts=3,
+        )
+
+        results = await engine.by_product_names(
+            MockMetadata,
+            [ProductQuery("iPhone"), ProductQuery("Galaxy")],
+            product_structure,
+        )
+
+        assert results[0].error is None
+        assert results[1].product is None
+        assert isinstance(results[1].error, SearchEngineError)
+        assert client.chat.completions.create.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_splits_into_batches(self, client, product_structure):
+        async def answer(**kwargs):
+            count = _prompt(Mock(kwargs=kwargs)).count("Phone ")
+            return _completion(_batch_answer(*((n, "Apple") for n in range(count))))
+
+        client.chat.completions.create.side_effect = answer
+        engine = SearchEngine(
+            client=client, model="sonar-pro", barcode_search_token="", batch_size=2
+        )
+
+        queries = [ProductQuery(f"Phone {n}") for n in range(5)]
+        results = await engine.by_product_names(
+            MockMetadata, queries, product_structure
+        )
+
+        assert all(r.error is None for r in results)
+        assert client.chat.completions.create.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_uses_and_fills_cache(self, client, product_structure):
+        cached = json.dumps(
+            {"aspects": {"brand": "Apple"}, "metadata": {"description": "Phone"}}
+        )
+        cache = AsyncMock()
+        cache.key = Mock(side_effect=lambda name, *args: name)
+        cache.get.side_effect = lambda key: cached if key == "iPhone" else None
+        client.chat.completions.create.return_value = _completion(
+            _batch_answer((0, "Samsung"))
+        )
+        engine = SearchEngine(
+            client=client, model="sonar-pro", barcode_search_token="", cache=cache
+        )
+
+        results = await engine.by_product_names(
+            MockMetadata,
+            [ProductQuery("iPhone"), ProductQuery("Galaxy")],
+            product_structure,
+        )
+
+        assert [r.product.aspects[0].value for r in results] == ["Apple", "Samsung"]
+        assert "iPhone" not in _prompt(client.chat.completions.create.await_args)
+        assert cache.set.await_args.args[0] == "Galaxy"
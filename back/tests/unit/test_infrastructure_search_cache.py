@@ -0,0 +1,156 @@
+import asyncio
+import json
+from dataclasses import dataclass
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from redis import RedisError
+
+from app.domain.entities import AspectField, AspectType, ProductStructure
+from app.infrastructure.adapter import ProductAdapter
+from app.infrastructure.search import SearchEngine
+from app.infrastructure.search_cache import ProductSearchCache
+
+SCHEMA = {"type": "object", "properties": {"brand": {"type": "string"}}}
+
+
+@dataclass
+class MockMetadata:
+    description: str
+
+
+@pytest.fixture
+def redis():
+    redis = AsyncMock()
+    store = {}
+
+    async def get(key):
+        return store.get(key)
+
+    async def set(key, value, ex=None):
+        store[key] = value.encode()
+
+    redis.get.side_effect = get
+    redis.set.side_effect = set
+    return redis
+
+
+@pytest.fixture
+def cache(redis):
+    return ProductSearchCache(redis=redis, ttl=timedelta(hours=1))
+
+
+@pytest.fixture
+def product_structure():
+    return ProductStructure(
+        fields=[AspectField(name="brand", data_type=AspectType.STR, is_required=True)]
+    )
+
+
+def _answer(brand: str = "Apple") -> str:
+    return json.dumps(
+        {"aspects": {"brand": brand}, "metadata": {"description": "Phone"}}
+    )
+
+
+def _completion(content: str):
+    response = Mock()
+    response.choices = [Mock()]
+    response.choices[0].message.content = content
+    return response
+
+
+class TestProductSearchCache:
+    def test_key_normalizes_name(self):
+        key = ProductSearchCache.key("  iPhone   13 ", SCHEMA, "used ", "sonar-pro")
+
+        assert key.startswith("perplexity:product:")
+        assert key == ProductSearchCache.key("iphone 13", SCHEMA, "used", "sonar-pro")
+
+    def test_key_depends_on_request(self):
+        key = ProductSearchCache.key("iPhone 13", SCHEMA, "", "sonar-pro")
+        other_schema = {**SCHEMA, "required": ["brand"]}
+
+        assert key != ProductSearchCache.key("iPhone 14", SCHEMA, "", "sonar-pro")
+        assert key != ProductSearchCache.key("iPhone 13", other_schema, "", "sonar-pro")
+        assert key != ProductSearchCache.key("iPhone 13", SCHEMA, "new", "sonar-pro")
+        assert key != ProductSearchCache.key("iPhone 13", SCHEMA, "", "sonar")
+
+    @pytest.mark.asyncio
+    async def test_set_and_get(self, cache, redis):
+        await cache.set("key", "value")
+
+        assert await cache.get("key") == "value"
+        assert redis.set.call_args.kwargs == {"ex": timedelta(hours=1)}
+
+    @pytest.mark.asyncio
+    async def test_ignores_redis_errors(self, cache, redis):
+        redis.get.side_effect = RedisError()
+        redis.set.side_effect = RedisError()
+
+        await cache.set("key", "value")
+        assert await cache.get("key") is None
+
+
+class TestSearchEngineCache:
+    @pytest.mark.asyncio
+    async def test_answer_is_reused(self, cache, product_structure):
+        client = Mock()
+        client.chat.completions.create = AsyncMock(return_value=_completion(_answer()))
+        engine = SearchEngine(
+            client=client, model="sonar-pro", barcode_search_token="", cache=cache
+        )
+
+        first = await engine.by_product_name(
+            MockMetadata, "iPhone 13", "", product_structure
+        )
+        second = await engine.by_product_name(
+            MockMetadata, "iphone  13", "", product_structure
+        )
+
+        assert client.chat.completions.create.call_count == 1
+        assert first.metadata == second.metadata == MockMetadata("Phone")
+        assert second.aspects[0].value == "Apple"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_request(self, cache, product_structure):
+        client = Mock()
+        client.chat.completions.create = AsyncMock(return_value=_completion(_answer()))
+        engine = SearchEngine(
+            client=client, model="sonar-pro", barcode_search_token="", cache=cache
+        )
+
+        products = await asyncio.gather(
+            *(
+                engine.by_product_name(MockMetadata, "iPhone 13", "", product_structure)
+                for _ in range(5)
+            )
+        )
+
+        assert client.chat.completions.create.call_count == 1
+        assert len(products) == 5
+
+    @pytest.mark.asyncio
+    async def test_invalid_cached_answer_is_replaced(
+        self, cache, redis, product_structure
+    ):
+        client = Mock()
+        client.chat.completions.create = AsyncMock(
+            return_value=_completion(_answer("Sony"))
+        )
+        engine = SearchEngine(
+            client=client, model="sonar-pro", barcode_search_token="", cache=cache
+        )
+        schema = ProductAdapter(metadata_type=MockMetadata).to_schema(
+            product_structure.fields
+        )
+        key = ProductSearchCache.key("iPhone 13", schema, "", "sonar-pro")
+        await cache.set(key, "not json")
+
+        product = await engine.by_product_name(
+            MockMetadata, "iPhone 13", "", product_structure
+        )
+
+        assert product.aspects[0].value == "Sony"
+        assert await cache.get(key) == _answer("Sony")
@@ -0,0 +1,195 @@
+import asyncio
+from contextlib import aclosing, asynccontextmanager
+from unittest.mock import Mock
+
+import pytest
+
+from app.infrastructure.api_clients.ebay import (
+    EbaySellingClient,
+    EbaySellingClientError,
+)
+from app.infrastructure.api_clients.ebay import models
+
+
+class FakeResponse:
+    def __init__(self, data, status=200):
+        self.data = data
+        self.status = status
+        self.ok = status < 400
+        self.request_info = Mock()
+        self.history = ()
+        self.headers = {}
+
+    async def json(self):
+        return self.data
+
+    async def text(self):
+        return str(self.data)
+
+
+class FakeSession:
+    def __init__(self, total, status=200):
+        self.total = total
+        self.status = status
+        self.offsets = []
+        self.cancelled = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @asynccontextmanager
+    async def get(self, url, params, headers):
+        offset, limit = params["offset"], params["limit"]
+        self.offsets.append(offset)
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            # later pages answer first to check that the order is kept
+            await asyncio.sleep(0.001 * (self.total - offset) / limit)
+        except asyncio.CancelledError:
+            self.cancelled.append(offset)
+            raise
+        finally:
+            self.in_flight -= 1
+
+        locations = [
+            {"name": f"Location {i}", "merchantLocationKey": f"loc_{i}"}
+            for i in range(offset, min(offset + limit, self.total))
+        ]
+        yield FakeResponse({"total": self.total, "locations": locations}, self.status)
+
+
+def make_client(session):
+    return EbaySellingClient("api.ebay.com", Mock(), session)
+
+
+class TestIterLocations:
+    @pytest.mark.asyncio
+    async def test_fetches_remaining_pages_concurrently(self):
+        session = FakeSession(total=45)
+
+        locations = [
+            location
+            async for location in make_client(session).iter_locations(
+                "token", page_size=10, concurrency=3
+            )
+        ]
+
+        assert [loc["merchant_location_key"] for loc in locations] == [
+            f"loc_{i}" for i in range(45)
+        ]
+        assert sorted(session.offsets) == [0, 10, 20, 30, 40]
+        assert session.max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_early_stop_cancels_pending_pages(self):
+        session = FakeSession(total=100)
+
+        async with aclosing(
+            make_client(session).iter_locations("token", page_size=10)
+        ) as locations:
+            async for location in locations:
+                if location["name"] == "Location 12":
+                    break
+
+        assert session.cancelled
+        assert session.in_flight == 0
+        assert 90 not in session.offsets
+
+    @pytest.mark.asyncio
+    async def test_get_locations(self):
+        session = FakeSession(total=3)
+
+        locations = await make_client(session).get_locations("token")
+
+        assert locations[0] == {"name": "Location 0", "merchant_location_key": "loc_0"}
+        assert session.offsets == [0]
+
+    @pytest.mark.asyncio
+    async def test_http_error(self):
+        with pytest.raises(EbaySellingClientError) as exc_info:
+            await make_client(FakeSession(total=3, status=500)).get_locations("token")
+
+        assert exc_info.value.status == 500
+
+
+class FakeBulkSession:
+    def __init__(self, responses, status=207):
+        self.responses = responses
+        self.status = status
+        self.requests = []
+
+    @asynccontextmanager
+    async def post(self, url, json, headers):
+        self.requests.append((url.rsplit("/", 1)[-1], json, headers))
+        yield FakeResponse({"responses": self.responses}, self.status)
+
+
+class TestBulkRequests:
+    @pytest.mark.asyncio
+    async def test_bulk_create_or_replace_inventory_item(self):
+        session = FakeBulkSession(
+            [
+                {"statusCode": 200, "sku": "A"},
+                {
+                    "statusCode": 400,
+                    "sku": "B",
+                    "errors": [{"errorId": 25001, "message": "Bad item"}],
+                },
+            ]
+        )
+        item = models.BulkInventoryItem(
+            sku="A",
+            locale="en_US",
+            product=models.Product(title="Item", description="Item"),
+            condition=models.ConditionEnum.NEW,
+            availability=models.Availability(),
+            package_weight_and_size=models.PackageWeightAndSize(
+                weight=models.Weight(unit="KILOGRAM", value=1)
+            ),
+        )
+
+        results = await make_client(session).bulk_create_or_replace_inventory_item(
+            [item, item.model_copy(update={"sku": "B"})], "token"
+        )
+
+        path, body, headers = session.requests[0]
+        assert path == "bulk_create_or_replace_inventory_item"
+        assert [r["sku"] for r in body["requests"]] == ["A", "B"]
+        assert body["requests"][0]["packageWeightAndSize"]["weight"]["value"] == 1
+        assert headers["Content-Language"] == "en-US"
+        assert results[0].ok
+        assert not results[1].ok
+        assert results[1].error_message() == "Bad item"
+
+    @pytest.mark.asyncio
+    async def test_bulk_publish_offer(self):
+        session = FakeBulkSession(
+            [{"statusCode": 200, "offerId": "1", "listingId": "L1"}], status=200
+        )
+
+        results = await make_client(session).bulk_publish_offer(["1"], "token")
+
+        _, body, headers = session.requests[0]
+        assert body == {"requests": [{"offerId": "1"}]}
+        assert "Content-Language" not in headers
+        assert results[0].listing_id == "L1"
+
+    @pytest.mark.asyncio
+    async def test_limit(self):
+        session = FakeBulkSession([])
+
+        with pytest.raises(ValueError):
+            await make_client(session).bulk_publish_offer(
+                [str(i) for i in range(26)], "token"
+            )
+        assert not session.requests
+
+    @pytest.mark.asyncio
+    async def test_http_error(self):
+        session = FakeBulkSession([], status=400)
+
+        with pytest.raises(EbaySellingClientError) as exc_info:
+            await make_client(session).bulk_create_offer([], "token")
+
+        assert exc_info.value.status == 400
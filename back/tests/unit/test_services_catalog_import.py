@@ -0,0 +1,371 @@
+import asyncio
+import json
+import uuid
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.domain.dto import (
+    AspectValueDTO,
+    CatalogImportOptionsDTO,
+    ImportResultDTO,
+    MarketplaceAccountDTO,
+    ProductCategoriesDTO,
+    ProductDTO,
+)
+from app.domain.ports import (
+    InvalidProductAspects,
+    ISearchService,
+    ISellingService,
+    MarketplaceAuthorizationFailed,
+    ProductCategoriesNotFound,
+)
+from app.infrastructure.search import SearchEngine
+from app.services.catalog_import import CatalogImportService
+from app.services.pipeline import Stage, pipeline
+from app.services.search import SearchService
+from app.utils.catalog import read_catalog, report_line
+
+USER = uuid.UUID("550e8400-e29b-41d4-a716-446655440000")
+
+
+async def _rows(*rows: dict):
+    for line, row in enumerate(rows, start=2):
+        yield line, row
+
+
+async def _collect(results) -> list:
+    return [result async for result in results]
+
+
+@pytest.fixture
+def account_dto():
+    return MarketplaceAccountDTO(user_uuid=USER, marketplace="ebay")
+
+
+@pytest.fixture
+def options():
+    return CatalogImportOptionsDTO(
+        currency="USD",
+        country="US",
+        marketplace_aspects_data={"condition": "NEW"},
+        search_settings={"options": {"marketplace": "EBAY_US"}},
+    )
+
+
+@pytest.fixture
+def searcher():
+    searcher = AsyncMock(spec=ISearchService)
+    searcher.recognize_barcode.side_effect = lambda barcode, *args, **kwargs: (
+        ProductCategoriesDTO(f"Product {barcode}", ["Cell Phones"])
+    )
+    searcher.product_categories.side_effect = lambda name, *args, **kwargs: (
+        ProductCategoriesDTO(name, ["Tablets", "Cell Phones"])
+    )
+    searcher.product_aspects.return_value = ProductDTO(
+        metadata={"description": "Phone", "package": {"weight": 1}},
+        aspects=[
+            AspectValueDTO("Brand", "Apple", True),
+            AspectValueDTO("Color", None, False),
+        ],
+    )
+    return searcher
+
+
+@pytest.fixture
+def seller():
+    return AsyncMock(spec=ISellingService)
+
+
+@pytest.fixture
+def service(searcher, seller):
+    return CatalogImportService(searcher=searcher, seller=seller)
+
+
+class TestPipeline:
+    @pytest.mark.asyncio
+    async def test_items_pass_all_stages(self):
+        async def source():
+            for i in range(20):
+                yield [i]
+
+        async def add(item):
+            await asyncio.sleep(0)
+            item.append("added")
+
+        async def double(item):
+            item.append(item[0] * 2)
+
+        stages = [Stage("add", add, concurrency=3), Stage("double", double)]
+        results = await _collect(pipeline(source(), stages))
+
+        assert sorted(r.item[0] for r in results) == list(range(20))
+        assert all(r.item[1:] == ["added", r.item[0] * 2] for r in results)
+        assert all(r.error is None for r in results)
+
+    @pytest.mark.asyncio
+    async def test_stages_are_bounded(self):
+        running = 0
+        max_running = 0
+        read = 0
+
+        async def source():
+            nonlocal read
+            for i in range(30):
+                read += 1
+                yield i
+
+        async def slow(item):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.001)
+            running -= 1
+
+        results = pipeline(source(), [Stage("slow", slow, concurrency=2)])
+        first = await anext(results)
+        # the source is read only as far as the bounded queues allow
+        assert read < 30
+        rest = await _collect(results)
+
+        assert len(rest) + 1 == 30
+        assert first.error is None
+        assert max_running == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_item_skips_next_stages(self):
+        async def source():
+            for i in range(4):
+                yield i
+
+        async def check(item):
+            if item % 2:
+                raise ValueError(item)
+
+        last = AsyncMock()
+        stages = [Stage("check", check), Stage("last", last)]
+        results = await _collect(pipeline(source(), stages, errors=(ValueError,)))
+
+        failed = {r.item: r for r in results if r.error is not None}
+        assert set(failed) == {1, 3}
+        assert all(r.failed_stage == "check" for r in failed.values())
+        assert sorted(call.args[0] for call in last.await_args_list) == [0, 2]
+
+    @pytest.mark.asyncio
+    async def test_unexpected_error_stops_pipeline(self):
+        async def source():
+            for i in range(100):
+                yield i
+
+        async def fail(item):
+            if item == 3:
+                raise RuntimeError()
+
+        with pytest.raises(RuntimeError):
+            await _collect(
+                pipeline(source(), [Stage("fail", fail)], errors=(ValueError,))
+            )
+
+
+class TestCatalogImportService:
+    @pytest.mark.asyncio
+    async def test_publish_rows(self, service, searcher, seller, account_dto, options):
+        rows = _rows(
+            {"barcode": "123", "price": "10.5", "images": ["/img/a.jpg"]},
+            {"product_name": "iPad", "price": 20, "quantity": "3"},
+        )
+
+        results = await _collect(service.run(rows, account_dto, options))
+
+        assert sorted((r.line, r.published) for r in results) == [
+            (2, True),
+            (3, True),
+        ]
+        assert seller.publish.await_count == 2
+
+        calls = {call.args[0].title: call for call in seller.publish.await_args_list}
+        item = calls["Product 123"].args[0]
+        assert calls["Product 123"].args[1:] == (account_dto, "/img/a.jpg")
+        assert item.price == 10.5
+        assert item.quantity == 1
+        assert item.category == "Cell Phones"
+        assert item.description == "Phone"
+        assert item.product_aspects == {"Brand": "Apple"}
+        assert item.marketplace_aspects_data == {
+            "condition": "NEW",
+            "package": {"weight": 1},
+        }
+        assert calls["iPad"].args[0].category == "Tablets"
+        assert calls["iPad"].args[0].quantity == 3
+        searcher.recognize_barcode.assert_awaited_once_with(
+            "123", "ebay", options={"marketplace": "EBAY_US"}
+        )
+
+    @pytest.mark.asyncio
+    async def test_known_category_skips_recognition(
+        self, service, searcher, account_dto, options
+    ):
+        rows = _rows({"product_name": "iPad", "category": "Tablets", "price": 1})
+
+        results = await _collect(service.run(rows, account_dto, options))
+
+        assert results[0].published
+        searcher.product_categories.assert_not_awaited()
+        searcher.recognize_barcode.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_failed_rows_are_reported(
+        self, service, searcher, seller, account_dto, options
+    ):
+        searcher.product_categories.side_effect = ProductCategoriesNotFound()
+
+        async def validate(item, account):
+            if item.price > 100:
+                raise InvalidProductAspects()
+
+        seller.validate.side_effect = validate
+        rows = _rows(
+            {"price": 1},
+            {"product_name": "iPad", "price": 1},
+            {"barcode": "123", "price": "abc"},
+            {"barcode": "123", "price": 200},
+            {"product_name": "iPad", "price": 1, "images": "a.jpg"},
+        )
+
+        results = await _collect(service.run(rows, account_dto, options))
+        results = {r.line: r for r in results}
+
+        assert not any(r.published for r in results.values())
+        assert (results[2].stage, results[2].error) == ("parse", "invalid_row")
+        assert (results[3].stage, results[3].error) == (
+            "recognition",
+            "categories_not_found",
+        )
+        assert (results[4].stage, results[4].error) == ("parse", "invalid_row")
+        assert (results[5].stage, results[5].error) == (
+            "validation",
+            "invalid_product_aspects",
+        )
+        assert results[5].product_name == "Product 123"
+        assert (results[6].stage, results[6].error) == ("parse", "invalid_row")
+        seller.publish.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_authorization_failure_stops_import(
+        self, service, seller, account_dto, options
+    ):
+        seller.validate.side_effect = MarketplaceAuthorizationFailed()
+        rows = _rows(*({"barcode": str(i), "price": 1} for i in range(10)))
+
+        with pytest.raises(MarketplaceAuthorizationFailed):
+            await _collect(service.run(rows, account_dto, options))
+
+
+class FakeResponse:
+    def __init__(self, data, status=200):
+        self.data = data
+        self.status = status
+        self.ok = status < 400
+        self.request_info = Mock()
+        self.history = ()
+        self.headers = {}
+
+    async def json(self):
+        return self.data
+
+    async def text(self):
+        return str(self.data)
+
+
+class FakeBarcodeSession:
+    def __init__(self, titles: dict[str, str]):
+        self.titles = titles
+
+    @asynccontextmanager
+    async def get(self, url, headers, params):
+        title = self.titles.get(params["upc"])
+        if title is None:
+            yield FakeResponse({}, status=404)
+        else:
+            yield FakeResponse({"item_attributes": {"title": title}})
+
+
+class TestCatalogImportBarcodeRows:
+    @pytest.mark.asyncio
+    async def test_barcodes_are_looked_up_by_search_engine(
+        self, seller, account_dto, options
+    ):
+        engine = SearchEngine(
+            client=Mock(),
+            model="sonar-pro",
+            barcode_search_token="token",
+            http_session=FakeBarcodeSession({"123": "iPhone 13"}),
+        )
+        predictor = AsyncMock()
+        predictor.predict.return_value = ["Cell Phones"]
+        searcher = SearchService(
+            search=engine,
+            api_factory=Mock(),
+            predictors_factory=Mock(get=Mock(return_value=predictor)),
+            metadata_factory=Mock(),
+        )
+        searcher.product_aspects = AsyncMock(
+            return_value=ProductDTO(metadata={}, aspects=[])
+        )
+        service = CatalogImportService(searcher=searcher, seller=seller)
+        rows = _rows({"barcode": "123", "price": 1}, {"barcode": "404", "price": 1})
+
+        results = await _collect(service.run(rows, account_dto, options))
+        results = {r.line: r for r in results}
+
+        assert results[2].published
+        assert results[2].product_name == "iPhone 13"
+        assert (results[3].stage, results[3].error) == ("recognition", "search_failed")
+        predictor.predict.assert_awaited_once_with(
+            "iPhone 13", options={"marketplace": "EBAY_US"}
+        )
+
+
+class TestCatalogReader:
+    @pytest.mark.asyncio
+    async def test_read_csv(self, tmp_path):
+        path = tmp_path / "catalog.csv"
+        path.write_text(
+            'barcode,product_name,price,images\n123,,10,"a.jpg; b.jpg"\n,iPad,20,\n',
+            encoding="utf-8",
+        )
+
+        rows = await _collect(read_catalog(str(path), "/images"))
+
+        assert [line for line, _ in rows] == [2, 3]
+        assert rows[0][1]["images"] == ["/images/a.jpg", "/images/b.jpg"]
+        assert rows[1][1]["product_name"] == "iPad"
+        assert rows[1][1]["images"] == []
+
+    @pytest.mark.asyncio
+    async def test_read_jsonl(self, tmp_path):
+        path = tmp_path / "catalog.jsonl"
+        path.write_text(
+            '{"barcode": "123", "price": 10, "images": ["../a.jpg"]}\n\nnot json\n',
+            encoding="utf-8",
+        )
+
+        rows = await _collect(read_catalog(str(path), "/images"))
+
+        assert rows == [
+            (1, {"barcode": "123", "price": 10, "images": ["/images/a.jpg"]}),
+            (3, {}),
+        ]
+
+    def test_report_line(self):
+        line = report_line(ImportResultDTO(line=2, published=True, product_name="X"))
+
+        assert json.loads(line) == {
+            "line": 2,
+            "status": "published",
+            "product_name": "X",
+            "stage": None,
+            "error": None,
+            "message": None,
+        }
@@ -4,7 +4,7 @@ from unittest.mock import Mock, AsyncMock
 from app.services.marketplace_account import MarketplaceAccountService
 from app.services.common import MarketplaceTokenManager
 from app.domain.dto import MarketplaceAccountDTO, AccountSettingsDTO
-from app.domain.entities import AccountSettings
+from app.domain.entities import AccountSettings, MarketplaceAccount
 from app.domain.ports import (
     MarketplaceAuthorizationFailed,
     MarketplaceAccountServiceError,
@@ -47,7 +47,7 @@ def sample_account_dto():
 
 @pytest.fixture
 def mock_marketplace_api():
-    api = Mock()
+    api = AsyncMock()
 
     account_settings = AccountSettings(
         settings=dict(
@@ -80,7 +80,13 @@ class TestMarketplaceAccountServiceFindSettings:
         assert isinstance(result, dict)
         mock_token_manager.access_token.assert_called_once()
         mock_api_factory.get.assert_called_once()
-        mock_marketplace_api.get_account_settings.assert_called_once_with("token")
+        mock_marketplace_api.get_account_settings.assert_called_once_with(
+            "token",
+            account=MarketplaceAccount(
+                user_uuid=sample_account_dto.user_uuid,
+                marketplace=sample_account_dto.marketplace,
+            ),
+        )
 
     @pytest.mark.asyncio
     async def test_find_settings_returns_correct_dto(
@@ -112,7 +118,7 @@ class TestMarketplaceAccountServiceFindSettings:
         mock_token_manager,
         sample_account_dto,
     ):
-        mock_api = Mock()
+        mock_api = AsyncMock()
         account_settings = AccountSettings(
             settings=dict(
                 fulfillment_policies=[],
@@ -137,7 +143,7 @@ class TestMarketplaceAccountServiceFindSettings:
         mock_token_manager,
         sample_account_dto,
     ):
-        mock_api = Mock()
+        mock_api = AsyncMock()
         mock_api.get_account_settings.side_effect = MarketplaceAPIError()
         mock_api_factory.get.return_value = mock_api
         mock_token_manager.access_token.return_value = "token"
@@ -195,7 +201,7 @@ class TestMarketplaceAccountServiceErrorHandling:
         sample_account_dto,
     ):
         original_error = MarketplaceAPIError()
-        mock_api = Mock()
+        mock_api = AsyncMock()
         mock_api.get_account_settings.side_effect = original_error
         mock_api_factory.get.return_value = mock_api
         mock_token_manager.access_token.return_value = "token"
@@ -0,0 +1,222 @@
+import uuid
+from dataclasses import asdict
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.domain.dto import ItemDTO, MarketplaceAccountDTO
+from app.domain.entities import PublishJob, PublishJobStatus
+from app.domain.ports import (
+    InvalidCategory,
+    ISellingService,
+    MarketplaceUnauthorised,
+    PublishJobNotFound,
+    PublishJobServiceError,
+)
+from app.services.ports import (
+    IPublishImageStorage,
+    IPublishJobQueue,
+    IPublishJobRepository,
+    PublishImageStorageError,
+    PublishJobQueueError,
+)
+from app.services.publish_jobs import PublishJobService
+
+USER = uuid.UUID("550e8400-e29b-41d4-a716-446655440000")
+
+
+@pytest.fixture
+def item_dto():
+    return ItemDTO(
+        title="Test iPhone 13",
+        description="Latest iPhone model",
+        price=999.99,
+        currency="USD",
+        country="US",
+        quantity=1,
+        category="Cell Phones & Smartphones",
+        marketplace_aspects_data={"condition": "NEW"},
+        product_aspects={"Brand": "Apple"},
+    )
+
+
+@pytest.fixture
+def account_dto():
+    return MarketplaceAccountDTO(user_uuid=USER, marketplace="ebay")
+
+
+@pytest.fixture
+def job_repository():
+    return AsyncMock(spec=IPublishJobRepository)
+
+
+@pytest.fixture
+def image_storage():
+    storage = AsyncMock(spec=IPublishImageStorage)
+    storage.save.side_effect = lambda job_uuid, *images: [
+        f"/storage/{job_uuid}/{image}" for image in images
+    ]
+    return storage
+
+
+@pytest.fixture
+def seller():
+    return AsyncMock(spec=ISellingService)
+
+
+@pytest.fixture
+def service(job_repository, image_storage, seller):
+    return PublishJobService(
+        job_repository=job_repository,
+        image_storage=image_storage,
+        job_queue=AsyncMock(spec=IPublishJobQueue),
+        seller=seller,
+    )
+
+
+@pytest.fixture
+def pending_job(item_dto, job_repository):
+    job = PublishJob(
+        uuid=uuid.uuid4(),
+        user_uuid=USER,
+        marketplace="ebay",
+        item=asdict(item_dto),
+        images=["/storage/1.jpg", "/storage/2.jpg"],
+    )
+    job_repository.get.return_value = job
+    job_repository.claim.return_value = True
+    return job
+
+
+class TestPublishJobServiceSubmit:
+    @pytest.mark.asyncio
+    async def test_stores_and_enqueues(
+        self, service, item_dto, account_dto, job_repository, image_storage
+    ):
+        job_uuid = await service.submit(item_dto, account_dto, "a.jpg", "b.jpg")
+
+        image_storage.save.assert_awaited_once_with(job_uuid, "a.jpg", "b.jpg")
+        job = job_repository.add.await_args.args[0]
+        assert job.uuid == job_uuid
+        assert job.user_uuid == USER
+        assert job.status == PublishJobStatus.PENDING
+        assert job.images == [
+            f"/storage/{job_uuid}/a.jpg",
+            f"/storage/{job_uuid}/b.jpg",
+        ]
+        assert ItemDTO(**job.item) == item_dto
+        service.job_queue.enqueue.assert_awaited_once_with(job_uuid)
+
+    @pytest.mark.asyncio
+    async def test_enqueue_failure_drops_images(
+        self, service, item_dto, account_dto, image_storage, job_repository
+    ):
+        service.job_queue.enqueue.side_effect = PublishJobQueueError()
+
+        with pytest.raises(PublishJobServiceError):
+            await service.submit(item_dto, account_dto, "a.jpg")
+
+        image_storage.delete.assert_awaited_once()
+        job_uuid = job_repository.add.await_args.args[0].uuid
+        job_repository.set_status.assert_awaited_once_with(
+            job_uuid, PublishJobStatus.FAILED, "publish_failed"
+        )
+
+    @pytest.mark.asyncio
+    async def test_storage_failure_adds_no_job(
+        self, service, item_dto, account_dto, image_storage, job_repository
+    ):
+        image_storage.save.side_effect = PublishImageStorageError()
+
+        with pytest.raises(PublishJobServiceError):
+            await service.submit(item_dto, account_dto, "a.jpg")
+
+        job_repository.add.assert_not_awaited()
+        job_repository.set_status.assert_not_awaited()
+
+
+class TestPublishJobServiceStatus:
+    @pytest.mark.asyncio
+    async def test_status(self, service, account_dto, pending_job):
+        job = await service.status(pending_job.uuid, account_dto)
+
+        assert job.job_uuid == pending_job.uuid
+        assert job.status == "pending"
+        assert job.error is None
+
+    @pytest.mark.asyncio
+    async def test_job_of_another_user(self, service, pending_job):
+        other = MarketplaceAccountDTO(user_uuid=uuid.uuid4(), marketplace="ebay")
+
+        with pytest.raises(PublishJobNotFound):
+            await service.status(pending_job.uuid, other)
+
+    @pytest.mark.asyncio
+    async def test_missing_job(self, service, account_dto, job_repository):
+        job_repository.get.return_value = None
+
+        with pytest.raises(PublishJobNotFound):
+            await service.status(uuid.uuid4(), account_dto)
+
+
+class TestPublishJobServiceRun:
+    @pytest.mark.asyncio
+    async def test_publishes_item(
+        self, service, pending_job, item_dto, seller, job_repository, image_storage
+    ):
+        await service.run(pending_job.uuid)
+
+        seller.publish.assert_awaited_once_with(
+            item_dto,
+            MarketplaceAccountDTO(user_uuid=USER, marketplace="ebay"),
+            "/storage/1.jpg",
+            "/storage/2.jpg",
+        )
+        job_repository.claim.assert_awaited_once_with(pending_job.uuid)
+        job_repository.set_status.assert_awaited_once_with(
+            pending_job.uuid, PublishJobStatus.SUCCEEDED, None
+        )
+        image_storage.delete.assert_awaited_once_with(pending_job.uuid)
+
+    @pytest.mark.parametrize(
+        "error, code",
+        [
+            (InvalidCategory(), "invalid_category"),
+            (MarketplaceUnauthorised(), "marketplace_unauthorised"),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_records_failure(
+        self, service, pending_job, seller, job_repository, error, code
+    ):
+        seller.publish.side_effect = error
+
+        await service.run(pending_job.uuid)
+
+        job_repository.set_status.assert_awaited_with(
+            pending_job.uuid, PublishJobStatus.FAILED, code
+        )
+
+    @pytest.mark.asyncio
+    async def test_unexpected_error_marks_failed_and_reraises(
+        self, service, pending_job, seller, job_repository
+    ):
+        seller.publish.side_effect = RuntimeError()
+
+        with pytest.raises(RuntimeError):
+            await service.run(pending_job.uuid)
+
+        job_repository.set_status.assert_awaited_with(
+            pending_job.uuid, PublishJobStatus.FAILED, "publish_failed"
+        )
+
+    @pytest.mark.asyncio
+    async def test_skips_jobs_already_started(
+        self, service, pending_job, seller, job_repository
+    ):
+        job_repository.claim.return_value = False
+
+        await service.run(pending_job.uuid)
+
+        seller.publish.assert_not_awaited()
+        job_repository.set_status.assert_not_awaited()
@@ -1,18 +1,38 @@
+import asyncio
+
 import pytest
 from unittest.mock import Mock, AsyncMock, MagicMock
 
 from app.services.search import SearchService
-from app.domain.dto import ProductCategoriesDTO, ProductDTO
-from app.domain.entities import ProductStructure, AspectField, AspectType, Product
+from app.domain.dto import (
+    AspectsSkeletonDTO,
+    AspectValueDTO,
+    ProductCategoriesDTO,
+    ProductDTO,
+    ProductMetadataDTO,
+    ProductQueryDTO,
+)
+from app.domain.entities import (
+    ProductStructure,
+    AspectField,
+    AspectType,
+    AspectValue,
+    Product,
+)
 from app.domain.ports import (
     ProductCategoriesNotFound,
+    SearchServiceBusy,
     SearchServiceError,
 )
 from app.services.ports import (
     CategoriesNotFoundError,
     ICategoryPredictorFactory,
     IMarketplaceAPIFactory,
+    IMetadataFactory,
     ISearchEngine,
+    ProductQuery,
+    ProductSearchResult,
+    SearchEngineBusyError,
     SearchEngineError,
 )
 
@@ -36,11 +56,23 @@ def mock_predictors_factory():
 
 
 @pytest.fixture
-def search_service(mock_search_engine, mock_api_factory, mock_predictors_factory):
+def mock_metadata_factory():
+    factory = Mock(spec=IMetadataFactory)
+    return factory
+
+
+@pytest.fixture
+def search_service(
+    mock_search_engine,
+    mock_api_factory,
+    mock_predictors_factory,
+    mock_metadata_factory,
+):
     return SearchService(
         search=mock_search_engine,
         api_factory=mock_api_factory,
         predictors_factory=mock_predictors_factory,
+        metadata_factory=mock_metadata_factory,
     )
 
 
@@ -55,7 +87,7 @@ def mock_product():
 
 @pytest.fixture
 def mock_marketplace_api():
-    api = Mock()
+    api = AsyncMock()
     api.get_product_aspects.return_value = [
         AspectField(name="brand", data_type=AspectType.STR, is_required=True),
         AspectField(name="color", data_type=AspectType.STR, is_required=False),
@@ -64,10 +96,12 @@ def mock_marketplace_api():
 
 
 class TestSearchServiceProductAspects:
-    def test_product_aspects_success(
+    @pytest.mark.asyncio
+    async def test_product_aspects_success(
         self,
         search_service,
         mock_api_factory,
+        mock_metadata_factory,
         mock_search_engine,
         mock_marketplace_api,
         mock_product,
@@ -75,7 +109,7 @@ class TestSearchServiceProductAspects:
         mock_api_factory.get.return_value = mock_marketplace_api
         mock_search_engine.by_product_name.return_value = mock_product
 
-        result = search_service.product_aspects(
+        result = await search_service.product_aspects(
             product_name="iPhone 13",
             category="Phones",
             comment="Latest model",
@@ -84,9 +118,17 @@ class TestSearchServiceProductAspects:
 
         assert isinstance(result, ProductDTO)
         mock_api_factory.get.assert_called_once_with("EBAY_US")
+        mock_metadata_factory.get.assert_called_once_with("EBAY_US")
+        mock_search_engine.by_product_name.assert_awaited_once_with(
+            mock_metadata_factory.get.return_value,
+            "iPhone 13",
+            "Latest model",
+            ProductStructure(mock_marketplace_api.get_product_aspects.return_value),
+        )
         mock_marketplace_api.get_product_aspects.assert_called_once_with("Phones")
 
-    def test_product_aspects_with_settings(
+    @pytest.mark.asyncio
+    async def test_product_aspects_with_settings(
         self,
         search_service,
         mock_api_factory,
@@ -98,7 +140,7 @@ class TestSearchServiceProductAspects:
         mock_search_engine.by_product_name.return_value = mock_product
 
         settings = {"region": "US", "language": "en"}
-        result = search_service.product_aspects(
+        result = await search_service.product_aspects(
             product_name="Samsung Galaxy",
             category="Phones",
             comment="",
@@ -111,7 +153,8 @@ class TestSearchServiceProductAspects:
             "Phones", **settings
         )
 
-    def test_product_aspects_search_engine_error(
+    @pytest.mark.asyncio
+    async def test_product_aspects_search_engine_error(
         self,
         search_service,
         mock_api_factory,
@@ -124,14 +167,15 @@ class TestSearchServiceProductAspects:
         )
 
         with pytest.raises(SearchServiceError):
-            search_service.product_aspects(
+            await search_service.product_aspects(
                 product_name="Test",
                 category="Category",
                 comment="",
                 marketplace="EBAY_US",
             )
 
-    def test_product_aspects_no_aspects_found(
+    @pytest.mark.asyncio
+    async def test_product_aspects_no_aspects_found(
         self,
         search_service,
         mock_api_factory,
@@ -145,7 +189,7 @@ class TestSearchServiceProductAspects:
         )
         mock_search_engine.by_product_name.return_value = mock_product
 
-        result = search_service.product_aspects(
+        result = await search_service.product_aspects(
             product_name="Unknown",
             category="UnknownCategory",
             comment="",
@@ -154,7 +198,8 @@ class TestSearchServiceProductAspects:
 
         assert result is not None
 
-    def test_product_aspects_with_empty_comment(
+    @pytest.mark.asyncio
+    async def test_product_aspects_with_empty_comment(
         self,
         search_service,
         mock_api_factory,
@@ -165,7 +210,7 @@ class TestSearchServiceProductAspects:
         mock_api_factory.get.return_value = mock_marketplace_api
         mock_search_engine.by_product_name.return_value = mock_product
 
-        result = search_service.product_aspects(
+        result = await search_service.product_aspects(
             product_name="Product",
             category="Category",
             comment="",
@@ -175,8 +220,183 @@ class TestSearchServiceProductAspects:
         assert isinstance(result, ProductDTO)
 
 
+class TestSearchServiceProductsAspects:
+    @pytest.mark.asyncio
+    async def test_results_keep_order(
+        self,
+        search_service,
+        mock_api_factory,
+        mock_search_engine,
+        mock_marketplace_api,
+        mock_product,
+    ):
+        mock_api_factory.get.return_value = mock_marketplace_api
+        mock_search_engine.by_product_names.return_value = [
+            ProductSearchResult(error=SearchEngineError("Product missing in answer")),
+            ProductSearchResult(product=mock_product),
+        ]
+
+        results = await search_service.products_aspects(
+            [ProductQueryDTO("iPhone"), ProductQueryDTO("Galaxy", "used")],
+            "Phones",
+            "EBAY_US",
+        )
+
+        assert results[0].product is None
+        assert results[0].error == "Product missing in answer"
+        assert isinstance(results[1].product, ProductDTO)
+        queries = mock_search_engine.by_product_names.await_args.args[1]
+        assert queries == [ProductQuery("iPhone"), ProductQuery("Galaxy", "used")]
+
+
+class TestSearchServicePipelinedProductAspects:
+    @pytest.fixture
+    def pipelined_service(self, search_service):
+        search_service.pipelined = True
+        return search_service
+
+    @pytest.mark.asyncio
+    async def test_metadata_overlaps_aspects_fetch(
+        self,
+        pipelined_service,
+        mock_api_factory,
+        mock_search_engine,
+        mock_marketplace_api,
+    ):
+        brand = AspectField(name="brand", data_type=AspectType.STR, is_required=False)
+        metadata_started = asyncio.Event()
+        metadata = Mock()
+        metadata.asdict.return_value = {"description": "Phone"}
+
+        async def metadata_by_product_name(*args):
+            metadata_started.set()
+            return metadata
+
+        async def get_product_aspects(category):
+            await asyncio.wait_for(metadata_started.wait(), 1)
+            return [brand]
+
+        mock_api_factory.get.return_value = mock_marketplace_api
+        mock_marketplace_api.get_product_aspects.side_effect = get_product_aspects
+        mock_search_engine.metadata_by_product_name.side_effect = (
+            metadata_by_product_name
+        )
+        mock_search_engine.aspects_by_product_name.return_value = [
+            AspectValue(name="brand", value="Apple", is_required=False)
+        ]
+
+        result = await pipelined_service.product_aspects(
+            "iPhone 13", "Phones", "used", "EBAY_US"
+        )
+
+        assert result.metadata == {"description": "Phone"}
+        assert [a.value for a in result.aspects] == ["Apple"]
+        mock_search_engine.aspects_by_product_name.assert_awaited_once_with(
+            "iPhone 13", "used", ProductStructure([brand])
+        )
+        mock_search_engine.by_product_name.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_error_cancels_metadata(
+        self,
+        pipelined_service,
+        mock_api_factory,
+        mock_search_engine,
+        mock_marketplace_api,
+    ):
+        metadata_started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def metadata_by_product_name(*args):
+            metadata_started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def get_product_aspects(category):
+            await asyncio.wait_for(metadata_started.wait(), 1)
+            return []
+
+        mock_api_factory.get.return_value = mock_marketplace_api
+        mock_marketplace_api.get_product_aspects.side_effect = get_product_aspects
+        mock_search_engine.metadata_by_product_name.side_effect = (
+            metadata_by_product_name
+        )
+        mock_search_engine.aspects_by_product_name.side_effect = SearchEngineError()
+
+        with pytest.raises(SearchServiceError):
+            await pipelined_service.product_aspects(
+                "iPhone 13", "Phones", "", "EBAY_US"
+            )
+
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+
+class TestSearchServiceStreamProductAspects:
+    @pytest.mark.asyncio
+    async def test_skeleton_first(
+        self,
+        search_service,
+        mock_api_factory,
+        mock_search_engine,
+        mock_marketplace_api,
+    ):
+        metadata = Mock()
+        metadata.asdict.return_value = {"description": "Phone"}
+
+        async def parts(*args):
+            yield AspectValue(name="brand", value="Apple", is_required=True)
+            yield metadata
+
+        mock_api_factory.get.return_value = mock_marketplace_api
+        mock_search_engine.stream_by_product_name.side_effect = parts
+
+        result = [
+            part
+            async for part in search_service.stream_product_aspects(
+                "iPhone 13", "Phones", "", "EBAY_US"
+            )
+        ]
+
+        assert result == [
+            AspectsSkeletonDTO(
+                aspects=[
+                    AspectValueDTO(name="brand", value=None, is_required=True),
+                    AspectValueDTO(name="color", value=None, is_required=False),
+                ]
+            ),
+            AspectValueDTO(name="brand", value="Apple", is_required=True),
+            ProductMetadataDTO(metadata={"description": "Phone"}),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_search_engine_error(
+        self,
+        search_service,
+        mock_api_factory,
+        mock_search_engine,
+        mock_marketplace_api,
+    ):
+        async def parts(*args):
+            raise SearchEngineError()
+            yield
+
+        mock_api_factory.get.return_value = mock_marketplace_api
+        mock_search_engine.stream_by_product_name.side_effect = parts
+
+        stream = search_service.stream_product_aspects(
+            "iPhone 13", "Phones", "", "EBAY_US"
+        )
+        assert isinstance(await anext(stream), AspectsSkeletonDTO)
+        with pytest.raises(SearchServiceError):
+            await anext(stream)
+
+
 class TestSearchServiceRecognizeProduct:
-    def test_recognize_product_success(
+    @pytest.mark.asyncio
+    async def test_recognize_product_success(
         self,
         search_service,
         mock_search_engine,
@@ -185,11 +405,11 @@ class TestSearchServiceRecognizeProduct:
         mock_search_engine.barecodes_on_image.return_value = ["123456789"]
         mock_search_engine.product_name_by_barecode.return_value = "iPhone 13"
 
-        mock_predictor = Mock()
+        mock_predictor = AsyncMock()
         mock_predictor.predict.return_value = ["Phones", "Electronics"]
         mock_predictors_factory.get.return_value = mock_predictor
 
-        result = search_service.recognize_product(
+        result = await search_service.recognize_product(
             img_path="/path/to/image.jpg",
             marketplace="EBAY_US",
         )
@@ -198,7 +418,8 @@ class TestSearchServiceRecognizeProduct:
         assert result.product_name == "iPhone 13"
         assert "Phones" in result.categories
 
-    def test_recognize_product_with_settings(
+    @pytest.mark.asyncio
+    async def test_recognize_product_with_settings(
         self,
         search_service,
         mock_search_engine,
@@ -207,41 +428,44 @@ class TestSearchServiceRecognizeProduct:
         mock_search_engine.barecodes_on_image.return_value = ["987654321"]
         mock_search_engine.product_name_by_barecode.return_value = "Samsung Galaxy"
 
-        mock_predictor = Mock()
+        mock_predictor = AsyncMock()
         mock_predictor.predict.return_value = ["Phones"]
         mock_predictors_factory.get.return_value = mock_predictor
 
         settings = {"confidence": 0.9}
-        result = search_service.recognize_product(
+        result = await search_service.recognize_product(
             img_path="/path/to/image.jpg", marketplace="EBAY_UK", **settings
         )
 
         assert isinstance(result, ProductCategoriesDTO)
         mock_predictor.predict.assert_called_once_with("Samsung Galaxy", **settings)
 
-    def test_recognize_product_no_barcode_raises_error(
+    @pytest.mark.asyncio
+    async def test_recognize_product_no_barcode_raises_error(
         self, search_service, mock_search_engine
     ):
         mock_search_engine.barecodes_on_image.return_value = []
 
         with pytest.raises(SearchServiceError, match="exactly one barcode"):
-            search_service.recognize_product(
+            await search_service.recognize_product(
                 img_path="/path/to/image.jpg",
                 marketplace="EBAY_US",
             )
 
-    def test_recognize_product_multiple_barcodes_raises_error(
+    @pytest.mark.asyncio
+    async def test_recognize_product_multiple_barcodes_raises_error(
         self, search_service, mock_search_engine
     ):
         mock_search_engine.barecodes_on_image.return_value = ["barcode1", "barcode2"]
 
         with pytest.raises(SearchServiceError, match="exactly one barcode"):
-            search_service.recognize_product(
+            await search_service.recognize_product(
                 img_path="/path/to/image.jpg",
                 marketplace="EBAY_US",
             )
 
-    def test_recognize_product_category_not_found(
+    @pytest.mark.asyncio
+    async def test_recognize_product_category_not_found(
         self,
         search_service,
         mock_search_engine,
@@ -250,17 +474,18 @@ class TestSearchServiceRecognizeProduct:
         mock_search_engine.barecodes_on_image.return_value = ["123456789"]
         mock_search_engine.product_name_by_barecode.return_value = "Unknown Product"
 
-        mock_predictor = Mock()
+        mock_predictor = AsyncMock()
         mock_predictor.predict.side_effect = CategoriesNotFoundError("Not found")
         mock_predictors_factory.get.return_value = mock_predictor
 
         with pytest.raises(ProductCategoriesNotFound):
-            search_service.recognize_product(
+            await search_service.recognize_product(
                 img_path="/path/to/image.jpg",
                 marketplace="EBAY_US",
             )
 
-    def test_recognize_product_search_engine_error(
+    @pytest.mark.asyncio
+    async def test_recognize_product_search_engine_error(
         self,
         search_service,
         mock_search_engine,
@@ -269,13 +494,28 @@ class TestSearchServiceRecognizeProduct:
             "Image processing failed"
         )
 
-        with pytest.raises(SearchEngineError):
-            search_service.recognize_product(
+        with pytest.raises(SearchServiceError):
+            await search_service.recognize_product(
+                img_path="/path/to/image.jpg",
+                marketplace="EBAY_US",
+            )
+
+    @pytest.mark.asyncio
+    async def test_recognize_product_decoder_busy(
+        self,
+        search_service,
+        mock_search_engine,
+    ):
+        mock_search_engine.barecodes_on_image.side_effect = SearchEngineBusyError()
+
+        with pytest.raises(SearchServiceBusy):
+            await search_service.recognize_product(
                 img_path="/path/to/image.jpg",
                 marketplace="EBAY_US",
             )
 
-    def test_recognize_product_barcode_lookup_error(
+    @pytest.mark.asyncio
+    async def test_recognize_product_barcode_lookup_error(
         self,
         search_service,
         mock_search_engine,
@@ -286,14 +526,15 @@ class TestSearchServiceRecognizeProduct:
         )
 
         with pytest.raises(SearchServiceError):
-            search_service.recognize_product(
+            await search_service.recognize_product(
                 img_path="/path/to/image.jpg",
                 marketplace="EBAY_US",
             )
 
 
 class TestSearchServiceFactoryUsage:
-    def test_api_factory_called_with_marketplace(
+    @pytest.mark.asyncio
+    async def test_api_factory_called_with_marketplace(
         self,
         search_service,
         mock_api_factory,
@@ -304,7 +545,7 @@ class TestSearchServiceFactoryUsage:
         mock_api_factory.get.return_value = mock_marketplace_api
         mock_search_engine.by_product_name.return_value = mock_product
 
-        search_service.product_aspects(
+        await search_service.product_aspects(
             product_name="Test",
             category="Category",
             comment="",
@@ -313,7 +554,8 @@ class TestSearchServiceFactoryUsage:
 
         mock_api_factory.get.assert_called_once_with("EBAY_DE")
 
-    def test_predictor_factory_called_with_marketplace(
+    @pytest.mark.asyncio
+    async def test_predictor_factory_called_with_marketplace(
         self,
         search_service,
         mock_search_engine,
@@ -322,11 +564,11 @@ class TestSearchServiceFactoryUsage:
         mock_search_engine.barecodes_on_image.return_value = ["123456789"]
         mock_search_engine.product_name_by_barecode.return_value = "Product"
 
-        mock_predictor = Mock()
+        mock_predictor = AsyncMock()
         mock_predictor.predict.return_value = ["Category"]
         mock_predictors_factory.get.return_value = mock_predictor
 
-        search_service.recognize_product(
+        await search_service.recognize_product(
             img_path="/path/to/image.jpg",
             marketplace="EBAY_FR",
         )
@@ -335,7 +577,8 @@ class TestSearchServiceFactoryUsage:
 
 
 class TestSearchServiceIntegration:
-    def test_product_aspects_creates_product_structure(
+    @pytest.mark.asyncio
+    async def test_product_aspects_creates_product_structure(
         self,
         search_service,
         mock_api_factory,
@@ -351,7 +594,7 @@ class TestSearchServiceIntegration:
         mock_api_factory.get.return_value = mock_marketplace_api
         mock_search_engine.by_product_name.return_value = mock_product
 
-        result = search_service.product_aspects(
+        result = await search_service.product_aspects(
             product_name="Test Product",
             category="Category",
             comment="Test comment",
@@ -361,7 +604,8 @@ class TestSearchServiceIntegration:
         assert isinstance(result, ProductDTO)
         mock_search_engine.by_product_name.assert_called_once()
 
-    def test_recognize_product_complete_workflow(
+    @pytest.mark.asyncio
+    async def test_recognize_product_complete_workflow(
         self,
         search_service,
         mock_search_engine,
@@ -374,11 +618,11 @@ class TestSearchServiceIntegration:
         mock_search_engine.barecodes_on_image.return_value = [barcode]
         mock_search_engine.product_name_by_barecode.return_value = product_name
 
-        mock_predictor = Mock()
+        mock_predictor = AsyncMock()
         mock_predictor.predict.return_value = categories
         mock_predictors_factory.get.return_value = mock_predictor
 
-        result = search_service.recognize_product(
+        result = await search_service.recognize_product(
             img_path="/path/to/image.jpg",
             marketplace="EBAY_US",
         )
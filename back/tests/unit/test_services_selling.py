@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import Mock, AsyncMock
+from unittest.mock import Mock, AsyncMock, create_autospec
 
 from app.domain.ports.errors import (
     InvalidCategory,
@@ -9,13 +9,16 @@ from app.domain.ports.errors import (
 from app.domain.ports import MarketplaceAuthorizationFailed, SellingServiceError
 from app.services.selling import SellingService
 from app.services.common import MarketplaceTokenManager
-from app.domain.dto import ItemDTO, MarketplaceAccountDTO
+from app.domain.dto import BatchItemDTO, ItemDTO, MarketplaceAccountDTO
 from app.domain.entities import AspectField, AspectType
+from app.infrastructure.marketplace_api import EbayAPI
 from app.services.ports import (
+    CategoriesNotFoundError,
     CategoryNotFound,
     IMarketplaceAPIFactory,
     IMarketplaceAspectsFactory,
     MarketplaceAPIError,
+    PublishResult,
 )
 from app.domain.entities.errors import AspectsValidationError
 
@@ -24,7 +27,7 @@ class MockMarketplaceAspects:
     @staticmethod
     def validate(data):
         return Mock(
-            marketplace="ebay",
+            marketplace="EBAY_US",
             policies=Mock(
                 fulfillment_policy="Standard",
                 payment_policy="CreditCard",
@@ -92,7 +95,7 @@ def sample_item_dto():
             "color": "Black",
         },
         marketplace_aspects_data={
-            "marketplace": "ebay",
+            "marketplace": "EBAY_US",
             "condition": "NEW",
             "location": "WarehouseA",
         },
@@ -110,7 +113,7 @@ def sample_account_dto():
 
 @pytest.fixture
 def mock_marketplace_api():
-    api = Mock()
+    api = AsyncMock()
     api.get_product_aspects.return_value = [
         AspectField(
             name="brand",
@@ -129,7 +132,7 @@ def mock_marketplace_api():
             is_required=False,
         ),
     ]
-    api.publish = Mock()
+    api.publish = AsyncMock()
     return api
 
 
@@ -151,8 +154,63 @@ class TestSellingServicePublish:
             await selling_service.publish(sample_item_dto, sample_account_dto)
 
 
+class TestSellingServicePublishBatch:
+    @pytest.mark.asyncio
+    async def test_publish_batch_results_in_order(
+        self,
+        selling_service,
+        sample_item_dto,
+        sample_account_dto,
+        mock_api_factory,
+        mock_marketplace_api,
+    ):
+        mock_api_factory.get.return_value = mock_marketplace_api
+        mock_marketplace_api.publish_batch.return_value = [
+            PublishResult(listing_id="L1"),
+            PublishResult(error=MarketplaceAPIError("Bad price")),
+        ]
+        invalid_item = ItemDTO(
+            **{**sample_item_dto.__dict__, "product_aspects": {"brand": "Nokia"}}
+        )
+        items = [
+            BatchItemDTO(item=sample_item_dto, images=["a.jpg"]),
+            BatchItemDTO(item=invalid_item, images=["b.jpg"]),
+            BatchItemDTO(item=sample_item_dto, images=["c.jpg"]),
+        ]
+
+        results = await selling_service.publish_batch(items, sample_account_dto)
+
+        assert results[0].published and results[0].listing_id == "L1"
+        assert not results[1].published
+        assert results[1].error == "invalid_product_aspects"
+        assert not results[2].published
+        assert results[2].error == "publish_failed"
+        assert results[2].message == "Bad price"
+        batch, token = mock_marketplace_api.publish_batch.await_args.args
+        assert token == "test_access_token"
+        assert [images for _, images in batch] == [["a.jpg"], ["c.jpg"]]
+
+    @pytest.mark.asyncio
+    async def test_publish_batch_api_error(
+        self,
+        selling_service,
+        sample_item_dto,
+        sample_account_dto,
+        mock_api_factory,
+        mock_marketplace_api,
+    ):
+        mock_api_factory.get.return_value = mock_marketplace_api
+        mock_marketplace_api.publish_batch.side_effect = MarketplaceAPIError()
+
+        with pytest.raises(SellingServiceError):
+            await selling_service.publish_batch(
+                [BatchItemDTO(item=sample_item_dto, images=[])], sample_account_dto
+            )
+
+
 class TestSellingServiceValidateProductStructure:
-    def test_validate_product_structure_success(
+    @pytest.mark.asyncio
+    async def test_validate_product_structure_success(
         self, selling_service, mock_api_factory, mock_marketplace_api
     ):
         mock_api_factory.get.return_value = mock_marketplace_api
@@ -170,44 +228,76 @@ class TestSellingServiceValidateProductStructure:
             ),
         ]
 
-        aspects = selling_service._validate_product_structure(
+        aspects = await selling_service._validate_product_structure(
             category_name="Electronics > Mobile Phones",
             aspects_data={"brand": "Apple", "model": "iPhone 13"},
             marketplace="ebay",
+            marketplace_id="EBAY_US",
         )
 
         assert isinstance(aspects, list)
         mock_marketplace_api.get_product_aspects.assert_called_once_with(
-            "Electronics > Mobile Phones"
+            "Electronics > Mobile Phones", marketplace_id="EBAY_US"
         )
 
-    def test_validate_product_structure_api_error(
+    @pytest.mark.asyncio
+    async def test_validate_passes_marketplace_id_to_ebay_api(
+        self, selling_service, mock_api_factory, sample_item_dto, sample_account_dto
+    ):
+        ebay_api = create_autospec(EbayAPI, instance=True)
+        ebay_api.get_product_aspects.return_value = [
+            AspectField(name=name, data_type=AspectType.STR, is_required=True)
+            for name in ("brand", "model", "color")
+        ]
+        mock_api_factory.get.return_value = ebay_api
+
+        await selling_service.validate(sample_item_dto, sample_account_dto)
+
+        ebay_api.get_product_aspects.assert_awaited_once_with(
+            "Electronics > Mobile Phones", marketplace_id="EBAY_US"
+        )
+
+    @pytest.mark.asyncio
+    async def test_validate_unknown_category_in_ebay_api(
+        self, selling_service, mock_api_factory, sample_item_dto, sample_account_dto
+    ):
+        ebay_api = create_autospec(EbayAPI, instance=True)
+        ebay_api.get_product_aspects.side_effect = CategoriesNotFoundError()
+        mock_api_factory.get.return_value = ebay_api
+
+        with pytest.raises(InvalidCategory):
+            await selling_service.validate(sample_item_dto, sample_account_dto)
+
+    @pytest.mark.asyncio
+    async def test_validate_product_structure_api_error(
         self, selling_service, mock_api_factory
     ):
         mock_api_factory.get.side_effect = MarketplaceAPIError()
 
         with pytest.raises(SellingServiceError):
-            selling_service._validate_product_structure(
+            await selling_service._validate_product_structure(
                 category_name="Electronics",
                 aspects_data={"brand": "Apple"},
                 marketplace="ebay",
             )
 
-    def test_validate_product_structure_category_not_found(
+    @pytest.mark.asyncio
+    async def test_validate_product_structure_category_not_found(
         self, selling_service, mock_api_factory
     ):
-        mock_api = Mock()
+        mock_api = AsyncMock()
         mock_api.get_product_aspects.side_effect = CategoryNotFound()
         mock_api_factory.get.return_value = mock_api
 
         with pytest.raises(InvalidCategory):
-            selling_service._validate_product_structure(
+            await selling_service._validate_product_structure(
                 category_name="UnknownCategory", aspects_data={}, marketplace="ebay"
             )
 
 
 class TestSellingServiceIntegration:
-    def test_validate_product_structure_creates_product_structure(
+    @pytest.mark.asyncio
+    async def test_validate_product_structure_creates_product_structure(
         self, selling_service, mock_api_factory, mock_marketplace_api
     ):
         aspects_list = [
@@ -217,7 +307,7 @@ class TestSellingServiceIntegration:
         mock_api_factory.get.return_value = mock_marketplace_api
         mock_marketplace_api.get_product_aspects.return_value = aspects_list
 
-        result = selling_service._validate_product_structure(
+        result = await selling_service._validate_product_structure(
             category_name="Electronics",
             aspects_data={"color": "Black", "size": "Large"},
             marketplace="ebay",
@@ -239,22 +329,24 @@ class TestSellingServiceErrorHandling:
         with pytest.raises(InvalidMarketplaceAspects):
             await selling_service.publish(sample_item_dto, sample_account_dto)
 
-    def test_validate_product_structure_error_mapping(
+    @pytest.mark.asyncio
+    async def test_validate_product_structure_error_mapping(
         self, selling_service, mock_api_factory
     ):
         error_conditions = [
             (MarketplaceAPIError(), SellingServiceError),
             (CategoryNotFound(), InvalidCategory),
+            (CategoriesNotFoundError(), InvalidCategory),
             (AspectsValidationError(), InvalidProductAspects),
         ]
 
         for error, expected_exception in error_conditions:
-            mock_api = Mock()
+            mock_api = AsyncMock()
             mock_api.get_product_aspects.side_effect = error
             mock_api_factory.get.return_value = mock_api
 
             with pytest.raises(expected_exception):
-                selling_service._validate_product_structure(
+                await selling_service._validate_product_structure(
                     category_name="Test",
                     aspects_data={},
                     marketplace="ebay",